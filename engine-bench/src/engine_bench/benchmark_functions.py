@@ -1,10 +1,38 @@
 """Benchmark functions for hive-engine nodes using nectarengine."""
 
+import functools
 import logging
 import time
 
 from nectarengine.api import Api
 
+from engine_bench.utils import QUIT
+
+
+@functools.lru_cache(maxsize=32)
+def _get_api(node, timeout, num_retries, num_retries_call):
+    """Get a shared nectarengine API client for a node.
+
+    Clients are cached per connection settings so that the consecutive benchmarks run
+    against the same node reuse one client and its open connection instead of repeating
+    the connection setup. Use ``_get_api.cache_clear()`` to drop all cached clients.
+
+    Args:
+        node (str): URL of the node to connect to
+        timeout (int): Connection timeout in seconds
+        num_retries (int): Number of connection retries
+        num_retries_call (int): Number of API call retries
+
+    Returns:
+        Api: The cached Api instance for the node
+    """
+    return Api(
+        url=node,
+        num_retries=num_retries,
+        num_retries_call=num_retries_call,
+        timeout=timeout,
+    )
+
 
 def get_status_node(node, num_retries=3, num_retries_call=3, timeout=30, how_many_seconds=30):
     """Benchmark status retrieval from a hive-engine node using getStatus().
@@ -22,8 +50,8 @@ def get_status_node(node, num_retries=3, num_retries_call=3, timeout=30, how_man
     Returns:
         dict: Benchmark results including success status, sscnodeversion, and timing information
     """
-    start_time = time.time()
-    access_start_time = time.time()
+    start_time = time.perf_counter()
+    access_start_time = time.perf_counter()
     result = {
         "successful": False,
         "sscnodeversion": "unknown",
@@ -36,16 +64,11 @@ def get_status_node(node, num_retries=3, num_retries_call=3, timeout=30, how_man
     }
 
     try:
-        # Initialize nectarengine API
-        api = Api(
-            url=node,
-            num_retries=num_retries,
-            num_retries_call=num_retries_call,
-            timeout=timeout,
-        )
+        # Get the node's shared nectarengine API client
+        api = _get_api(node, timeout, num_retries, num_retries_call)
 
         # Record initial access time
-        access_time = time.time() - access_start_time
+        access_time = time.perf_counter() - access_start_time
 
         # Use get_status (snake_case)
         try:
@@ -67,7 +90,7 @@ def get_status_node(node, num_retries=3, num_retries_call=3, timeout=30, how_man
             result["is_engine"] = False
             result["successful"] = False
             result["error"] = f"Not a valid hive-engine node: {str(e)}"
-            result["total_duration"] = time.time() - start_time
+            result["total_duration"] = time.perf_counter() - start_time
             return result
 
         result["successful"] = True
@@ -76,10 +99,10 @@ def get_status_node(node, num_retries=3, num_retries_call=3, timeout=30, how_man
     except Exception as e:
         logging.error(f"Error getting status from node {node}: {str(e)}")
         result["error"] = str(e)
-        result["total_duration"] = time.time() - start_time
+        result["total_duration"] = time.perf_counter() - start_time
         return result
 
-    result["total_duration"] = time.time() - start_time
+    result["total_duration"] = time.perf_counter() - start_time
     return result
 
 
@@ -110,21 +133,16 @@ def benchmark_token_retrieval(
     Returns:
         dict: Benchmark results including success status, count, and timing information
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     end_time = start_time + how_many_seconds
     count = 0
 
     try:
-        # Initialize nectarengine API
-        api = Api(
-            url=node,
-            num_retries=num_retries,
-            num_retries_call=num_retries_call,
-            timeout=timeout,
-        )
+        # Get the node's shared nectarengine API client
+        api = _get_api(node, timeout, num_retries, num_retries_call)
 
         # Perform token queries until time limit is reached
-        while time.time() < end_time:
+        while time.perf_counter() < end_time:
             try:
                 api.find("tokens", "tokens", {"symbol": token})
                 count += 1
@@ -132,7 +150,7 @@ def benchmark_token_retrieval(
                 logging.error(f"Error retrieving token {token} from node {node}: {str(e)}")
                 break
 
-        total_duration = time.time() - start_time
+        total_duration = time.perf_counter() - start_time
 
         return {
             "successful": count > 0,
@@ -147,7 +165,7 @@ def benchmark_token_retrieval(
             "count": 0,
             "token": token,
             "error": str(e),
-            "total_duration": time.time() - start_time,
+            "total_duration": time.perf_counter() - start_time,
         }
 
 
@@ -174,21 +192,16 @@ def benchmark_contract_retrieval(
     Returns:
         dict: Benchmark results including success status, count, and timing information
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     end_time = start_time + how_many_seconds
     count = 0
 
     try:
-        # Initialize nectarengine API
-        api = Api(
-            url=node,
-            num_retries=num_retries,
-            num_retries_call=num_retries_call,
-            timeout=timeout,
-        )
+        # Get the node's shared nectarengine API client
+        api = _get_api(node, timeout, num_retries, num_retries_call)
 
         # Perform contract queries until time limit is reached
-        while time.time() < end_time:
+        while time.perf_counter() < end_time:
             try:
                 # For contracts, we just query the first few records
                 api.find(contract, contract, {}, limit=5)
@@ -197,7 +210,7 @@ def benchmark_contract_retrieval(
                 logging.error(f"Error retrieving contract {contract} from node {node}: {str(e)}")
                 break
 
-        total_duration = time.time() - start_time
+        total_duration = time.perf_counter() - start_time
 
         return {
             "successful": count > 0,
@@ -212,7 +225,7 @@ def benchmark_contract_retrieval(
             "count": 0,
             "contract": contract,
             "error": str(e),
-            "total_duration": time.time() - start_time,
+            "total_duration": time.perf_counter() - start_time,
         }
 
 
@@ -239,21 +252,16 @@ def benchmark_account_history(
     Returns:
         dict: Benchmark results including success status, count, and timing information
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     end_time = start_time + how_many_seconds
     count = 0
 
     try:
-        # Initialize nectarengine API
-        api = Api(
-            url=node,
-            num_retries=num_retries,
-            num_retries_call=num_retries_call,
-            timeout=timeout,
-        )
+        # Get the node's shared nectarengine API client
+        api = _get_api(node, timeout, num_retries, num_retries_call)
 
         # Perform account history queries until time limit is reached
-        while time.time() < end_time:
+        while time.perf_counter() < end_time:
             try:
                 # Query account history for specified account
                 # Use a default token symbol for history retrieval
@@ -265,7 +273,7 @@ def benchmark_account_history(
                 )
                 break
 
-        total_duration = time.time() - start_time
+        total_duration = time.perf_counter() - start_time
 
         return {
             "successful": count > 0,
@@ -280,7 +288,7 @@ def benchmark_account_history(
             "count": 0,
             "account": account_name,
             "error": str(e),
-            "total_duration": time.time() - start_time,
+            "total_duration": time.perf_counter() - start_time,
         }
 
 
@@ -302,23 +310,20 @@ def benchmark_latency(node, num_retries=3, num_retries_call=3, timeout=30):
     num_samples = 5  # Number of latency samples to take
 
     try:
-        # Initialize nectarengine API
-        api = Api(
-            url=node,
-            num_retries=num_retries,
-            num_retries_call=num_retries_call,
-            timeout=timeout,
-        )
+        # Get the node's shared nectarengine API client
+        api = _get_api(node, timeout, num_retries, num_retries_call)
 
         # Take multiple latency measurements
         for _ in range(num_samples):
             try:
-                start_time = time.time()
+                start_time = time.perf_counter()
                 # Make a simple query to measure latency - use a lightweight call
                 api.find("tokens", "tokens", {"symbol": "SWAP.HIVE"}, limit=1)
-                latency = time.time() - start_time
+                latency = time.perf_counter() - start_time
                 latencies.append(latency)
-                time.sleep(0.1)  # Brief pause between measurements
+                # Brief pause between measurements, cut short on interruption
+                if QUIT.wait(0.1):
+                    break
             except Exception as e:
                 logging.error(f"Error measuring latency to node {node}: {str(e)}")
                 break
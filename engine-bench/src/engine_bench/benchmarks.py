@@ -1,7 +1,8 @@
 """Benchmarking class for running multiple benchmark tests on hive-engine nodes."""
 
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from engine_bench.benchmark_functions import (
     benchmark_account_history,
@@ -10,7 +11,10 @@ from engine_bench.benchmark_functions import (
     benchmark_token_retrieval,
     get_status_node,
 )
-from engine_bench.utils import benchmark_executor
+from engine_bench.utils import MAX_CONCURRENCY, QUIT, benchmark_executor
+
+# Seconds between checks for nodes that have exceeded their time budget
+WAIT_TICK = 1.0
 
 
 class Benchmarks:
@@ -18,7 +22,9 @@ class Benchmarks:
 
     This class provides methods to benchmark different aspects of hive-engine nodes, including
     configuration retrieval, token retrieval, contract retrieval, and account history retrieval.
-    It supports both threaded and sequential execution of benchmark tests.
+    It supports both threaded and sequential execution of benchmark tests. Threaded runs
+    share one worker pool for the lifetime of the instance; use it as a context manager or
+    call ``close()`` to release the pool.
 
     Attributes:
         num_retries (int): Number of connection retries for all benchmark tests
@@ -26,77 +32,137 @@ class Benchmarks:
         timeout (int): Connection timeout in seconds for all benchmark tests
     """
 
-    def __init__(self, num_retries=3, num_retries_call=3, timeout=30):
+    def __init__(
+        self, num_retries=3, num_retries_call=3, timeout=30, max_concurrency=MAX_CONCURRENCY
+    ):
         """Initialize the Benchmarks class with connection parameters.
 
         Args:
             num_retries (int, optional): Number of connection retries. Defaults to 3.
             num_retries_call (int, optional): Number of API call retries. Defaults to 3.
             timeout (int, optional): Connection timeout in seconds. Defaults to 30.
+            max_concurrency (int, optional): Maximum number of nodes benchmarked at once.
+                Defaults to MAX_CONCURRENCY.
         """
         self.num_retries = num_retries
         self.num_retries_call = num_retries_call
         self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        # Threads are started on demand, so the pool is cheap until the first threaded run
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="engine-bench"
+        )
+
+    def __enter__(self):
+        """Return the instance for use in a ``with`` block."""
+        return self
 
-    def _run_benchmark_threaded(self, nodes, benchmark_func, *args):
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Shut down the worker pool when leaving a ``with`` block."""
+        self.close()
+
+    def close(self):
+        """Shut down the shared worker pool without waiting for running benchmarks.
+
+        Queued benchmarks are cancelled. Workers of nodes abandoned after their deadline
+        finish their current test in the background, so they do not hold up the caller.
+        """
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run_benchmark_threaded(self, nodes, benchmark_func, *args, **kwargs):
         """Run benchmark tests on multiple nodes concurrently using threads.
 
         This method executes the specified benchmark function on multiple nodes
-        concurrently using a ThreadPoolExecutor. It handles keyboard interrupts
-        gracefully.
+        concurrently using the instance's shared thread pool. It handles keyboard
+        interrupts gracefully by setting the QUIT event. A node that is still running
+        twice the benchmark time limit plus the connection timeout after it started is
+        reported as failed, so a hung node cannot hold up the whole run.
 
         Args:
             nodes (list): List of node URLs to benchmark
             benchmark_func (callable): The benchmark function to execute
             *args: Additional arguments to pass to the benchmark function
+            **kwargs: Additional keyword arguments to pass to the benchmark function. A
+                ``how_many_seconds`` time limit is also used to derive the per-node budget.
 
         Returns:
-            list: List of benchmark results, one for each node
+            list: List of benchmark results, in the same order as ``nodes``
         """
-        results = []
-        global quit_thread
+        # Results are stored by node position so the output order matches the input
+        results = [None] * len(nodes)
+        # Create a dict mapping futures to their node positions
+        future_to_index = {}
+        # Time each node's benchmark actually started, so queued nodes are not timed out
+        started = {}
+
+        budget = 2 * kwargs.get("how_many_seconds", 0) + self.timeout
+
+        def run(index, node):
+            started[index] = time.monotonic()
+            return benchmark_executor(
+                benchmark_func,
+                node,
+                *args,
+                num_retries=self.num_retries,
+                num_retries_call=self.num_retries_call,
+                timeout=self.timeout,
+                **kwargs,
+            )
 
         try:
-            with ThreadPoolExecutor(max_workers=min(32, len(nodes))) as executor:
-                # Create a dict mapping futures to their node URLs
-                future_to_node = {}
-                for node in nodes:
-                    future = executor.submit(
-                        benchmark_executor,
-                        benchmark_func,
-                        node,
-                        *args,
-                        num_retries=self.num_retries,
-                        num_retries_call=self.num_retries_call,
-                        timeout=self.timeout,
-                    )
-                    future_to_node[future] = node
-
-                # Process results as they complete
-                for future in as_completed(future_to_node):
-                    node = future_to_node[future]
+            for index, node in enumerate(nodes):
+                future_to_index[self._pool.submit(run, index, node)] = index
+
+            # Process results as they complete, checking running nodes every tick
+            pending = set(future_to_index)
+            while pending:
+                done, pending = wait(pending, timeout=WAIT_TICK, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = future_to_index[future]
+                    node = nodes[index]
                     try:
                         result = future.result()
-                        logging.info(f"Benchmark completed for node {node}: {result['successful']}")
-                        results.append(result)
-                    except Exception as e:
-                        logging.error(f"Error benchmarking node {node}: {str(e)}")
-                        results.append(
-                            {
-                                "successful": False,
-                                "node": node,
-                                "error": str(e),
-                                "total_duration": 0.0,
-                            }
+                        logging.info(
+                            "Benchmark completed for node %s: %s", node, result["successful"]
                         )
+                        results[index] = result
+                    except Exception as e:
+                        logging.error("Error benchmarking node %s: %s", node, e)
+                        results[index] = {
+                            "successful": False,
+                            "node": node,
+                            "error": str(e),
+                            "total_duration": 0.0,
+                        }
+
+                # Give up on nodes that have been running longer than their budget
+                now = time.monotonic()
+                for future in list(pending):
+                    index = future_to_index[future]
+                    if index not in started or now - started[index] <= budget:
+                        continue
+                    # A running future cannot be cancelled, its result is simply ignored
+                    pending.discard(future)
+                    node = nodes[index]
+                    logging.error("Benchmark for node %s did not finish before the deadline", node)
+                    results[index] = {
+                        "successful": False,
+                        "node": node,
+                        "error": "deadline",
+                        "total_duration": now - started[index],
+                    }
 
         except KeyboardInterrupt:
             logging.info("KeyboardInterrupt received, stopping threads...")
-            quit_thread = True
+            QUIT.set()
+            # The pool outlives this call, so drop any benchmarks that have not started yet
+            for future in future_to_index:
+                future.cancel()
 
-        return results
+        # Nodes interrupted before finishing have no result
+        return [result for result in results if result is not None]
 
-    def _run_benchmark_sequential(self, nodes, benchmark_func, *args):
+    def _run_benchmark_sequential(self, nodes, benchmark_func, *args, **kwargs):
         """Run benchmark tests on multiple nodes sequentially.
 
         This method executes the specified benchmark function on multiple nodes
@@ -106,6 +172,7 @@ class Benchmarks:
             nodes (list): List of node URLs to benchmark
             benchmark_func (callable): The benchmark function to execute
             *args: Additional arguments to pass to the benchmark function
+            **kwargs: Additional keyword arguments to pass to the benchmark function
 
         Returns:
             list: List of benchmark results, one for each node
@@ -121,11 +188,12 @@ class Benchmarks:
                     num_retries=self.num_retries,
                     num_retries_call=self.num_retries_call,
                     timeout=self.timeout,
+                    **kwargs,
                 )
-                logging.info(f"Benchmark completed for node {node}: {result['successful']}")
+                logging.info("Benchmark completed for node %s: %s", node, result["successful"])
                 results.append(result)
             except Exception as e:
-                logging.error(f"Error benchmarking node {node}: {str(e)}")
+                logging.error("Error benchmarking node %s: %s", node, e)
                 results.append(
                     {
                         "successful": False,
@@ -150,27 +218,17 @@ class Benchmarks:
         Returns:
             list: List of benchmark results, one for each node
         """
-        logging.info(f"Running config benchmark on {len(nodes)} nodes...")
-
-        # Create a wrapper function that passes connection parameters properly
-        def config_wrapper(node, how_many_seconds, **kwargs):
-            # Extract connection parameters
-            num_retries = kwargs.get("num_retries", self.num_retries)
-            num_retries_call = kwargs.get("num_retries_call", self.num_retries_call)
-            timeout = kwargs.get("timeout", self.timeout)
-
-            return get_status_node(
-                node,
-                num_retries=num_retries,
-                num_retries_call=num_retries_call,
-                timeout=timeout,
-                how_many_seconds=how_many_seconds,
-            )
+        logging.info("Running config benchmark on %d nodes...", len(nodes))
 
+        # Per-run arguments are forwarded to the benchmark with the connection parameters
         if threading:
-            return self._run_benchmark_threaded(nodes, config_wrapper, how_many_seconds)
+            return self._run_benchmark_threaded(
+                nodes, get_status_node, how_many_seconds=how_many_seconds
+            )
         else:
-            return self._run_benchmark_sequential(nodes, config_wrapper, how_many_seconds)
+            return self._run_benchmark_sequential(
+                nodes, get_status_node, how_many_seconds=how_many_seconds
+            )
 
     def run_token_benchmark(self, nodes, how_many_seconds, token="SWAP.HIVE", threading=True):
         """Run token retrieval benchmark tests on multiple nodes.
@@ -186,28 +244,17 @@ class Benchmarks:
         Returns:
             list: List of benchmark results, one for each node
         """
-        logging.info(f"Running token benchmark on {len(nodes)} nodes...")
-
-        # Create a wrapper function that passes connection parameters properly
-        def token_wrapper(node, how_many_seconds, **kwargs):
-            # Extract connection parameters
-            num_retries = kwargs.get("num_retries", self.num_retries)
-            num_retries_call = kwargs.get("num_retries_call", self.num_retries_call)
-            timeout = kwargs.get("timeout", self.timeout)
-
-            return benchmark_token_retrieval(
-                node,
-                num_retries=num_retries,
-                num_retries_call=num_retries_call,
-                timeout=timeout,
-                how_many_seconds=how_many_seconds,
-                token=token,
-            )
+        logging.info("Running token benchmark on %d nodes...", len(nodes))
 
+        # Per-run arguments are forwarded to the benchmark with the connection parameters
         if threading:
-            return self._run_benchmark_threaded(nodes, token_wrapper, how_many_seconds)
+            return self._run_benchmark_threaded(
+                nodes, benchmark_token_retrieval, how_many_seconds=how_many_seconds, token=token
+            )
         else:
-            return self._run_benchmark_sequential(nodes, token_wrapper, how_many_seconds)
+            return self._run_benchmark_sequential(
+                nodes, benchmark_token_retrieval, how_many_seconds=how_many_seconds, token=token
+            )
 
     def run_contract_benchmark(self, nodes, how_many_seconds, contract="tokens", threading=True):
         """Run contract retrieval benchmark tests on multiple nodes.
@@ -223,28 +270,23 @@ class Benchmarks:
         Returns:
             list: List of benchmark results, one for each node
         """
-        logging.info(f"Running contract benchmark on {len(nodes)} nodes...")
+        logging.info("Running contract benchmark on %d nodes...", len(nodes))
 
-        # Create a wrapper function that passes connection parameters properly
-        def contract_wrapper(node, how_many_seconds, **kwargs):
-            # Extract connection parameters
-            num_retries = kwargs.get("num_retries", self.num_retries)
-            num_retries_call = kwargs.get("num_retries_call", self.num_retries_call)
-            timeout = kwargs.get("timeout", self.timeout)
-
-            return benchmark_contract_retrieval(
-                node,
-                num_retries=num_retries,
-                num_retries_call=num_retries_call,
-                timeout=timeout,
+        # Per-run arguments are forwarded to the benchmark with the connection parameters
+        if threading:
+            return self._run_benchmark_threaded(
+                nodes,
+                benchmark_contract_retrieval,
                 how_many_seconds=how_many_seconds,
                 contract=contract,
             )
-
-        if threading:
-            return self._run_benchmark_threaded(nodes, contract_wrapper, how_many_seconds)
         else:
-            return self._run_benchmark_sequential(nodes, contract_wrapper, how_many_seconds)
+            return self._run_benchmark_sequential(
+                nodes,
+                benchmark_contract_retrieval,
+                how_many_seconds=how_many_seconds,
+                contract=contract,
+            )
 
     def run_account_history_benchmark(
         self, nodes, how_many_seconds, account_name="thecrazygm", threading=True
@@ -262,28 +304,23 @@ class Benchmarks:
         Returns:
             list: List of benchmark results, one for each node
         """
-        logging.info(f"Running account history benchmark on {len(nodes)} nodes...")
+        logging.info("Running account history benchmark on %d nodes...", len(nodes))
 
-        # Create a wrapper function that passes connection parameters properly
-        def history_wrapper(node, how_many_seconds, **kwargs):
-            # Extract connection parameters
-            num_retries = kwargs.get("num_retries", self.num_retries)
-            num_retries_call = kwargs.get("num_retries_call", self.num_retries_call)
-            timeout = kwargs.get("timeout", self.timeout)
-
-            return benchmark_account_history(
-                node,
-                num_retries=num_retries,
-                num_retries_call=num_retries_call,
-                timeout=timeout,
-                account_name=account_name,
+        # Per-run arguments are forwarded to the benchmark with the connection parameters
+        if threading:
+            return self._run_benchmark_threaded(
+                nodes,
+                benchmark_account_history,
                 how_many_seconds=how_many_seconds,
+                account_name=account_name,
             )
-
-        if threading:
-            return self._run_benchmark_threaded(nodes, history_wrapper, how_many_seconds)
         else:
-            return self._run_benchmark_sequential(nodes, history_wrapper, how_many_seconds)
+            return self._run_benchmark_sequential(
+                nodes,
+                benchmark_account_history,
+                how_many_seconds=how_many_seconds,
+                account_name=account_name,
+            )
 
     def run_latency_benchmark(self, nodes, threading=True):
         """Run latency benchmark tests on multiple nodes.
@@ -297,23 +334,177 @@ class Benchmarks:
         Returns:
             list: List of benchmark results, one for each node
         """
-        logging.info(f"Running latency benchmark on {len(nodes)} nodes...")
+        logging.info("Running latency benchmark on %d nodes...", len(nodes))
+
+        if threading:
+            return self._run_benchmark_threaded(nodes, benchmark_latency)
+        else:
+            return self._run_benchmark_sequential(nodes, benchmark_latency)
 
-        # Create a wrapper function that passes connection parameters properly
-        def latency_wrapper(node, **kwargs):
-            # Extract connection parameters
-            num_retries = kwargs.get("num_retries", self.num_retries)
-            num_retries_call = kwargs.get("num_retries_call", self.num_retries_call)
-            timeout = kwargs.get("timeout", self.timeout)
+    def _run_all_on_node(self, node, tests, node_results, abandoned=None):
+        """Run every benchmark test against one node, one test after another.
 
-            return benchmark_latency(
+        Args:
+            node (str): URL of the node to benchmark
+            tests (list): List of (test name, benchmark function, keyword arguments) tuples
+            node_results (dict): Receives the result of each test, keyed by test name, as soon
+                as the test finishes
+            abandoned (callable, optional): Checked before each test. Once it returns True the
+                caller has given up on the node and the remaining tests are skipped.
+
+        Returns:
+            dict: ``node_results``, holding the benchmark result of each test that ran
+        """
+        for test, benchmark_func, kwargs in tests:
+            if abandoned is not None and abandoned():
+                break
+            node_results[test] = benchmark_executor(
+                benchmark_func,
+                node,
+                num_retries=self.num_retries,
+                num_retries_call=self.num_retries_call,
+                timeout=self.timeout,
+                **kwargs,
+            )
+            logging.info(
+                "%s benchmark completed for node %s: %s",
+                test,
                 node,
-                num_retries=num_retries,
-                num_retries_call=num_retries_call,
-                timeout=timeout,
+                node_results[test]["successful"],
             )
+        return node_results
+
+    def run_all_benchmarks(
+        self,
+        nodes,
+        how_many_seconds,
+        token="SWAP.HIVE",
+        contract="tokens",
+        account_name="thecrazygm",
+        threading=True,
+    ):
+        """Run all benchmark tests with a single task per node.
 
-        if threading:
-            return self._run_benchmark_threaded(nodes, latency_wrapper)
-        else:
-            return self._run_benchmark_sequential(nodes, latency_wrapper)
+        Instead of running each test across all nodes before starting the next test, every
+        node runs its config, token, contract, account history and latency tests back to back
+        in one worker. Slow nodes no longer hold up the start of the next test on all the
+        others, and a node is never measured by two tests at the same time.
+
+        In threaded runs each node gets a time budget of twice every test's time limit plus
+        the connection timeout per test, counted from when its worker starts. A node still
+        running after that is abandoned: the tests it finished are kept, the others are
+        reported as failed with a "deadline" error, and its worker stops before the next test.
+
+        Args:
+            nodes (list): List of node URLs to benchmark
+            how_many_seconds (int): Time limit for each timed benchmark in seconds
+            token (str, optional): Token symbol to query. Defaults to "SWAP.HIVE".
+            contract (str, optional): Contract name to query. Defaults to "tokens".
+            account_name (str, optional): Account name to query history for. Defaults to "thecrazygm".
+            threading (bool, optional): Whether to run nodes concurrently. Defaults to True.
+
+        Returns:
+            dict: Lists of benchmark results keyed by test name ("config", "token", "contract",
+                "account_history" and "latency"), each in the same order as ``nodes``
+        """
+        logging.info("Running all benchmarks on %d nodes...", len(nodes))
+
+        tests = [
+            ("config", get_status_node, {"how_many_seconds": how_many_seconds}),
+            (
+                "token",
+                benchmark_token_retrieval,
+                {"how_many_seconds": how_many_seconds, "token": token},
+            ),
+            (
+                "contract",
+                benchmark_contract_retrieval,
+                {"how_many_seconds": how_many_seconds, "contract": contract},
+            ),
+            (
+                "account_history",
+                benchmark_account_history,
+                {"how_many_seconds": how_many_seconds, "account_name": account_name},
+            ),
+            ("latency", benchmark_latency, {}),
+        ]
+        per_node = [None] * len(nodes)
+        future_to_index = {}
+
+        try:
+            if threading:
+                self._run_all_threaded(nodes, tests, per_node, future_to_index)
+            else:
+                for index, node in enumerate(nodes):
+                    per_node[index] = self._run_all_on_node(node, tests, {})
+        except KeyboardInterrupt:
+            logging.info("KeyboardInterrupt received, stopping threads...")
+            QUIT.set()
+            for future in future_to_index:
+                future.cancel()
+
+        # Regroup by test, skipping nodes that were interrupted before finishing
+        return {
+            test: [node_results[test] for node_results in per_node if node_results is not None]
+            for test, _, _ in tests
+        }
+
+    def _run_all_threaded(self, nodes, tests, per_node, future_to_index):
+        """Run every node's tests in the shared pool, abandoning nodes that exceed their budget.
+
+        Args:
+            nodes (list): List of node URLs to benchmark
+            tests (list): List of (test name, benchmark function, keyword arguments) tuples
+            per_node (list): Receives the results of each node keyed by test name, at the
+                node's position in ``nodes``
+            future_to_index (dict): Filled with each submitted future and its node position, so
+                the caller can cancel queued nodes on interrupt
+        """
+        # Results of each node's finished tests, filled in by its worker as it goes
+        partial = [{} for _ in nodes]
+        # Time each node's tests actually started, so queued nodes are not timed out
+        started = {}
+        # Positions of the nodes given up on, checked by their workers between tests
+        abandoned = set()
+
+        budget = sum(2 * kwargs.get("how_many_seconds", 0) + self.timeout for _, _, kwargs in tests)
+
+        def run(index, node):
+            started[index] = time.monotonic()
+            return self._run_all_on_node(
+                node, tests, partial[index], abandoned=lambda: index in abandoned
+            )
+
+        for index, node in enumerate(nodes):
+            future_to_index[self._pool.submit(run, index, node)] = index
+
+        # Collect nodes as they finish, checking running nodes every tick
+        pending = set(future_to_index)
+        while pending:
+            done, pending = wait(pending, timeout=WAIT_TICK, return_when=FIRST_COMPLETED)
+            for future in done:
+                per_node[future_to_index[future]] = future.result()
+
+            # Give up on nodes that have been running longer than their budget
+            now = time.monotonic()
+            for future in list(pending):
+                index = future_to_index[future]
+                if index not in started or now - started[index] <= budget:
+                    continue
+                abandoned.add(index)
+                pending.discard(future)
+                node = nodes[index]
+                logging.error("Benchmarks for node %s did not finish before the deadline", node)
+                # Copy the finished tests, the worker may still store the running one
+                node_results = dict(partial[index])
+                for test, _, _ in tests:
+                    node_results.setdefault(
+                        test,
+                        {
+                            "successful": False,
+                            "node": node,
+                            "error": "deadline",
+                            "total_duration": 0.0,
+                        },
+                    )
+                per_node[index] = node_results
@@ -2,29 +2,60 @@
 """Generate a benchmark post from the latest benchmark data and optionally publish it to Hive."""
 
 import argparse
+import functools
 import json
 import logging
 import os
-import re
+import string
 from datetime import datetime
 from pathlib import Path
 
-from dotenv import load_dotenv  # Load environment variables
-
 from engine_bench import __version__
-from engine_bench.blockchain import post_to_hive
-from engine_bench.post_generation import generate_post
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup, fall back to json
+    orjson = None
+
+# Characters kept in a permlink slug
+_SLUG_KEEP = frozenset(string.ascii_lowercase + string.digits + "-")
+
+# Turns spaces and slashes into dashes and deletes every other ASCII character not kept
+_SLUG_TABLE = str.maketrans(
+    {**{chr(i): None for i in range(128) if chr(i) not in _SLUG_KEEP}, " ": "-", "/": "-"}
+)
+
+
+def _write_json(path, data):
+    """Write data as indented JSON, replacing the file atomically.
+
+    Uses orjson when it is installed and falls back to the standard json module.
+
+    Args:
+        path (Path): Destination file
+        data: JSON-serializable object to write
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        tmp_path.write_text(json.dumps(data, indent=2))
+    os.replace(tmp_path, path)
 
 
 def generate_permlink(title, date_str):
     """Generate a standardized permlink from title and date."""
-    title_slug = title.lower().replace(" ", "-").replace("/", "-")
-    title_slug = re.sub(r"[^a-z0-9-]", "", title_slug)
+    # Non-ASCII characters are dropped by the encode, the rest in one translate pass
+    title_slug = title.lower().encode("ascii", "ignore").decode("ascii").translate(_SLUG_TABLE)
     return f"{date_str.replace('-', '')}-{title_slug}"
 
 
+@functools.lru_cache(maxsize=1)
 def get_project_root() -> Path:
-    """Get the absolute path to the project root directory."""
+    """Get the absolute path to the project root directory.
+
+    The path is resolved once per process.
+    """
     current_file = Path(__file__).resolve()
     # Go up three levels from src/engine_bench/cli/generate_post.py to reach project root
     return current_file.parent.parent.parent.parent
@@ -43,61 +74,79 @@ def load_post_content(markdown_path):
         markdown_path = os.path.join(get_project_root(), markdown_path)
 
     if not os.path.exists(markdown_path):
-        logging.error(f"Post content file not found at {markdown_path}")
+        logging.error("Post content file not found at %s", markdown_path)
         return None
 
     try:
         with open(markdown_path, "r") as f:
             return f.read()
     except Exception as e:
-        logging.error(f"Error loading post content from {markdown_path}: {e}")
+        logging.error("Error loading post content from %s: %s", markdown_path, e)
         return None
 
 
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser.
+
+    Returns:
+        argparse.ArgumentParser: Parser for the generate_post command line
+    """
+    parser = argparse.ArgumentParser(
+        description="Generate a benchmark post from the latest data and optionally publish it to Hive"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="engine_benchmark_post.md",
+        help="Path to save the markdown post (default: engine_benchmark_post.md)",
+    )
+    parser.add_argument(
+        "-d",
+        "--db",
+        default="engine_benchmark_history.db",
+        help="Path to the SQLite database file (default: engine_benchmark_history.db)",
+    )
+    parser.add_argument(
+        "-j",
+        "--json",
+        default="engine_benchmark_metadata.json",
+        help="Path to save the post metadata JSON (default: engine_benchmark_metadata.json)",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        help="Number of days of historical data to include (default: 7)",
+    )
+    parser.add_argument("-p", "--publish", action="store_true", help="Publish the post to Hive")
+    parser.add_argument("-a", "--account", help="Hive account name to post from")
+    parser.add_argument("-k", "--key", help="Hive posting key for the account")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Don't actually post to Hive, just show what would be posted",
+    )
+    parser.add_argument(
+        "--permlink", help="Custom permlink for the post (default: auto-generated from title)"
+    )
+    parser.add_argument("--community", help="Community to post to (optional)")
+    parser.add_argument(
+        "--tags",
+        help="Comma-separated list of tags (default: hive-engine,benchmark,nodes,api,performance)",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
+    parser.add_argument("--version", action="version", version=f"engine-bench {__version__}")
+    return parser
+
+
 def main():
     """Main entry point for generating benchmark posts and optionally publishing to Hive."""
     try:
-        # Load environment variables
-        load_dotenv()
-        # Parse command line arguments
-        parser = argparse.ArgumentParser(
-            description="Generate a benchmark post from the latest data and optionally publish it to Hive"
-        )
-        parser.add_argument(
-            "-o",
-            "--output",
-            default="engine_benchmark_post.md",
-            help="Path to save the markdown post (default: engine_benchmark_post.md)",
-        )
-        parser.add_argument(
-            "-d",
-            "--db",
-            default="engine_benchmark_history.db",
-            help="Path to the SQLite database file (default: engine_benchmark_history.db)",
-        )
-        parser.add_argument(
-            "-j",
-            "--json",
-            default="engine_benchmark_metadata.json",
-            help="Path to save the post metadata JSON (default: engine_benchmark_metadata.json)",
-        )
-        parser.add_argument(
-            "--days",
-            type=int,
-            default=7,
-            help="Number of days of historical data to include (default: 7)",
-        )
-        parser.add_argument("-p", "--publish", action="store_true", help="Publish the post to Hive")
-        parser.add_argument("-a", "--account", help="Hive account name to post from")
-        parser.add_argument("-k", "--key", help="Hive posting key for the account")
-        parser.add_argument(
-            "--dry-run",
-            action="store_true",
-            help="Don't actually post to Hive, just show what would be posted",
-        )
-        parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
-        parser.add_argument("--version", action="version", version=f"engine-bench {__version__}")
-        args = parser.parse_args()
+        args = build_parser().parse_args()
+
+        # Heavy modules are imported after argument parsing so --help and
+        # --version return without loading nectar and the report generator
+        from engine_bench.post_generation import generate_post
 
         # Configure logging
         log_level = logging.DEBUG if args.verbose else logging.INFO
@@ -106,7 +155,7 @@ def main():
         )
 
         # Generate post
-        logging.info(f"Generating benchmark post from database {args.db}")
+        logging.info("Generating benchmark post from database %s", args.db)
         content, metadata = generate_post(output_file=args.output, db_path=args.db, days=args.days)
 
         if metadata is None or content is None:
@@ -114,14 +163,18 @@ def main():
             print("Failed to generate post content or metadata. See earlier errors for details.")
             return 1
 
+        # Add title to metadata so it is saved with the rest of the post data
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        metadata["title"] = f"Hive-Engine Benchmark Report - {date_str}"
+        logging.info("Added title to metadata: '%s'", metadata["title"])
+
         # Save metadata to JSON file
         json_path = args.json
         if not os.path.isabs(json_path):
             json_path = os.path.join(get_project_root(), json_path)
 
-        with open(json_path, "w") as f:
-            json.dump(metadata, f, indent=2)
-        logging.info(f"Metadata saved to {json_path}")
+        _write_json(Path(json_path), metadata)
+        logging.info("Metadata saved to %s", json_path)
 
         # Print summary
         print("\nPost Generation Summary:")
@@ -139,6 +192,12 @@ def main():
 
         # Publish to Hive if requested
         if args.publish:
+            # Read the .env file only when the credentials are not already in the environment
+            if not (os.environ.get("HIVE_ACCOUNT") and os.environ.get("POSTING_WIF")):
+                from dotenv import load_dotenv
+
+                load_dotenv()
+
             # Get account and key from environment if not provided as args
             account = args.account or os.environ.get("HIVE_ACCOUNT")
             key = args.key or os.environ.get("POSTING_WIF")
@@ -147,34 +206,31 @@ def main():
                 logging.error(
                     "No Hive account specified. Use --account or set HIVE_ACCOUNT environment variable."
                 )
-                return
+                return 1
 
             if not key and not args.dry_run:
                 logging.error(
-                    "No Hive posting key specified. Use --key or set POSTING_WIF set  environment variable."
+                    "No Hive posting key specified. Use --key or set POSTING_WIF environment variable."
                 )
-                return
+                return 1
 
             # Load the post content if needed
             if not content:
                 content = load_post_content(args.output)
                 if not content:
-                    logging.error(f"Failed to load post content from {args.output}")
-                    return
+                    logging.error("Failed to load post content from %s", args.output)
+                    return 1
 
-            # Prepare post metadata
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            title = f"Hive-Engine Benchmark Report - {date_str}"
-            metadata["title"] = title
-
-            # Standardized permlink generation
-            permlink = generate_permlink(metadata["title"], date_str)
+            # Standardized permlink generation, title was added to the metadata earlier
+            permlink = args.permlink or generate_permlink(metadata["title"], date_str)
 
             # Get default tags
             tags = ["hive-engine", "benchmark", "nodes", "performance", "api", "sbi-skip"]
+            if args.tags:
+                tags = [t.strip() for t in args.tags.split(",")]
 
             # Post to Hive
-            logging.info(f"Publishing post to Hive as @{account}...")
+            logging.info("Publishing post to Hive as @%s...", account)
             try:
                 # Set DRY_RUN environment variable for the blockchain module
                 if args.dry_run:
@@ -185,19 +241,27 @@ def main():
                 if key:
                     os.environ["POSTING_WIF"] = key
 
+                from engine_bench.blockchain import post_to_hive
+
                 # Post to Hive using the blockchain module
-                post_to_hive(content=content, metadata=metadata, permlink=permlink, tags=tags)
+                post_to_hive(
+                    content=content,
+                    metadata=metadata,
+                    permlink=permlink,
+                    tags=tags,
+                    community=args.community,
+                )
 
                 # Print success message
                 print("\nSuccessfully posted to Hive!")
                 print(f"View your post at: https://peakd.com/@{account}/{permlink}")
 
             except Exception as e:
-                logging.error(f"Failed to post to Hive: {e}")
+                logging.error("Failed to post to Hive: %s", e)
                 print(f"\nFailed to post to Hive: {e}")
         return 0
     except Exception as e:
-        logging.error(f"Unexpected error in generate_post: {e}")
+        logging.error("Unexpected error in generate_post: %s", e)
         return 1
 
 
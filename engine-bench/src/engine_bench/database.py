@@ -1,5 +1,6 @@
 """Database operations for storing hive-engine benchmark results."""
 
+import functools
 import json
 import logging
 import os
@@ -7,9 +8,68 @@ import sqlite3
 from datetime import datetime
 from pathlib import Path
 
-
+# Connection settings for the benchmark history database. WAL lets the post generator
+# read while a run is being stored, and with synchronous=NORMAL commits no longer wait
+# for a sync of the main database file. The journal mode is stored in the file itself.
+_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+"""
+
+# Connection settings for report generation, which only reads. query_only rejects any
+# accidental write; the page cache and memory map match the writer's settings.
+_READ_PRAGMAS = """
+PRAGMA query_only=ON;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+"""
+
+# Size of the per-connection compiled statement cache, above the sqlite3 default of 128
+_CACHED_STATEMENTS = 256
+
+# Insert a node or refresh its last_seen timestamp. Upserts need SQLite 3.24 and RETURNING
+# needs 3.35; on older libraries the node_id is looked up after the upsert.
+_UPSERT_NODE_SQL = """
+INSERT INTO nodes (url, first_seen, last_seen) VALUES (?, ?, ?)
+ON CONFLICT(url) DO UPDATE SET last_seen = excluded.last_seen
+"""
+_UPSERT_NODE_RETURNING_SQL = _UPSERT_NODE_SQL + "RETURNING node_id\n"
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Test types stored per working node
+TEST_TYPES = ("token", "contract", "account_history", "config", "latency")
+
+# Insert statements for one benchmark report. Every call passes the identical SQL text,
+# so the statement is compiled once and then served from the connection's cache.
+_INSERT_RUN_SQL = """
+INSERT INTO benchmark_runs (
+    timestamp, start_time, end_time, nectar_engine_version, script_version,
+    num_retries, num_retries_call, timeout, threading, test_parameters
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_NODE_STATUS_SQL = """
+INSERT INTO node_status (
+    run_id, node_id, is_working, error_message, SSCnodeVersion, is_engine
+) VALUES (?, ?, ?, ?, ?, ?)
+"""
+_INSERT_TEST_RESULT_SQL = """
+INSERT INTO test_results (
+    run_id, node_id, test_type, is_ok, rank, time, count,
+    access_time, min_latency, max_latency, avg_latency
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+@functools.lru_cache(maxsize=1)
 def get_project_root() -> Path:
-    """Get the absolute path to the project root directory."""
+    """Get the absolute path to the project root directory.
+
+    The path is resolved once per process.
+    """
     current_file = Path(__file__).resolve()
     # Go up two levels from src/engine_bench/database.py to reach project root
     return current_file.parent.parent.parent
@@ -31,6 +91,122 @@ def get_db_path(db_path="engine_benchmark_history.db") -> Path:
     return get_project_root() / db_path
 
 
+def _configure_conn(conn):
+    """Apply the connection PRAGMAs to a freshly opened connection.
+
+    Args:
+        conn (sqlite3.Connection): The connection to configure
+    """
+    conn.executescript(_PRAGMAS)
+
+
+def connect_readonly(db_path):
+    """Open the benchmark database for reading report data.
+
+    Rows are returned as ``sqlite3.Row`` so columns can be accessed by name.
+
+    Args:
+        db_path (str): Path to the SQLite database file
+
+    Returns:
+        sqlite3.Connection: Connection that refuses writes
+    """
+    conn = sqlite3.connect(db_path, cached_statements=_CACHED_STATEMENTS)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_READ_PRAGMAS)
+    return conn
+
+
+def initialize_schema(conn):
+    """Create the benchmark tables on an open connection if they don't exist.
+
+    The statements are no-ops for tables that already exist, so this is cheap enough to
+    run before every write.
+
+    Args:
+        conn (sqlite3.Connection): Open connection to the benchmark database
+    """
+    cursor = conn.cursor()
+
+    # Create benchmark runs table
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS benchmark_runs (
+        run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        nectar_engine_version TEXT,
+        script_version TEXT,
+        num_retries INTEGER,
+        num_retries_call INTEGER,
+        timeout INTEGER,
+        threading INTEGER,
+        test_parameters TEXT
+    )
+    """)
+
+    # Create nodes table
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS nodes (
+        node_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT UNIQUE NOT NULL,
+        first_seen TEXT,
+        last_seen TEXT
+    )
+    """)
+
+    # Create node status table
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS node_status (
+        status_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id INTEGER,
+        node_id INTEGER,
+        is_working INTEGER,
+        error_message TEXT,
+        SSCnodeVersion TEXT,
+        is_engine INTEGER,
+        FOREIGN KEY (run_id) REFERENCES benchmark_runs (run_id),
+        FOREIGN KEY (node_id) REFERENCES nodes (node_id)
+    )
+    """)
+
+    # Create test results table
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS test_results (
+        result_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id INTEGER,
+        node_id INTEGER,
+        test_type TEXT,  -- token, contract, account_history, config, latency
+        is_ok INTEGER,
+        rank INTEGER,
+        time REAL,
+        count INTEGER,
+        access_time REAL,
+        min_latency REAL,
+        max_latency REAL,
+        avg_latency REAL,
+        FOREIGN KEY (run_id) REFERENCES benchmark_runs (run_id),
+        FOREIGN KEY (node_id) REFERENCES nodes (node_id)
+    )
+    """)
+
+    # Indexes for reading back one run, a node's history and time-windowed reports. The
+    # run indexes also carry the columns the report queries read, so those joins are
+    # answered from the index alone.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_node_status_run_node"
+        " ON node_status (run_id, node_id, is_working)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_test_results_run_type"
+        " ON test_results (run_id, test_type, node_id, rank)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_test_results_node_type ON test_results (node_id, test_type)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON benchmark_runs (timestamp)")
+
+
 def initialize_database(db_path="engine_benchmark_history.db"):
     """Create the SQLite database and tables if they don't exist.
 
@@ -57,71 +233,10 @@ def initialize_database(db_path="engine_benchmark_history.db"):
         db_path = get_db_path(db_path)
 
         conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Create benchmark runs table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS benchmark_runs (
-            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT NOT NULL,
-            start_time TEXT NOT NULL,
-            end_time TEXT NOT NULL,
-            nectar_engine_version TEXT,
-            script_version TEXT,
-            num_retries INTEGER,
-            num_retries_call INTEGER,
-            timeout INTEGER,
-            threading INTEGER,
-            test_parameters TEXT
-        )
-        """)
-
-        # Create nodes table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS nodes (
-            node_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            url TEXT UNIQUE NOT NULL,
-            first_seen TEXT,
-            last_seen TEXT
-        )
-        """)
-
-        # Create node status table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS node_status (
-            status_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            run_id INTEGER,
-            node_id INTEGER,
-            is_working INTEGER,
-            error_message TEXT,
-            SSCnodeVersion TEXT,
-            is_engine INTEGER,
-            FOREIGN KEY (run_id) REFERENCES benchmark_runs (run_id),
-            FOREIGN KEY (node_id) REFERENCES nodes (node_id)
-        )
-        """)
-
-        # Create test results table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS test_results (
-            result_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            run_id INTEGER,
-            node_id INTEGER,
-            test_type TEXT,  -- token, contract, account_history, config, latency
-            is_ok INTEGER,
-            rank INTEGER,
-            time REAL,
-            count INTEGER,
-            access_time REAL,
-            min_latency REAL,
-            max_latency REAL,
-            avg_latency REAL,
-            FOREIGN KEY (run_id) REFERENCES benchmark_runs (run_id),
-            FOREIGN KEY (node_id) REFERENCES nodes (node_id)
-        )
-        """)
-
+        _configure_conn(conn)
+        initialize_schema(conn)
         conn.commit()
+        conn.execute("PRAGMA optimize")
         conn.close()
         logging.info(f"Database initialized at {db_path}")
     except sqlite3.Error as e:
@@ -132,10 +247,8 @@ def initialize_database(db_path="engine_benchmark_history.db"):
 def get_or_create_node_id(cursor, node_url, timestamp):
     """Get node ID from the database or create it if it doesn't exist.
 
-    This function checks if a node with the given URL already exists in the database.
-    If it does, it updates the last_seen timestamp and returns the existing node_id.
-    If not, it creates a new node record with the given URL and timestamp, and returns
-    the newly created node_id.
+    The node is written with a single upsert: a new URL gets a fresh record with the given
+    timestamp as first and last seen, an existing one only has its last_seen updated.
 
     Args:
         cursor (sqlite3.Cursor): Database cursor for executing SQL queries
@@ -145,22 +258,144 @@ def get_or_create_node_id(cursor, node_url, timestamp):
     Returns:
         int: The node_id of the existing or newly created node record
     """
-    # Check if node already exists
-    cursor.execute("SELECT node_id FROM nodes WHERE url = ?", (node_url,))
-    node_record = cursor.fetchone()
-
-    if node_record:
-        # Update last_seen timestamp for existing node
-        node_id = node_record[0]
-        cursor.execute("UPDATE nodes SET last_seen = ? WHERE node_id = ?", (timestamp, node_id))
-        return node_id
-    else:
-        # Create new node record
-        cursor.execute(
-            "INSERT INTO nodes (url, first_seen, last_seen) VALUES (?, ?, ?)",
-            (node_url, timestamp, timestamp),
+    params = (node_url, timestamp, timestamp)
+    if _HAS_RETURNING:
+        return cursor.execute(_UPSERT_NODE_RETURNING_SQL, params).fetchone()[0]
+
+    # Older SQLite without RETURNING: lastrowid is unreliable after the update path
+    cursor.execute(_UPSERT_NODE_SQL, params)
+    return cursor.execute("SELECT node_id FROM nodes WHERE url = ?", (node_url,)).fetchone()[0]
+
+
+def get_or_create_node_ids(cursor, node_urls, timestamp):
+    """Get node IDs for several URLs at once, creating the nodes that don't exist yet.
+
+    All URLs are upserted with one ``executemany`` call and their ids are read back with a
+    single query, so the number of statements does not grow with the number of nodes.
+
+    Args:
+        cursor (sqlite3.Cursor): Database cursor for executing SQL queries
+        node_urls (list): URLs of the nodes to get or create
+        timestamp (str): Current timestamp in string format
+
+    Returns:
+        dict: Mapping of node URL to node_id
+    """
+    urls = list(dict.fromkeys(node_urls))
+    if not urls:
+        return {}
+
+    cursor.executemany(_UPSERT_NODE_SQL, [(url, timestamp, timestamp) for url in urls])
+    placeholders = ", ".join("?" * len(urls))
+    cursor.execute(f"SELECT url, node_id FROM nodes WHERE url IN ({placeholders})", urls)
+    return dict(cursor)
+
+
+def _insert_report(cursor, report_data):
+    """Insert one benchmark report into the database.
+
+    Rows are collected per table and written with one ``executemany`` call each.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor of the connection holding the open transaction
+        report_data (dict): The benchmark report, as accepted by ``store_benchmark_data_in_db``
+    """
+    # Extract data from report
+    params = report_data.get("parameter", {})
+    report = report_data.get("report", [])
+    failing_nodes = report_data.get("failing_nodes", {})
+    # Only read the clock when the report does not carry its own timestamp
+    timestamp = params.get("timestamp")
+    if timestamp is None:
+        timestamp = datetime.now().isoformat()
+
+    # Insert benchmark run record
+    cursor.execute(
+        _INSERT_RUN_SQL,
+        (
+            timestamp,
+            params.get("start_time", ""),
+            params.get("end_time", ""),
+            params.get("nectar_engine_version", ""),
+            params.get("script_version", ""),
+            params.get("num_retries", 0),
+            params.get("num_retries_call", 0),
+            params.get("timeout", 0),
+            1 if params.get("threading", False) else 0,
+            json.dumps(params),
+        ),
+    )
+
+    # Get the run_id of the newly inserted benchmark run
+    run_id = cursor.lastrowid
+
+    # Rows for each table, written in bulk once every node is processed
+    status_rows = []
+    test_rows = []
+
+    # Resolve the ids of every node in the report up front
+    node_urls = [node_data.get("node", "") for node_data in report]
+    node_urls = [url for url in node_urls if url] + list(failing_nodes)
+    node_ids = get_or_create_node_ids(cursor, node_urls, timestamp)
+
+    # Process working nodes
+    for node_data in report:
+        node_url = node_data.get("node", "")
+        if not node_url:
+            continue
+
+        node_id = node_ids[node_url]
+
+        # Queue node status record
+        status_rows.append(
+            (
+                run_id,
+                node_id,
+                1,  # is_working = True for working nodes
+                None,  # No error message for working nodes
+                node_data.get("SSCnodeVersion", "unknown"),
+                1 if node_data.get("engine", False) else 0,
+            )
         )
-        return cursor.lastrowid
+
+        # Queue test results for each test type
+        for test_type in TEST_TYPES:
+            if test_type in node_data and isinstance(node_data[test_type], dict):
+                test_data = node_data[test_type]
+                test_rows.append(
+                    (
+                        run_id,
+                        node_id,
+                        test_type,
+                        1 if test_data.get("ok", False) else 0,
+                        test_data.get("rank", -1),
+                        test_data.get("time", 0.0),
+                        test_data.get("count", 0),
+                        test_data.get("access_time", 0.0),
+                        test_data.get("min_latency", 0.0),
+                        test_data.get("max_latency", 0.0),
+                        test_data.get("avg_latency", 0.0),
+                    )
+                )
+
+    # Process failing nodes
+    for node_url, error_message in failing_nodes.items():
+        node_id = node_ids[node_url]
+
+        # Queue node status record
+        status_rows.append(
+            (
+                run_id,
+                node_id,
+                0,  # is_working = False for failing nodes
+                error_message,
+                "unknown",  # Default SSCnodeVersion for failing nodes
+                0,  # Default is_engine = False for failing nodes
+            )
+        )
+
+    cursor.executemany(_INSERT_NODE_STATUS_SQL, status_rows)
+    cursor.executemany(_INSERT_TEST_RESULT_SQL, test_rows)
 
 
 def store_benchmark_data_in_db(report_data, db_path="engine_benchmark_history.db"):
@@ -171,7 +406,7 @@ def store_benchmark_data_in_db(report_data, db_path="engine_benchmark_history.db
     both working nodes and failing nodes, storing appropriate information for each.
 
     The function performs the following operations:
-    1. Initializes the database if it doesn't exist
+    1. Creates the tables if they don't exist
     2. Stores benchmark run metadata (timestamp, versions, parameters)
     3. For each working node, stores node status and test results
     4. For each failing node, stores node status with error message
@@ -196,127 +431,20 @@ def store_benchmark_data_in_db(report_data, db_path="engine_benchmark_history.db
         # Get absolute path to database
         db_path = get_db_path(db_path)
 
-        # Initialize database if needed
-        if not os.path.exists(db_path):
-            initialize_database(db_path)
-
-        # Set up database connection
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Extract data from report
-        params = report_data.get("parameter", {})
-        report = report_data.get("report", [])
-        failing_nodes = report_data.get("failing_nodes", {})
-        timestamp = params.get("timestamp", datetime.now().isoformat())
-
-        # Insert benchmark run record
-        cursor.execute(
-            """
-            INSERT INTO benchmark_runs (
-                timestamp, start_time, end_time, nectar_engine_version, script_version,
-                num_retries, num_retries_call, timeout, threading, test_parameters
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                timestamp,
-                params.get("start_time", ""),
-                params.get("end_time", ""),
-                params.get("nectar_engine_version", ""),
-                params.get("script_version", ""),
-                params.get("num_retries", 0),
-                params.get("num_retries_call", 0),
-                params.get("timeout", 0),
-                1 if params.get("threading", False) else 0,
-                json.dumps(params),
-            ),
-        )
-
-        # Get the run_id of the newly inserted benchmark run
-        run_id = cursor.lastrowid
-
-        # Process working nodes
-        for node_data in report:
-            node_url = node_data.get("node", "")
-            if not node_url:
-                continue
-
-            # Get or create node record
-            node_id = get_or_create_node_id(cursor, node_url, timestamp)
-
-            # Insert node status record
-            cursor.execute(
-                """
-                INSERT INTO node_status (
-                    run_id, node_id, is_working, SSCnodeVersion, is_engine
-                ) VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    run_id,
-                    node_id,
-                    1,  # is_working = True for working nodes
-                    node_data.get("SSCnodeVersion", "unknown"),
-                    1 if node_data.get("engine", False) else 0,
-                ),
-            )
-
-            # Insert test results for each test type
-            for test_type in [
-                "token",
-                "contract",
-                "account_history",
-                "config",
-                "latency",
-            ]:
-                if test_type in node_data and isinstance(node_data[test_type], dict):
-                    test_data = node_data[test_type]
-                    cursor.execute(
-                        """
-                        INSERT INTO test_results (
-                            run_id, node_id, test_type, is_ok, rank, time, count,
-                            access_time, min_latency, max_latency, avg_latency
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            run_id,
-                            node_id,
-                            test_type,
-                            1 if test_data.get("ok", False) else 0,
-                            test_data.get("rank", -1),
-                            test_data.get("time", 0.0),
-                            test_data.get("count", 0),
-                            test_data.get("access_time", 0.0),
-                            test_data.get("min_latency", 0.0),
-                            test_data.get("max_latency", 0.0),
-                            test_data.get("avg_latency", 0.0),
-                        ),
-                    )
-
-        # Process failing nodes
-        for node_url, error_message in failing_nodes.items():
-            # Get or create node record
-            node_id = get_or_create_node_id(cursor, node_url, timestamp)
-
-            # Insert node status record
-            cursor.execute(
-                """
-                INSERT INTO node_status (
-                    run_id, node_id, is_working, error_message, SSCnodeVersion, is_engine
-                ) VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    run_id,
-                    node_id,
-                    0,  # is_working = False for failing nodes
-                    error_message,
-                    "unknown",  # Default SSCnodeVersion for failing nodes
-                    0,  # Default is_engine = False for failing nodes
-                ),
-            )
-
-        # Commit changes and close connection
-        conn.commit()
-        conn.close()
+        # Create the tables and write the whole run on one connection and in one explicit
+        # transaction, so every row is committed with a single sync and nothing is left
+        # behind if an insert fails
+        conn = sqlite3.connect(db_path, isolation_level=None, cached_statements=_CACHED_STATEMENTS)
+        try:
+            _configure_conn(conn)
+            with conn:
+                conn.execute("BEGIN")
+                initialize_schema(conn)
+                _insert_report(conn.cursor(), report_data)
+            # Refresh query planner statistics where they have gone stale; usually a no-op
+            conn.execute("PRAGMA optimize")
+        finally:
+            conn.close()
         logging.info(f"Benchmark data stored in database at {db_path}")
     except sqlite3.Error as e:
         logging.error(f"Database error: {e}")
@@ -349,134 +477,147 @@ def get_latest_benchmark_data(db_path="engine_benchmark_history.db"):
             return None
 
         # Set up database connection
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row  # This enables column access by name
-        cursor = conn.cursor()
-
-        # Get the most recent benchmark run
-        cursor.execute(
-            """
-            SELECT * FROM benchmark_runs
-            ORDER BY timestamp DESC
-            LIMIT 1
-            """
-        )
-        run = cursor.fetchone()
+        conn = connect_readonly(db_path)
+        try:
+            return read_latest_benchmark_data(conn)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logging.error(f"Database error retrieving benchmark data: {e}")
+        return None
+    except Exception as e:
+        logging.error(f"Error retrieving benchmark data: {e}")
+        return None
 
-        if not run:
-            logging.warning("No benchmark runs found in database")
-            return None
 
-        run_id = run["run_id"]
-        params = json.loads(run["test_parameters"]) if run["test_parameters"] else {}
-
-        # Add additional parameters from the benchmark_runs table
-        params.update(
-            {
-                "timestamp": run["timestamp"],
-                "start_time": run["start_time"],
-                "end_time": run["end_time"],
-                "nectar_engine_version": run["nectar_engine_version"],
-                "script_version": run["script_version"],
-                "num_retries": run["num_retries"],
-                "num_retries_call": run["num_retries_call"],
-                "timeout": run["timeout"],
-                "threading": bool(run["threading"]),
-            }
-        )
+def read_latest_benchmark_data(conn):
+    """Read the latest benchmark run over an open connection.
 
-        # Get all working nodes for this run
-        cursor.execute(
-            """
-            SELECT n.url, ns.SSCnodeVersion, ns.is_engine
-            FROM node_status ns
-            JOIN nodes n ON ns.node_id = n.node_id
-            WHERE ns.run_id = ? AND ns.is_working = 1
-            """,
-            (run_id,),
-        )
-        working_nodes = cursor.fetchall()
-
-        # Get all failing nodes for this run
-        cursor.execute(
-            """
-            SELECT n.url, ns.error_message
-            FROM node_status ns
-            JOIN nodes n ON ns.node_id = n.node_id
-            WHERE ns.run_id = ? AND ns.is_working = 0
-            """,
-            (run_id,),
-        )
-        failing_nodes_data = cursor.fetchall()
-
-        # Convert failing nodes data to dictionary format
-        failing_nodes = {}
-        for node in failing_nodes_data:
-            failing_nodes[node["url"]] = node["error_message"]
-
-        # Prepare report data for working nodes
-        report = []
-        for node in working_nodes:
-            node_url = node["url"]
-            node_id = get_or_create_node_id(cursor, node_url, run["timestamp"])
-
-            # Get test results for this node
-            cursor.execute(
-                """
-                SELECT test_type, is_ok, rank, time, count, access_time,
-                       min_latency, max_latency, avg_latency
-                FROM test_results
-                WHERE run_id = ? AND node_id = ?
-                """,
-                (run_id, node_id),
-            )
-            test_results = cursor.fetchall()
+    Args:
+        conn (sqlite3.Connection): Read-only connection to the benchmark database.
+
+    Returns:
+        dict: Benchmark data as returned by get_latest_benchmark_data, or None when the
+            database holds no runs.
+    """
+    cursor = conn.cursor()
+
+    # Get the most recent benchmark run
+    cursor.execute(
+        """
+        SELECT * FROM benchmark_runs
+        ORDER BY timestamp DESC
+        LIMIT 1
+        """
+    )
+    run = cursor.fetchone()
+
+    if not run:
+        logging.warning("No benchmark runs found in database")
+        return None
 
-            # Create node data structure
-            node_data = {
-                "node": node_url,
-                "SSCnodeVersion": node["SSCnodeVersion"],
-                "engine": bool(node["is_engine"]),
+    run_id = run["run_id"]
+    params = json.loads(run["test_parameters"]) if run["test_parameters"] else {}
+
+    # Add additional parameters from the benchmark_runs table
+    params.update(
+        {
+            "timestamp": run["timestamp"],
+            "start_time": run["start_time"],
+            "end_time": run["end_time"],
+            "nectar_engine_version": run["nectar_engine_version"],
+            "script_version": run["script_version"],
+            "num_retries": run["num_retries"],
+            "num_retries_call": run["num_retries_call"],
+            "timeout": run["timeout"],
+            "threading": bool(run["threading"]),
+        }
+    )
+
+    # Get all working nodes for this run
+    cursor.execute(
+        """
+        SELECT n.node_id, n.url, ns.SSCnodeVersion, ns.is_engine
+        FROM node_status ns
+        JOIN nodes n ON ns.node_id = n.node_id
+        WHERE ns.run_id = ? AND ns.is_working = 1
+        """,
+        (run_id,),
+    )
+    working_nodes = cursor.fetchall()
+
+    # Get all failing nodes for this run
+    cursor.execute(
+        """
+        SELECT n.url, ns.error_message
+        FROM node_status ns
+        JOIN nodes n ON ns.node_id = n.node_id
+        WHERE ns.run_id = ? AND ns.is_working = 0
+        """,
+        (run_id,),
+    )
+
+    # Convert failing nodes data to dictionary format
+    failing_nodes = {}
+    for node in cursor:
+        failing_nodes[node["url"]] = node["error_message"]
+
+    # Get the test results of every node in this run at once, grouped by node
+    cursor.execute(
+        """
+        SELECT node_id, test_type, is_ok, rank, time, count, access_time,
+               min_latency, max_latency, avg_latency
+        FROM test_results
+        WHERE run_id = ?
+        ORDER BY result_id
+        """,
+        (run_id,),
+    )
+    results_by_node = {}
+    for result in cursor:
+        results_by_node.setdefault(result["node_id"], []).append(result)
+
+    # Prepare report data for working nodes
+    report = []
+    for node in working_nodes:
+        node_url = node["url"]
+        test_results = results_by_node.get(node["node_id"], ())
+
+        # Create node data structure
+        node_data = {
+            "node": node_url,
+            "SSCnodeVersion": node["SSCnodeVersion"],
+            "engine": bool(node["is_engine"]),
+        }
+
+        # Add test results to node data
+        for result in test_results:
+            test_type = result["test_type"]
+            node_data[test_type] = {
+                "ok": bool(result["is_ok"]),
+                "rank": result["rank"],
+                "time": result["time"],
+                "count": result["count"],
+                "access_time": result["access_time"],
             }
 
-            # Add test results to node data
-            for result in test_results:
-                test_type = result["test_type"]
-                node_data[test_type] = {
-                    "ok": bool(result["is_ok"]),
-                    "rank": result["rank"],
-                    "time": result["time"],
-                    "count": result["count"],
-                    "access_time": result["access_time"],
-                }
-
-                # Add latency metrics if available
-                if test_type == "latency" and result["is_ok"]:
-                    node_data[test_type]["min_latency"] = result["min_latency"]
-                    node_data[test_type]["max_latency"] = result["max_latency"]
-                    node_data[test_type]["avg_latency"] = result["avg_latency"]
-
-            report.append(node_data)
-
-        # Get the list of all node URLs that were tested
-        nodes = [node["node"] for node in report]
-
-        # Close connection
-        conn.close()
+            # Add latency metrics if available
+            if test_type == "latency" and result["is_ok"]:
+                node_data[test_type]["min_latency"] = result["min_latency"]
+                node_data[test_type]["max_latency"] = result["max_latency"]
+                node_data[test_type]["avg_latency"] = result["avg_latency"]
 
-        # Construct final benchmark data structure
-        benchmark_data = {
-            "parameter": params,
-            "report": report,
-            "failing_nodes": failing_nodes,
-            "nodes": nodes,
-        }
+        report.append(node_data)
 
-        return benchmark_data
+    # Get the list of all node URLs that were tested
+    nodes = [node["node"] for node in report]
 
-    except sqlite3.Error as e:
-        logging.error(f"Database error retrieving benchmark data: {e}")
-        return None
-    except Exception as e:
-        logging.error(f"Error retrieving benchmark data: {e}")
-        return None
+    # Construct final benchmark data structure
+    benchmark_data = {
+        "parameter": params,
+        "report": report,
+        "failing_nodes": failing_nodes,
+        "nodes": nodes,
+    }
+
+    return benchmark_data
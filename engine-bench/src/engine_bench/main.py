@@ -3,14 +3,75 @@
 
 import json
 import logging
-import os
+import time
 from datetime import datetime, timezone
+from operator import itemgetter
 
 from engine_bench import __version__
 from engine_bench.benchmarks import Benchmarks
-from engine_bench.database import store_benchmark_data_in_db
+from engine_bench.database import get_project_root, store_benchmark_data_in_db
 from engine_bench.utils import INITIAL_NODES
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup, fall back to json
+    orjson = None
+
+# Benchmark tests reported on, in display order
+TEST_TYPES = ("token", "contract", "account_history", "config", "latency")
+
+# Stable sort passes ranking each test, as (metric, higher ranks first), least significant
+# first. Count tests rank by highest count, with ties going to the shortest time.
+RANKING_SORTS = {
+    "token": (("time", False), ("count", True)),
+    "contract": (("time", False), ("count", True)),
+    "account_history": (("time", False), ("count", True)),
+    "config": (("time", False),),
+    "latency": (("avg_latency", False),),
+}
+
+# Report fields filled from a successful result of each test, as (report key, result key)
+_RESULT_FIELDS = {
+    "token": (("count", "count"), ("time", "total_duration")),
+    "contract": (("count", "count"), ("time", "total_duration")),
+    "account_history": (("count", "count"), ("time", "total_duration")),
+    "config": (("time", "total_duration"), ("access_time", "access_time")),
+    "latency": (
+        ("min_latency", "min_latency"),
+        ("max_latency", "max_latency"),
+        ("avg_latency", "avg_latency"),
+        ("time", "total_duration"),
+    ),
+}
+
+
+def _make_default_node(node):
+    """Create the report entry of a node before any test result is applied.
+
+    Args:
+        node (str): URL of the node
+
+    Returns:
+        dict: Node entry with every test marked as not ok and unranked
+    """
+    return {
+        "node": node,
+        "SSCnodeVersion": "unknown",
+        "engine": False,
+        "token": {"ok": False, "count": 0, "time": 0, "rank": -1},
+        "contract": {"ok": False, "count": 0, "time": 0, "rank": -1},
+        "account_history": {"ok": False, "count": 0, "time": 0, "rank": -1},
+        "config": {"ok": False, "time": 0, "access_time": 0, "rank": -1},
+        "latency": {
+            "ok": False,
+            "min_latency": 0.0,
+            "max_latency": 0.0,
+            "avg_latency": 0.0,
+            "time": 0,
+            "rank": -1,
+        },
+    }
+
 
 def run_benchmarks(
     seconds=30,
@@ -48,49 +109,47 @@ def run_benchmarks(
     """
     # Get node list from file or environment variable if available
     nodes = INITIAL_NODES
-    nodes_file = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "h-e-nodes.txt"
-    )
-    if os.path.exists(nodes_file):
+    nodes_file = get_project_root() / "h-e-nodes.txt"
+    if nodes_file.exists():
         with open(nodes_file, "r") as f:
             nodes = [line.strip() for line in f if line.strip() and not line.startswith("#")]
 
-    # Initialize the benchmark class
-    benchmarks = Benchmarks(
-        num_retries=num_retries, num_retries_call=num_retries_call, timeout=timeout
-    )
-
     # Track results and failing nodes
     all_results = {}
     failing_nodes = {}
 
     # Record start time in UTC
-    start_time = datetime.now(timezone.utc)
-    logging.info(f"Starting benchmark run at {start_time.isoformat()}")
+    start_time = datetime.now(timezone.utc).isoformat()
+    # The duration is measured on the monotonic clock, unaffected by wall clock changes
+    start_clock = time.monotonic()
+    logging.info(f"Starting benchmark run at {start_time}")
 
     # Run all benchmark tests
     logging.info("Running all benchmark tests...")
 
-    # Run all benchmarks
-    all_results["config"] = benchmarks.run_config_benchmark(nodes, seconds, threading=threading)
-    all_results["token"] = benchmarks.run_token_benchmark(
-        nodes, seconds, token=token, threading=threading
-    )
-    all_results["contract"] = benchmarks.run_contract_benchmark(
-        nodes, seconds, contract=contract, threading=threading
-    )
-    all_results["account_history"] = benchmarks.run_account_history_benchmark(
-        nodes, seconds, account_name=account_name, threading=threading
-    )
-    all_results["latency"] = benchmarks.run_latency_benchmark(nodes, threading=threading)
+    # Run all benchmarks, with each node running its tests back to back in one worker
+    with Benchmarks(
+        num_retries=num_retries, num_retries_call=num_retries_call, timeout=timeout
+    ) as benchmarks:
+        all_results.update(
+            benchmarks.run_all_benchmarks(
+                nodes,
+                seconds,
+                token=token,
+                contract=contract,
+                account_name=account_name,
+                threading=threading,
+            )
+        )
 
-    # Record end time in UTC
-    end_time = datetime.now(timezone.utc)
-    logging.info(f"Finished benchmark run at {end_time.isoformat()}")
-    logging.info(f"Total duration: {(end_time - start_time).total_seconds()} seconds")
+    # Record end time in UTC, read once and reused for the report timestamp
+    end = datetime.now(timezone.utc)
+    end_time = end.isoformat()
+    duration = time.monotonic() - start_clock
+    logging.info(f"Finished benchmark run at {end_time}")
+    logging.info(f"Total duration: {duration} seconds")
 
-    # Add timestamp and parameters to results
-    all_results["timestamp"] = datetime.now().isoformat()
+    # Add parameters to results
     all_results["parameters"] = {
         "num_retries": num_retries,
         "num_retries_call": num_retries_call,
@@ -105,139 +164,90 @@ def run_benchmarks(
     # Import nectarengine version for report
     from nectarengine import __version__ as nectar_engine_version
 
-    # Process results to create report structure
-    node_data = {}
-    all_nodes = set()
-
-    # Extract node information and identify failing/working nodes
+    # Collect the well-formed results of every test
+    valid_results = []
     for test_name, test_results in all_results.items():
-        if test_name in ["timestamp", "parameters"]:
+        if test_name == "parameters":
             continue
 
         if not isinstance(test_results, list):
             logging.warning(
-                f"Unexpected data format for {test_name}: expected list, got {type(test_results)}"
+                "Unexpected data format for %s: expected list, got %s",
+                test_name,
+                type(test_results),
             )
             continue
 
         for result in test_results:
             if not isinstance(result, dict):
                 logging.warning(
-                    f"Unexpected result format in {test_name}: expected dict, got {type(result)}"
+                    "Unexpected result format in %s: expected dict, got %s",
+                    test_name,
+                    type(result),
                 )
                 continue
 
             if "node" not in result:
-                logging.warning(f"Missing node information in result for {test_name}")
+                logging.warning("Missing node information in result for %s", test_name)
                 continue
 
-            node = result["node"]
-            all_nodes.add(node)
-
-            # Initialize node data structure if needed
-            if node not in node_data:
-                node_data[node] = {
-                    "node": node,
-                    "SSCnodeVersion": "unknown",
-                    "engine": False,
-                    "token": {"ok": False, "count": 0, "time": 0, "rank": -1},
-                    "contract": {"ok": False, "count": 0, "time": 0, "rank": -1},
-                    "account_history": {"ok": False, "count": 0, "time": 0, "rank": -1},
-                    "config": {"ok": False, "time": 0, "access_time": 0, "rank": -1},
-                    "latency": {
-                        "ok": False,
-                        "min_latency": 0.0,
-                        "max_latency": 0.0,
-                        "avg_latency": 0.0,
-                        "time": 0,
-                        "rank": -1,
-                    },
-                }
-
-            # Add version and engine flag if available (from config test)
-            if test_name == "config" and result["successful"]:
-                # Patch: Use sscnodeversion from result, fallback to unknown
-                sscnodeversion = result.get("sscnodeversion", "unknown")
-                node_data[node]["SSCnodeVersion"] = sscnodeversion
-                node_data[node]["engine"] = result.get("is_engine", False)
-
-            # Update test data
-            if result["successful"]:
-                if test_name == "token":
-                    node_data[node]["token"]["ok"] = True
-                    node_data[node]["token"]["count"] = result["count"]
-                    node_data[node]["token"]["time"] = result["total_duration"]
-                elif test_name == "contract":
-                    node_data[node]["contract"]["ok"] = True
-                    node_data[node]["contract"]["count"] = result["count"]
-                    node_data[node]["contract"]["time"] = result["total_duration"]
-                elif test_name == "account_history":
-                    node_data[node]["account_history"]["ok"] = True
-                    node_data[node]["account_history"]["count"] = result["count"]
-                    node_data[node]["account_history"]["time"] = result["total_duration"]
-                elif test_name == "config":
-                    node_data[node]["config"]["ok"] = True
-                    node_data[node]["config"]["time"] = result["total_duration"]
-                    node_data[node]["config"]["access_time"] = result["access_time"]
-                elif test_name == "latency":
-                    node_data[node]["latency"]["ok"] = True
-                    node_data[node]["latency"]["min_latency"] = result.get("min_latency", 0.0)
-                    node_data[node]["latency"]["max_latency"] = result.get("max_latency", 0.0)
-                    node_data[node]["latency"]["avg_latency"] = result.get("avg_latency", 0.0)
-                    node_data[node]["latency"]["time"] = result["total_duration"]
-            else:
-                # Store error information for failing nodes
-                error_msg = result.get("error", "")
-                if error_msg and node not in failing_nodes:
-                    failing_nodes[node] = error_msg
-
-    # Determine working nodes (those not in failing_nodes)
-    working_nodes = [node for node in all_nodes if node not in failing_nodes]
+            valid_results.append((test_name, result))
 
-    # Calculate rankings for each test type
-    for test_type in ["token", "contract", "account_history", "config", "latency"]:
-        # Get the ranking metric for each test type
-        if test_type == "token" or test_type == "contract" or test_type == "account_history":
-            # For count-based tests, higher is better
-            nodes_ranked = sorted(
-                [n for n in node_data.values() if n[test_type]["ok"]],
-                key=lambda x: (-x[test_type]["count"], x[test_type]["time"]),
-            )
-        elif test_type == "config":
-            # For config, faster is better
-            nodes_ranked = sorted(
-                [n for n in node_data.values() if n[test_type]["ok"]],
-                key=lambda x: x[test_type]["time"],
-            )
-        elif test_type == "latency":
-            # For latency, lower is better
-            nodes_ranked = sorted(
-                [n for n in node_data.values() if n[test_type]["ok"]],
-                key=lambda x: x[test_type]["avg_latency"],
-            )
+    # Report entry of every node, created in the order the nodes first appear
+    node_data = {}
+
+    # Fill in the test data and identify failing nodes
+    for test_name, result in valid_results:
+        node = result["node"]
+        entry = node_data.get(node)
+        if entry is None:
+            entry = node_data[node] = _make_default_node(node)
+
+        if not result["successful"]:
+            # Store error information for failing nodes
+            error_msg = result.get("error", "")
+            if error_msg and node not in failing_nodes:
+                failing_nodes[node] = error_msg
+            continue
 
-        # Assign rankings
-        for i, node in enumerate(nodes_ranked):
-            node_data[node["node"]][test_type]["rank"] = i + 1
+        if test_name == "config":
+            # Add version and engine flag from the config test
+            entry["SSCnodeVersion"] = result.get("sscnodeversion", "unknown")
+            entry["engine"] = result.get("is_engine", False)
+
+        fields = _RESULT_FIELDS.get(test_name)
+        if fields is None:
+            continue
+        test_data = entry[test_name]
+        test_data["ok"] = True
+        for key, result_key in fields:
+            test_data[key] = result.get(result_key, test_data[key])
+
+    # Determine working nodes (those not in failing_nodes), as a set for membership checks
+    working_nodes = {node for node in node_data if node not in failing_nodes}
+
+    # Calculate rankings for each test type
+    for test_type, sort_passes in RANKING_SORTS.items():
+        # Only nodes that passed the test are ranked, the others keep rank -1
+        ranked = [data[test_type] for data in node_data.values() if data[test_type]["ok"]]
+        for metric, reverse in sort_passes:
+            ranked.sort(key=itemgetter(metric), reverse=reverse)
+        for rank, test_data in enumerate(ranked, start=1):
+            test_data["rank"] = rank
 
     # Calculate weighted scores for nodes based on real-world performance metrics
     # Higher score is better with this new weighted system
-    from engine_bench.utils import calculate_weighted_node_score
+    from engine_bench.utils import calculate_weighted_scores
 
     # Collect all node data for normalization
     all_node_data = list(node_data.values())
 
     # Calculate weighted scores and add to node data
-    for data in all_node_data:
-        weighted_score = calculate_weighted_node_score(data, all_node_data)
+    for data, weighted_score in zip(all_node_data, calculate_weighted_scores(all_node_data)):
         # Add weighted score to node data for future reference
         data["weighted_score"] = round(weighted_score, 2)
         # Keep track of how many tests were completed
-        data["tests_completed"] = sum(
-            1
-            for test_type in ["token", "contract", "account_history", "config", "latency"]
-            if data[test_type]["ok"]
-        )
+        data["tests_completed"] = sum(1 for test_type in TEST_TYPES if data[test_type]["ok"])
 
     # Create a sorted list of nodes by weighted score (higher is better)
     sorted_node_data = sorted(
@@ -258,10 +268,11 @@ def run_benchmarks(
         "failing_nodes": failing_nodes,
         "report": report,
         "parameter": {
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
-            "duration": (end_time - start_time).total_seconds(),
-            "timestamp": datetime.now().isoformat(),
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration": duration,
+            # Stored runs use naive local time, keep that format for the database
+            "timestamp": end.astimezone().replace(tzinfo=None).isoformat(),
             "nectar_engine_version": nectar_engine_version,
             "script_version": __version__,
             **all_results["parameters"],
@@ -286,14 +297,12 @@ def run_benchmarks(
     }
 
     # Save report data to engine_benchmark_results.json
-    with open(
-        os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "engine_benchmark_results.json",
-        ),
-        "w",
-    ) as f:
-        json.dump(report_data, f, indent=2)
+    if orjson is not None:
+        data = orjson.dumps(report_data, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(report_data, indent=2).encode()
+    with open(get_project_root() / "engine_benchmark_results.json", "wb") as f:
+        f.write(data)
 
     return report_data
 
@@ -330,20 +339,19 @@ def main():
     # Display top 5 nodes by weighted score (real-world performance importance)
     print("\nTop 5 nodes by weighted score (higher is better):")
     # Sort nodes by weighted score (higher is better)
+    by_node = {node_data["node"]: node_data for node_data in report_data["report"]}
     for i, node in enumerate(report_data["nodes"][:5]):
-        # Find the node data
-        for node_data in report_data["report"]:
-            if node_data["node"] == node:
-                weighted_score = node_data.get("weighted_score", 0)
-                tests_completed = node_data.get("tests_completed", 0)
-                print(
-                    f"  {i + 1}. {node} (weighted score: {weighted_score:.2f}, tests completed: {tests_completed}/5)"
-                )
-                break
+        node_data = by_node.get(node)
+        if node_data is None:
+            continue
+        weighted_score = node_data.get("weighted_score", 0)
+        tests_completed = node_data.get("tests_completed", 0)
+        print(
+            f"  {i + 1}. {node} (weighted score: {weighted_score:.2f}, tests completed: {tests_completed}/5)"
+        )
 
     # Display top 5 nodes for each test type
-    test_types = ["token", "contract", "account_history", "config", "latency"]
-    for test_type in test_types:
+    for test_type in TEST_TYPES:
         print(f"\nTop 5 nodes for {test_type} benchmark:")
         # Sort nodes by rank for this test type
         sorted_nodes = sorted(
@@ -2,14 +2,106 @@
 
 import json
 import logging
+import math
 import os
-import sqlite3
-import statistics
 from datetime import datetime, timedelta
 
+from engine_bench.database import connect_readonly, get_db_path, read_latest_benchmark_data
+
 # Reuse the format_float from utils
 from engine_bench.utils import format_float
 
+# Test types reported on, in the order their sections appear
+TEST_TYPES = ("token", "contract", "account_history", "config", "latency")
+
+# Shared read-only stand-in for a missing test result
+_EMPTY = {}
+
+# Operation count test sections of the report, as (test type, title, what was processed)
+_COUNT_SECTIONS = (
+    ("token", "Token retrieval", "token operations"),
+    ("contract", "Contract operations", "contract operations"),
+    ("account_history", "Account history operations", "account history operations"),
+)
+
+# Uptime of every node within the report window. The LEFT JOIN keeps nodes without any run
+# in the window (likely consistently failing nodes) with zero runs.
+_UPTIME_SQL = """
+SELECT n.url as url,
+    SUM(ws.is_working) as up_count,
+    COUNT(ws.node_id) as total_count
+FROM nodes n
+LEFT JOIN (
+    SELECT ns.node_id, ns.is_working
+    FROM node_status ns
+    JOIN benchmark_runs br ON ns.run_id = br.run_id
+    WHERE br.timestamp > ?
+) ws ON ws.node_id = n.node_id
+GROUP BY n.url
+"""
+
+# Rank history of every node and test within the report window, aggregated in SQL. The
+# window picks each series' first and last rank by timestamp, the sums give the average
+# rank and the spread. Nodes that failed at least once within the window get a row with
+# zero runs for each test they have no ranks for. Bound to TEST_TYPES followed by the
+# window threshold twice. Nodes come in the order they first appear when walking the
+# tests in TEST_TYPES order and each test's results by timestamp, then nodes with only
+# failures by URL. Each node's rows come in TEST_TYPES order.
+# The trend and consistency tables keep this order for ties, so it decides which of
+# several equal trends get published.
+_RANK_HISTORY_SQL = f"""
+WITH test_types (test_type, ordinal) AS (
+    VALUES {", ".join(f"(?, {ordinal})" for ordinal in range(len(TEST_TYPES)))}
+),
+history AS (
+    SELECT n.url as url, tr.test_type as test_type, tt.ordinal as ordinal,
+        tr.rank as rank, br.timestamp as timestamp,
+        FIRST_VALUE(tr.rank) OVER series as first_rank,
+        LAST_VALUE(tr.rank) OVER series as last_rank,
+        ROW_NUMBER() OVER (ORDER BY tt.ordinal, br.timestamp, tr.node_id) as seq
+    FROM test_results tr
+    JOIN test_types tt ON tr.test_type = tt.test_type
+    JOIN nodes n ON tr.node_id = n.node_id
+    JOIN benchmark_runs br ON tr.run_id = br.run_id
+    WHERE br.timestamp > ?
+    WINDOW series AS (
+        PARTITION BY tr.node_id, tr.test_type
+        ORDER BY br.timestamp, tr.result_id
+        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+    )
+),
+ranked AS (
+    SELECT url, test_type, COUNT(*) as runs, SUM(rank) as rank_sum,
+        SUM(rank * rank) as rank_sq_sum, MIN(first_rank) as first_rank,
+        MIN(last_rank) as last_rank, MIN(timestamp) as timestamp,
+        MIN(ordinal) as ordinal, MIN(seq) as seq,
+        MIN(MIN(seq)) OVER (PARTITION BY url) as node_seq
+    FROM history
+    GROUP BY url, test_type
+),
+failing AS (
+    SELECT DISTINCT n.url as url
+    FROM nodes n
+    JOIN node_status ns ON n.node_id = ns.node_id
+    JOIN benchmark_runs br ON ns.run_id = br.run_id
+    WHERE br.timestamp > ? AND ns.is_working = 0
+),
+combined AS (
+    SELECT r.*
+    FROM ranked r
+    UNION ALL
+    SELECT f.url, tt.test_type, 0, NULL, NULL, NULL, NULL, NULL, tt.ordinal, NULL,
+        (SELECT MIN(r.node_seq) FROM ranked r WHERE r.url = f.url)
+    FROM failing f
+    CROSS JOIN test_types tt
+    WHERE NOT EXISTS (
+        SELECT 1 FROM ranked r WHERE r.url = f.url AND r.test_type = tt.test_type
+    )
+)
+SELECT * FROM combined
+ORDER BY node_seq IS NULL, node_seq, url, ordinal
+"""
+
 
 def get_historical_data(db_path, days=7):
     """Get historical data from SQLite database for report generation.
@@ -27,203 +119,112 @@ def get_historical_data(db_path, days=7):
              "consistency": {node_url: {test_type: value}},
              "uptime": {node_url: {"success": count, "total": count}}}
     """
+    conn = connect_readonly(db_path)
+    try:
+        return _read_historical_data(conn, days)
+    finally:
+        conn.close()
+
+
+def _read_historical_data(conn, days):
+    """Read the historical data of the report window over an open connection.
+
+    Args:
+        conn (sqlite3.Connection): Read-only connection to the benchmark database.
+        days (int): Number of days of history to retrieve.
+
+    Returns:
+        dict: Historical data as returned by get_historical_data.
+    """
     # Initialize return dict
     historical_data = {"trends": {}, "consistency": {}, "uptime": {}}
 
-    # Connect to database
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
     # Calculate timestamp threshold (days ago from now)
-    threshold = (
-        datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-        if days <= 0
-        else (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
-    )
+    now = datetime.now()
+    threshold = (now if days <= 0 else now - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
 
     # For a single day of data, include all data in the database to have more data points
     if days <= 1:
         # Count how many benchmark runs we have
-        cursor.execute("SELECT COUNT(*) FROM benchmark_runs")
-        count = cursor.fetchone()[0]
+        count = conn.execute("SELECT COUNT(*) FROM benchmark_runs").fetchone()[0]
 
         if count <= 3:  # If we have very limited data, use all of it
             threshold = "0000-01-01T00:00:00"  # A date far in the past
 
     # Collect node uptime statistics
     node_uptime = {}
-    cursor.execute(
-        """
-        SELECT n.url as url,
-            COUNT(CASE WHEN ns.is_working = 1 THEN 1 END) as up_count,
-            COUNT(*) as total_count
-        FROM nodes n
-        JOIN node_status ns ON n.node_id = ns.node_id
-        JOIN benchmark_runs br ON ns.run_id = br.run_id
-        WHERE br.timestamp > ?
-        GROUP BY n.url
-        """,
-        (threshold,),
-    )
-
-    for row in cursor.fetchall():
+    for row in conn.execute(_UPTIME_SQL, (threshold,)):
+        total_count = row["total_count"]
         node_uptime[row["url"]] = {
-            "uptime_percent": format_float((row["up_count"] / row["total_count"]) * 100)
-            if row["total_count"] > 0
+            "uptime_percent": format_float((row["up_count"] / total_count) * 100)
+            if total_count > 0
             else 0,
-            "total_runs": row["total_count"],
+            "total_runs": total_count,  # Zero runs means it was never tested successfully
         }
 
-    # Get a list of all nodes (including those that never worked)
-    cursor.execute("""SELECT url as url FROM nodes""")
-    all_nodes = [row["url"] for row in cursor.fetchall()]
-
-    # Add nodes that don't have any records in the uptime data
-    # These are likely consistently failing nodes
-    for node_url in all_nodes:
-        if node_url not in node_uptime:
-            node_uptime[node_url] = {
-                "uptime_percent": 0,
-                "total_runs": 0,  # Zero runs means it was never tested successfully
-            }
-
-    # Collect node performance trends
+    # Collect the aggregated rank history of every node and test, failing nodes included
     node_trends = {}
-    for test_type in ["token", "contract", "account_history", "config", "latency"]:
-        cursor.execute(
-            """
-            SELECT n.url as url, tr.test_type as test_type, tr.rank,
-                br.timestamp
-            FROM test_results tr
-            JOIN nodes n ON tr.node_id = n.node_id
-            JOIN benchmark_runs br ON tr.run_id = br.run_id
-            WHERE tr.test_type = ? AND br.timestamp > ?
-            ORDER BY br.timestamp
-            """,
-            (test_type, threshold),
-        )
-
-        results = cursor.fetchall()
-
-        for row in results:
-            if row["url"] not in node_trends:
-                node_trends[row["url"]] = {}
-
-            if test_type not in node_trends[row["url"]]:
-                node_trends[row["url"]][test_type] = []
-
-            node_trends[row["url"]][test_type].append(
-                {"rank": row["rank"], "timestamp": row["timestamp"]}
-            )
-
-    # Add failing nodes to the trends data
-    cursor.execute(
-        """
-        SELECT DISTINCT n.url as url
-        FROM nodes n
-        JOIN node_status ns ON n.node_id = ns.node_id
-        JOIN benchmark_runs br ON ns.run_id = br.run_id
-        WHERE br.timestamp > ? AND ns.is_working = 0
-        """,
-        (threshold,),
-    )
-
-    failing_nodes = [row["url"] for row in cursor.fetchall()]
-
-    # Calculate trend indicators
-    for node, tests in node_trends.items():
-        for test_type, results in tests.items():
-            if len(results) < 2:
-                continue
-
-            # Skip if already processed
-            if not isinstance(results, list):
-                continue
-
-            # Sort by timestamp
-            sorted_results = sorted(results, key=lambda x: x["timestamp"])
-
-            # Get first and last rank
-            first_rank = sorted_results[0]["rank"]
-            last_rank = sorted_results[-1]["rank"]
-
-            # Calculate average rank
-            ranks = [r["rank"] for r in sorted_results]
-            avg_rank = format_float(sum(ranks) / len(ranks))
-
-            # Determine trend direction
-            if last_rank < first_rank:
-                trend = "improving"  # Lower rank is better
-            elif last_rank > first_rank:
-                trend = "degrading"
-            else:
-                trend = "stable"
-
-            # Add trend data
-            node_trends[node][test_type] = {
-                "first_rank": first_rank,
-                "last_rank": last_rank,
-                "avg_rank": avg_rank,
-                "trend": trend,
-                "change": first_rank - last_rank,  # Positive means improvement
+    node_consistency = {}
+    # Position of each node's first series with a rank spread
+    spread_order = {}
+    params = (*TEST_TYPES, threshold, threshold)
+    for row in conn.execute(_RANK_HISTORY_SQL, params):
+        tests = node_trends.setdefault(row["url"], {})
+        runs = row["runs"]
+        if not runs:
+            # Mark failing nodes as 'failing' instead of 'stable'
+            tests[row["test_type"]] = {
+                "first_rank": 0,
+                "last_rank": 0,
+                "avg_rank": 0,
+                "trend": "failing",
+                "change": 0,
             }
+            continue
+
+        first_rank = row["first_rank"]
+        if runs < 2:
+            # A single run has no trend, keep its lone data point
+            tests[row["test_type"]] = [{"rank": first_rank, "timestamp": row["timestamp"]}]
+            continue
+
+        last_rank = row["last_rank"]
+        rank_sum = row["rank_sum"]
+
+        # Determine trend direction
+        if last_rank < first_rank:
+            trend = "improving"  # Lower rank is better
+        elif last_rank > first_rank:
+            trend = "degrading"
+        else:
+            trend = "stable"
+
+        # Add trend data
+        tests[row["test_type"]] = {
+            "first_rank": first_rank,
+            "last_rank": last_rank,
+            "avg_rank": format_float(rank_sum / runs),
+            "trend": trend,
+            "change": first_rank - last_rank,  # Positive means improvement
+        }
 
-    # Handle failing nodes separately
-    for node_url in failing_nodes:
-        if node_url not in node_trends:
-            node_trends[node_url] = {}
-
-        # Mark failing nodes as 'failing' instead of 'stable'
-        for test_type in ["token", "contract", "account_history", "config", "latency"]:
-            if test_type not in node_trends[node_url]:
-                node_trends[node_url][test_type] = {
-                    "first_rank": 0,
-                    "last_rank": 0,
-                    "avg_rank": 0,
-                    "trend": "failing",  # Changed from 'stable' to 'failing'
-                    "change": 0,
-                }
-
-    # Get consistency metrics (standard deviation of ranks)
-    node_consistency = {}
-    for test_type in ["token", "contract", "account_history", "config", "latency"]:
-        cursor.execute(
-            """
-            SELECT n.url as url, tr.test_type as test_type, tr.rank
-            FROM test_results tr
-            JOIN nodes n ON tr.node_id = n.node_id
-            JOIN benchmark_runs br ON tr.run_id = br.run_id
-            WHERE tr.test_type = ? AND br.timestamp > ?
-            ORDER BY br.timestamp
-            """,
-            (test_type, threshold),
+        # Consistency is the sample standard deviation of the ranks (lower is steadier)
+        variance = (runs * row["rank_sq_sum"] - rank_sum * rank_sum) / (runs * (runs - 1))
+        node_consistency.setdefault(row["url"], {})[row["test_type"]] = format_float(
+            math.sqrt(variance)
         )
+        spread_order.setdefault(row["url"], row["seq"])
 
-        results = cursor.fetchall()
-
-        # Group by node
-        node_ranks = {}
-        for row in results:
-            if row["url"] not in node_ranks:
-                node_ranks[row["url"]] = []
-            node_ranks[row["url"]].append(row["rank"])
-
-        # Calculate consistency (standard deviation) for each node
-        for node, ranks in node_ranks.items():
-            if len(ranks) >= 2:  # Need at least 2 values for stdev
-                if node not in node_consistency:
-                    node_consistency[node] = {}
-                node_consistency[node][test_type] = format_float(
-                    statistics.stdev(ranks) if len(ranks) > 1 else 0
-                )
+    # The consistency table keeps this order for ties: nodes by their first series with a
+    # rank spread
+    node_consistency = {
+        url: node_consistency[url] for url in sorted(spread_order, key=spread_order.get)
+    }
 
     # Combine all historical data
     historical_data["trends"] = node_trends
     historical_data["consistency"] = node_consistency
     historical_data["uptime"] = node_uptime
-
-    conn.close()
     return historical_data
 
 
@@ -245,6 +246,65 @@ def get_latest_benchmark_data(db_path="engine_benchmark_history.db"):
     return get_data(db_path)
 
 
+def get_report_data(db_path="engine_benchmark_history.db", days=7):
+    """Get the latest benchmark data and the historical data over one connection.
+
+    Both reads run in a single read transaction, so they see the same state of the
+    database even while a new run is being stored.
+
+    Args:
+        db_path (str): Path to the SQLite database file. If not absolute, it is relative
+            to the project root.
+        days (int, optional): Number of days of history to retrieve. Defaults to 7.
+
+    Returns:
+        tuple: A tuple containing (benchmark_data, historical_data). Either one is None
+            when it could not be read.
+    """
+    db_path = get_db_path(db_path)
+    if not os.path.exists(db_path):
+        logging.error(f"Database file not found at {db_path}")
+        return None, None
+
+    conn = connect_readonly(db_path)
+    try:
+        conn.execute("BEGIN")
+        try:
+            benchmark_data = read_latest_benchmark_data(conn)
+        except Exception as e:
+            logging.error(f"Error retrieving benchmark data: {e}")
+            benchmark_data = None
+
+        try:
+            historical_data = _read_historical_data(conn, days)
+        except Exception as e:
+            logging.error(f"Database error while retrieving historical data: {e}")
+            historical_data = None
+    finally:
+        conn.close()
+
+    return benchmark_data, historical_data
+
+
+def _emit_table(markdown, title, intro, columns, rows):
+    """Append a titled markdown table section to the report lines.
+
+    Args:
+        markdown (list): Report lines to append to
+        title (str): Section heading
+        intro (str): Paragraph shown above the table
+        columns (tuple): Column headers
+        rows (iterable): Table rows, each a sequence of cell values
+    """
+    markdown.append(f"## {title}\n")
+    markdown.append(f"{intro}\n")
+    # The table goes in as one joined block rather than one list entry per row
+    table = [f"| {' | '.join(columns)} |", f"| {' | '.join(['---'] * len(columns))} |"]
+    table.extend(f"| {' | '.join(map(str, row))} |" for row in rows)
+    markdown.append("\n".join(table))
+    markdown.append("\n")
+
+
 def generate_markdown(benchmark_data, output_file=None, historical_data=None, days=7):
     """Generate a markdown post from benchmark data.
 
@@ -270,8 +330,9 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
         return "No benchmark data available.", {}
 
     # Extract timestamp from data or use current time
-    timestamp = benchmark_data.get("timestamp", datetime.now().isoformat())
-    formatted_date = datetime.fromisoformat(timestamp).strftime("%d/%m/%Y")
+    now = datetime.now()
+    timestamp = benchmark_data.get("timestamp")
+    formatted_date = (datetime.fromisoformat(timestamp) if timestamp else now).strftime("%d/%m/%Y")
 
     # Extract data from the benchmark_data dictionary
     params = benchmark_data.get("parameter", {})
@@ -279,12 +340,19 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
     failing_nodes = benchmark_data.get("failing_nodes", {})
     nodes = benchmark_data.get("nodes", [])
 
+    # Split out the nodes that passed each test in one pass over the report
+    passed = {test_type: [] for test_type in TEST_TYPES}
+    for node_data in report:
+        for test_type in TEST_TYPES:
+            if node_data.get(test_type, _EMPTY).get("ok", False):
+                passed[test_type].append(node_data)
+
     # Create markdown content list
     markdown = []
 
     # Header (standardized)
     markdown.append(f"# Full Hive-Engine API Node Update - ({formatted_date})\n")
-    current_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    current_time = now.strftime("%Y-%m-%dT%H:%M:%S")
     markdown.append(f"{current_time} (UTC)")
     markdown.append(
         "**Benchmarks are performed from a Digital Ocean Droplet in Frankfurt, Germany. Results may vary based on geographic location.**\n"
@@ -297,41 +365,39 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
     )
 
     # Failing nodes section (standardized)
-    markdown.append("## List of failing nodes\n")
-    markdown.append(
-        "This table includes a list of all nodes which were not able to answer to a `getStatus` API call within the specified timeout (default: 30 seconds).\n"
-    )
-    markdown.append("|node | error |")
-    markdown.append("| --- | --- |")
-
-    for node, error in failing_nodes.items():
+    _emit_table(
+        markdown,
+        "List of failing nodes",
+        "This table includes a list of all nodes which were not able to answer to a `getStatus` API call within the specified timeout (default: 30 seconds).",
+        ("node", "error"),
         # Truncate error message if too long
-        error_msg = error if len(error) < 100 else error[:97] + "..."
-        markdown.append(f"| <{node}> | {error_msg} |")
-
-    markdown.append("\n")
-
-    # Working nodes section (standardized)
-    markdown.append("## List of working nodes (At least once)\n")
-    markdown.append(
-        "This table includes all nodes which were able to answer a `getStatus` call within the timeout. The achieved mean duration values are shown. The returned SSCnodeVersion is also shown.\n"
+        (
+            (f"<{node}>", error if len(error) < 100 else error[:97] + "...")
+            for node, error in failing_nodes.items()
+        ),
     )
-    markdown.append("|node |  mean time [s] | SSCnodeVersion  |")
-    markdown.append("| --- | --- | ---  |")
 
     # Sort nodes by config time (ascending)
     config_sorted_nodes = sorted(
-        [node for node in report if node.get("config", {}).get("ok", False)],
+        passed["config"],
         key=lambda x: x["config"]["access_time"],
     )
 
-    for node_data in config_sorted_nodes:
-        node = node_data["node"]
-        SSCnodeVersion = node_data.get("SSCnodeVersion", "unknown")
-        config_time = format_float(node_data["config"]["access_time"])
-        markdown.append(f"| <{node}> | {config_time} | {SSCnodeVersion} |")
-
-    markdown.append("\n")
+    # Working nodes section (standardized)
+    _emit_table(
+        markdown,
+        "List of working nodes (At least once)",
+        "This table includes all nodes which were able to answer a `getStatus` call within the timeout. The achieved mean duration values are shown. The returned SSCnodeVersion is also shown.",
+        ("node", "mean time [s]", "SSCnodeVersion"),
+        (
+            (
+                f"<{node_data['node']}>",
+                format_float(node_data["config"]["access_time"]),
+                node_data.get("SSCnodeVersion", "unknown"),
+            )
+            for node_data in config_sorted_nodes
+        ),
+    )
 
     # Prepare concise metadata for json_metadata (after config_sorted_nodes is defined)
     from engine_bench import __version__
@@ -350,12 +416,6 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
 
     # Node Uptime Statistics (if historical data available)
     if historical_data and historical_data.get("uptime"):
-        markdown.append("## Node Uptime Statistics (7-day period)\n")
-        markdown.append("This table shows how reliable nodes have been over the past week.\n")
-
-        markdown.append("| node | uptime % | total checks |")
-        markdown.append("| --- | --- | --- |")
-
         # Sort by uptime percentage (descending)
         sorted_uptime = sorted(
             historical_data["uptime"].items(),
@@ -363,112 +423,52 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
             reverse=True,
         )
 
-        for node_url, uptime_data in sorted_uptime:
-            markdown.append(
-                f"| <{node_url}> | {uptime_data['uptime_percent']}% | {uptime_data['total_runs']} |"
-            )
-
-        markdown.append("\n")
-
-    # Token retrieval section
-    markdown.append("## Token retrieval\n")
-    markdown.append(
-        "This table shows how many token operations were processed by the node within the default benchmark duration (30 seconds). The nodes are ordered according to the number of operations processed.\n"
-    )
-
-    markdown.append("| node | operations processed | operations per second  |")
-    markdown.append("| --- | --- | --- |")
-
-    # Sort nodes by number of token operations (descending)
-    token_sorted_nodes = sorted(
-        [node for node in report if node.get("token", {}).get("ok", False)],
-        key=lambda x: x["token"]["count"],
-        reverse=True,
-    )
-
-    for node_data in token_sorted_nodes:
-        node = node_data["node"]
-        operations = node_data["token"]["count"]
-        time = node_data["token"]["time"]
-        ops_per_second = format_float(operations / time) if time > 0 else 0
-        markdown.append(f"| <{node}> | {operations} | {ops_per_second} |")
-
-    markdown.append("\n")
-
-    # Contract operations section
-    markdown.append("## Contract operations\n")
-    markdown.append(
-        "This table shows how many contract operations were processed by the node within the default benchmark duration (30 seconds). The nodes are ordered according to the number of operations processed.\n"
-    )
-
-    markdown.append("| node | operations processed | operations per second |")
-    markdown.append("| --- | --- | --- |")
-
-    # Sort nodes by number of contract operations (descending)
-    contract_sorted_nodes = sorted(
-        [node for node in report if node.get("contract", {}).get("ok", False)],
-        key=lambda x: x["contract"]["count"],
-        reverse=True,
-    )
-
-    for node_data in contract_sorted_nodes:
-        node = node_data["node"]
-        operations = node_data["contract"]["count"]
-        time = node_data["contract"]["time"]
-        ops_per_second = format_float(operations / time) if time > 0 else 0
-        markdown.append(f"| <{node}> | {operations} | {ops_per_second} |")
-
-    markdown.append("\n")
-
-    # Account history section
-    markdown.append("## Account history operations\n")
-    markdown.append(
-        "This table shows how many account history operations were processed by the node within the default benchmark duration (30 seconds). The nodes are ordered according to the number of operations processed.\n"
-    )
-
-    markdown.append("| node | operations processed | operations per second |")
-    markdown.append("| --- | --- | --- |")
-
-    # Sort nodes by number of account history operations (descending)
-    history_sorted_nodes = sorted(
-        [node for node in report if node.get("account_history", {}).get("ok", False)],
-        key=lambda x: x["account_history"]["count"],
-        reverse=True,
-    )
-
-    for node_data in history_sorted_nodes:
-        node = node_data["node"]
-        operations = node_data["account_history"]["count"]
-        time = node_data["account_history"]["time"]
-        ops_per_second = format_float(operations / time) if time > 0 else 0
-        markdown.append(f"| <{node}> | {operations} | {ops_per_second} |")
-
-    markdown.append("\n")
-
-    # Latency section
-    markdown.append("## Latency\n")
-    markdown.append(
-        "This table shows the latency measurements for each node. Latency is measured over 5 API calls to `api.find` (default). The nodes are ordered according to average latency (lowest first).\n"
-    )
+        _emit_table(
+            markdown,
+            "Node Uptime Statistics (7-day period)",
+            "This table shows how reliable nodes have been over the past week.",
+            ("node", "uptime %", "total checks"),
+            (
+                (f"<{node_url}>", f"{uptime_data['uptime_percent']}%", uptime_data["total_runs"])
+                for node_url, uptime_data in sorted_uptime
+            ),
+        )
 
-    markdown.append("| node | avg latency [s] | min latency [s] | max latency [s] |")
-    markdown.append("| --- | --- | --- | --- |")
+    # Count test sections, each sorted by number of operations processed (descending)
+    for test_type, title, description in _COUNT_SECTIONS:
+        rows = []
+        for node_data in sorted(
+            passed[test_type], key=lambda x: x[test_type]["count"], reverse=True
+        ):
+            operations = node_data[test_type]["count"]
+            time = node_data[test_type]["time"]
+            ops_per_second = format_float(operations / time) if time > 0 else 0
+            rows.append((f"<{node_data['node']}>", operations, ops_per_second))
+        _emit_table(
+            markdown,
+            title,
+            f"This table shows how many {description} were processed by the node within the default benchmark duration (30 seconds). The nodes are ordered according to the number of operations processed.",
+            ("node", "operations processed", "operations per second"),
+            rows,
+        )
 
-    # Sort nodes by average latency (ascending)
-    latency_sorted_nodes = sorted(
-        [node for node in report if node.get("latency", {}).get("ok", False)],
-        key=lambda x: x["latency"]["avg_latency"],
+    # Latency section, sorted by average latency (ascending)
+    _emit_table(
+        markdown,
+        "Latency",
+        "This table shows the latency measurements for each node. Latency is measured over 5 API calls to `api.find` (default). The nodes are ordered according to average latency (lowest first).",
+        ("node", "avg latency [s]", "min latency [s]", "max latency [s]"),
+        (
+            (
+                f"<{node_data['node']}>",
+                format_float(node_data["latency"]["avg_latency"]),
+                format_float(node_data["latency"]["min_latency"]),
+                format_float(node_data["latency"]["max_latency"]),
+            )
+            for node_data in sorted(passed["latency"], key=lambda x: x["latency"]["avg_latency"])
+        ),
     )
 
-    for node_data in latency_sorted_nodes:
-        node = node_data["node"]
-        avg_latency = format_float(node_data["latency"]["avg_latency"])
-        min_latency = format_float(node_data["latency"]["min_latency"])
-        max_latency = format_float(node_data["latency"]["max_latency"])
-        markdown.append(f"| <{node}> | {avg_latency} | {min_latency} | {max_latency} |")
-
-    markdown.append("\n")
-
     # Add historical trends if available
     if historical_data and "trends" in historical_data and "uptime" in historical_data:
         markdown.append("## Node Trends and Reliability")
@@ -641,8 +641,8 @@ def generate_post(output_file, db_path="engine_benchmark_history.db", days=7):
             os.path.dirname(os.path.dirname(os.path.dirname(__file__))), output_file
         )
 
-    # Get latest benchmark data from database
-    benchmark_data = get_latest_benchmark_data(db_path)
+    # Get the latest benchmark data and the historical data for trends from the database
+    benchmark_data, historical_data = get_report_data(db_path, days)
 
     if not benchmark_data:
         # Try to read from JSON file as fallback
@@ -662,9 +662,6 @@ def generate_post(output_file, db_path="engine_benchmark_history.db", days=7):
             logging.error("No benchmark data available in database or JSON file")
             return "No benchmark data available.", {}
 
-    # Get historical data for trends
-    historical_data = get_historical_data(db_path, days)
-
     # Generate markdown content and metadata
     content, metadata = generate_markdown(benchmark_data, output_file, historical_data, days)
 
@@ -1,6 +1,8 @@
 """Utility functions for engine-bench project."""
 
 import logging
+import re
+import threading
 import time
 from pathlib import Path
 
@@ -13,8 +15,48 @@ INITIAL_NODES = [
     "https://herpc.dtools.dev",
 ]
 
-# Global flag for thread interruption
-quit_thread = False
+# Default maximum number of nodes benchmarked at once. Worker threads are only started
+# as nodes are submitted, so a high limit costs nothing for short node lists.
+MAX_CONCURRENCY = 128
+
+# Event set to signal thread interruption. Workers poll QUIT.is_set() or block on
+# QUIT.wait(timeout) so they stop as soon as it is set.
+QUIT = threading.Event()
+
+# Weights for each test in the weighted node score (should sum to 1.0)
+_WEIGHTS = {
+    "token": 0.25,  # Token retrieval is critical for most operations
+    "contract": 0.20,  # Contract info is important for smart contract operations
+    "account_history": 0.20,  # Account history important for wallets and apps
+    "latency": 0.25,  # Latency is crucial for real-time applications
+    "config": 0.10,  # Config is less critical for everyday usage
+}
+
+# Tests whose failure marks a node as missing a critical service
+_CRITICAL_TESTS = frozenset(("token", "contract", "latency"))
+
+# Shared read-only stand-in for a missing test result
+_EMPTY = {}
+
+# Matches the numeric components of a node version string
+_VERSION_RE = re.compile(r"\d+")
+
+
+def __getattr__(name):
+    """Keep the old ``quit_thread`` flag readable as a module attribute.
+
+    Args:
+        name (str): Name of the attribute being looked up
+
+    Returns:
+        bool: Whether QUIT is set, when ``name`` is ``quit_thread``
+
+    Raises:
+        AttributeError: For any other unknown attribute
+    """
+    if name == "quit_thread":
+        return QUIT.is_set()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def format_float(value, precision=2):
@@ -27,12 +69,19 @@ def format_float(value, precision=2):
     Returns:
         float: Formatted float value rounded to specified precision
     """
-    try:
-        if isinstance(value, (int, float)):
+    # Fast path for the common case of plain floats and ints
+    value_type = type(value)
+    if value_type is float:
+        return round(value, precision)
+    if value_type is int:
+        return round(float(value), precision)
+    if isinstance(value, (int, float)):
+        # Subclasses such as bool or numpy scalars
+        try:
             return round(float(value), precision)
-        return 0.0
-    except (ValueError, TypeError):
-        return 0.0
+        except (ValueError, TypeError):
+            return 0.0
+    return 0.0
 
 
 def get_project_root() -> Path:
@@ -58,9 +107,7 @@ def benchmark_executor(benchmark_func, node, *args, **kwargs):
     Returns:
         dict: The benchmark result with node URL added
     """
-    global quit_thread
-
-    if quit_thread:
+    if QUIT.is_set():
         return {
             "successful": False,
             "node": node,
@@ -68,22 +115,22 @@ def benchmark_executor(benchmark_func, node, *args, **kwargs):
             "total_duration": 0.0,
         }
 
+    start_time = time.perf_counter()
     try:
-        start_time = time.time()
         result = benchmark_func(node, *args, **kwargs)
+        duration = time.perf_counter() - start_time
         # Add node URL to result for easy identification
         if isinstance(result, dict):
             result["node"] = node
             # If total_duration wasn't set by the benchmark function, set it now
-            if "total_duration" not in result:
-                result["total_duration"] = time.time() - start_time
+            result.setdefault("total_duration", duration)
         else:
             # If result isn't a dict, create a new dict with the result
             result = {
                 "successful": True,
                 "node": node,
                 "result": result,
-                "total_duration": time.time() - start_time,
+                "total_duration": duration,
             }
         return result
     except Exception as e:
@@ -92,93 +139,123 @@ def benchmark_executor(benchmark_func, node, *args, **kwargs):
             "successful": False,
             "node": node,
             "error": str(e),
-            "total_duration": time.time() - start_time if "start_time" in locals() else 0.0,
+            "total_duration": time.perf_counter() - start_time,
         }
 
 
-def calculate_weighted_node_score(node_data, all_nodes_data=None):
-    """Calculate a weighted score for a node based on real-world performance importance.
+def compute_max_values(all_nodes_data):
+    """Find the highest successful count for each count-based test.
+
+    Args:
+        all_nodes_data (list): List of all node data dictionaries
+
+    Returns:
+        dict: Maximum count per test, used to normalize node scores
+    """
+    # Keep the running maximums in locals so the loop does one pass over the nodes
+    token_max = contract_max = history_max = 0
+
+    for node in all_nodes_data:
+        token = node["token"]
+        contract = node["contract"]
+        history = node["account_history"]
+        if token.get("ok", False):
+            count = token.get("count", 0)
+            token_max = count if count > token_max else token_max
+        if contract.get("ok", False):
+            count = contract.get("count", 0)
+            contract_max = count if count > contract_max else contract_max
+        if history.get("ok", False):
+            count = history.get("count", 0)
+            history_max = count if count > history_max else history_max
+
+    return {
+        "token": {"count": token_max},
+        "contract": {"count": contract_max},
+        "account_history": {"count": history_max},
+    }
+
+
+def _count_score(test_data, max_count):
+    """Score a count test, where a higher count is better.
+
+    Args:
+        test_data (dict): Result of the test
+        max_count (int): Highest count reached by any node, 0 or less counts as 1
+
+    Returns:
+        float: Count relative to the best node, scaled to 0-100
+    """
+    return test_data.get("count", 0) / (max_count if max_count > 0 else 1) * 100
+
+
+def _access_time_score(test_data, max_count):
+    """Score the config test, where a lower access time is better.
+
+    Args:
+        test_data (dict): Result of the test
+        max_count (int): Unused, accepted for a uniform scorer signature
+
+    Returns:
+        float: Access time inverted and scaled from 0-2s to 100-0
+    """
+    return 100 * (1 - min(test_data.get("access_time", 30) / 2, 1))
 
-    This function applies weights to different benchmark results to provide a more
-    realistic assessment of node performance for actual usage scenarios.
+
+def _latency_score(test_data, max_count):
+    """Score the latency test, where a lower average latency is better.
+
+    Args:
+        test_data (dict): Result of the test
+        max_count (int): Unused, accepted for a uniform scorer signature
+
+    Returns:
+        float: Average latency inverted and scaled from 0-3s to 100-0
+    """
+    return 100 * (1 - min(test_data.get("avg_latency", 10) / 3, 1))
+
+
+# Normalized score function of each weighted test
+_TEST_SCORERS = {
+    "token": _count_score,
+    "contract": _count_score,
+    "account_history": _count_score,
+    "config": _access_time_score,
+    "latency": _latency_score,
+}
+
+
+def _score_node(node_data, max_values=None):
+    """Calculate the weighted score of a single node against precomputed maximums.
 
     Args:
         node_data (dict): The node data dictionary containing benchmark results
-        all_nodes_data (list, optional): List of all node data for normalized scoring
+        max_values (dict, optional): Maximum counts from ``compute_max_values``. When omitted,
+            counts are not normalized against other nodes.
 
     Returns:
         float: A weighted score where higher is better
     """
-    # Define weights for each test (should sum to 1.0)
-    weights = {
-        "token": 0.25,  # Token retrieval is critical for most operations
-        "contract": 0.20,  # Contract info is important for smart contract operations
-        "account_history": 0.20,  # Account history important for wallets and apps
-        "latency": 0.25,  # Latency is crucial for real-time applications
-        "config": 0.10,  # Config is less critical for everyday usage
-    }
-
     # Base score starts at 0
     score = 0
 
     # Track if any critical services failed
     critical_service_failed = False
 
-    # Find maximum values for normalization if all_nodes_data is provided
-    max_values = {
-        "token": {"count": 0},
-        "contract": {"count": 0},
-        "account_history": {"count": 0},
-    }
-
-    if all_nodes_data:
-        for node in all_nodes_data:
-            # Find max token count
-            if node["token"].get("ok", False):
-                max_values["token"]["count"] = max(
-                    max_values["token"]["count"], node["token"].get("count", 0)
-                )
-            # Find max contract count
-            if node["contract"].get("ok", False):
-                max_values["contract"]["count"] = max(
-                    max_values["contract"]["count"], node["contract"].get("count", 0)
-                )
-            # Find max account history count
-            if node["account_history"].get("ok", False):
-                max_values["account_history"]["count"] = max(
-                    max_values["account_history"]["count"], node["account_history"].get("count", 0)
-                )
-
     # Calculate normalized score for each test
-    for test, weight in weights.items():
-        test_data = node_data.get(test, {})
+    for test, weight in _WEIGHTS.items():
+        test_data = node_data.get(test, _EMPTY)
 
         # Skip tests that failed or don't have valid data
         if not test_data.get("ok", False):
             # Mark critical service failures
-            if test in ["token", "contract", "latency"]:
+            if test in _CRITICAL_TESTS:
                 critical_service_failed = True
             continue
 
-        # Calculate normalized score based on test type
-        if test == "token" or test == "contract" or test == "account_history":
-            # For these tests, higher count is better
-            max_count = (
-                max_values[test]["count"] if all_nodes_data and max_values[test]["count"] > 0 else 1
-            )
-            ratio = test_data.get("count", 0) / max_count
-            test_score = ratio * 100  # Scale to 0-100
-        elif test == "config":
-            # For config, lower access time is better
-            access_time = test_data.get("access_time", 30)
-            test_score = 100 * (1 - min(access_time / 2, 1))  # Scale 0-2s to 100-0
-        elif test == "latency":
-            # For latency, lower avg_latency is better
-            avg_latency = test_data.get("avg_latency", 10)
-            test_score = 100 * (1 - min(avg_latency / 3, 1))  # Scale 0-3s to 100-0
-
-        # Apply weight to test score
-        score += test_score * weight
+        # Apply weight to the normalized score of the test
+        max_count = max_values[test]["count"] if max_values and test in max_values else 1
+        score += _TEST_SCORERS[test](test_data, max_count) * weight
 
     # Apply version bonus (newer versions generally better)
     version = node_data.get("SSCnodeVersion", "unknown")
@@ -188,9 +265,7 @@ def calculate_weighted_node_score(node_data, all_nodes_data=None):
             if version.startswith("v"):
                 version = version[1:]
             # Extract numbers from version
-            import re
-
-            version_nums = re.findall(r"\d+", version)
+            version_nums = _VERSION_RE.findall(version)
             if version_nums and len(version_nums) >= 1:
                 # Small bonus for newer versions (up to 5%)
                 version_bonus = min(5, sum(int(n) for n in version_nums[:3]) / 100)
@@ -203,3 +278,41 @@ def calculate_weighted_node_score(node_data, all_nodes_data=None):
         score *= 0.5
 
     return score
+
+
+def calculate_weighted_node_score(node_data, all_nodes_data=None, max_values=None):
+    """Calculate a weighted score for a node based on real-world performance importance.
+
+    This function applies weights to different benchmark results to provide a more
+    realistic assessment of node performance for actual usage scenarios. When scoring
+    several nodes, compute ``max_values`` once with ``compute_max_values`` and pass it
+    to every call instead of ``all_nodes_data``.
+
+    Args:
+        node_data (dict): The node data dictionary containing benchmark results
+        all_nodes_data (list, optional): List of all node data for normalized scoring
+        max_values (dict, optional): Precomputed maximums from ``compute_max_values``.
+            Takes precedence over ``all_nodes_data``.
+
+    Returns:
+        float: A weighted score where higher is better
+    """
+    if max_values is None and all_nodes_data:
+        max_values = compute_max_values(all_nodes_data)
+    return _score_node(node_data, max_values)
+
+
+def calculate_weighted_scores(all_nodes_data):
+    """Calculate weighted scores for every node in a single pass.
+
+    The normalization maximums are computed once for the whole list instead of once
+    per node, so scoring N nodes is O(N) rather than O(N^2).
+
+    Args:
+        all_nodes_data (list): List of all node data dictionaries
+
+    Returns:
+        list: Weighted scores in the same order as ``all_nodes_data``
+    """
+    max_values = compute_max_values(all_nodes_data)
+    return [_score_node(node_data, max_values) for node_data in all_nodes_data]
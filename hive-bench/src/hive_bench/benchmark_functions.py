@@ -1,15 +1,215 @@
 """Benchmark functions for testing Hive nodes."""
 
+import functools
+import json
+import threading
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from timeit import default_timer as timer
 
 from nectar.account import Account
 from nectar.blockchain import Blockchain
-from nectar.comment import Comment
 from nectar.hive import Hive
 from nectar.utils import resolve_authorpermvoter
+from nectarapi.exceptions import ApiNotSupported, NoApiWithName, NoMethodWithName, RPCError
 
-from hive_bench.utils import format_float, quit_thread
+from hive_bench.utils import QUIT, SESSION, format_float
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup, fall back to json
+    orjson = None
+
+try:
+    from nectarapi.graphenerpc import set_session_instance
+except ImportError:  # nectar releases without a replaceable shared session
+    set_session_instance = None
+
+# Number of blocks requested per get_block_range call (block_api maximum)
+BLOCK_BATCH_SIZE = 1000
+
+# Number of operations requested per get_account_history call (API maximum)
+HISTORY_BATCH_SIZE = 1000
+
+# Number of account history windows kept in flight at once
+HISTORY_WORKERS = 4
+
+# Items processed between deadline checks in the one-at-a-time fallback loops
+DEADLINE_CHECK_INTERVAL = 32
+
+# Blockchain version and is_hive flag per node URL. Both only change on a hard fork,
+# so they are probed once and kept for the life of the process. Call clear_node_cache()
+# to probe them again.
+_node_meta: dict[str, dict] = {}
+
+# Route nectar's RPC traffic through the shared pooled session as well
+if set_session_instance is not None:
+    set_session_instance(SESSION)
+
+# Per-node locks so each node's Hive client is only constructed once
+_hive_locks = defaultdict(threading.Lock)
+_hive_locks_guard = threading.Lock()
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_hive(node, timeout, num_retries, num_retries_call):
+    """Construct a Hive client, memoized by ``_get_hive``."""
+    return Hive(
+        node=node,
+        num_retries=num_retries,
+        num_retries_call=num_retries_call,
+        timeout=timeout,
+    )
+
+
+def _get_hive(node, timeout, num_retries, num_retries_call):
+    """Get a shared Hive client for a node.
+
+    Clients are cached per connection settings so that consecutive benchmarks against
+    the same node reuse one connection instead of repeating the connection setup.
+    Use ``_get_hive.cache_clear()`` to drop all cached clients.
+
+    Args:
+        node (str): URL of the node to connect to
+        timeout (int): Connection timeout in seconds
+        num_retries (int): Number of connection retries
+        num_retries_call (int): Number of API call retries
+
+    Returns:
+        Hive: The cached Hive instance for the node
+    """
+    with _hive_locks_guard:
+        node_lock = _hive_locks[node]
+    with node_lock:
+        return _cached_hive(node, timeout, num_retries, num_retries_call)
+
+
+_get_hive.cache_clear = _cached_hive.cache_clear
+
+
+def _json_dumps(obj):
+    """Encode an object to JSON bytes, using orjson when it is installed.
+
+    Args:
+        obj: The object to encode
+
+    Returns:
+        bytes: The encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _json_loads(data):
+    """Decode JSON bytes, using orjson when it is installed.
+
+    Args:
+        data (bytes): The JSON document to decode
+
+    Returns:
+        The decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _rpc(node, method, params=None, timeout=60):
+    """Call a condenser_api method on a node with a single JSON-RPC request.
+
+    This bypasses the Hive client so that only the request itself is measured, without
+    any client setup or probing requests.
+
+    Args:
+        node (str): URL of the node to query
+        method (str): condenser_api method name, e.g. "get_config"
+        params (list, optional): Positional parameters for the method. Defaults to [].
+        timeout (int, optional): Request timeout in seconds. Defaults to 60.
+
+    Returns:
+        The "result" member of the JSON-RPC response
+
+    Raises:
+        RPCError: If the node returns a JSON-RPC error
+        requests.RequestException: If the HTTP request fails
+    """
+    payload = {
+        "jsonrpc": "2.0",
+        "method": f"condenser_api.{method}",
+        "params": params or [],
+        "id": 1,
+    }
+    response = SESSION.post(node, data=_json_dumps(payload), timeout=timeout)
+    response.raise_for_status()
+    data = _json_loads(response.content)
+    if "error" in data:
+        raise RPCError(data["error"].get("message", str(data["error"])))
+    return data["result"]
+
+
+def _count_history_windows(node, account_name, start_index, deadline, timeout=60):
+    """Count account history operations fetched through concurrent history windows.
+
+    Windows of HISTORY_BATCH_SIZE operations are requested newest first, with up to
+    HISTORY_WORKERS requests in flight. Outstanding requests are cancelled once the
+    time limit is reached. Each window is a direct JSON-RPC request through the shared
+    pooled session, so the worker threads do not share a nectar RPC client.
+
+    Args:
+        node (str): URL of the node being benchmarked
+        account_name (str): Account name to retrieve history for
+        start_index (int): Index of the newest operation in the account history
+        deadline (float): Timer value at which the benchmark must stop
+        timeout (int, optional): Request timeout in seconds. Defaults to 60.
+
+    Returns:
+        int: Number of history operations retrieved within the time limit
+
+    Raises:
+        RPCError: If the node returns a JSON-RPC error for a window
+    """
+    history_count = 0
+    next_index = start_index
+    executor = ThreadPoolExecutor(max_workers=HISTORY_WORKERS)
+
+    def submit_window():
+        nonlocal next_index
+        limit = min(HISTORY_BATCH_SIZE, next_index)
+        future = executor.submit(
+            _rpc, node, "get_account_history", [account_name, next_index, limit], timeout
+        )
+        next_index -= limit + 1
+        return future
+
+    try:
+        pending = set()
+        # A window needs a limit of at least 1, so stop once index 0 is reached
+        while next_index > 0 and len(pending) < HISTORY_WORKERS:
+            pending.add(submit_window())
+
+        while pending:
+            remaining = deadline - timer()
+            if remaining <= 0 or QUIT.is_set():
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                history_count += len(future.result() or [])
+                if next_index > 0:
+                    pending.add(submit_window())
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return history_count
+
+
+def clear_node_cache():
+    """Forget the cached version probes for all nodes.
+
+    The next get_config_node call for each node probes its version and is_hive flag again.
+    """
+    _node_meta.clear()
 
 
 def get_config_node(node, num_retries=10, num_retries_call=10, timeout=60, how_many_seconds=30):
@@ -17,7 +217,9 @@ def get_config_node(node, num_retries=10, num_retries_call=10, timeout=60, how_m
 
     This function connects to a Hive node and retrieves its configuration, version,
     and determines if it's a Hive node. It measures the time taken to access the
-    configuration as a performance metric.
+    configuration as a performance metric. The config is fetched and timed on every
+    call, while the version and is_hive probes are only made on the first call for
+    each node.
 
     Args:
         node (str): URL of the node to connect to
@@ -45,17 +247,16 @@ def get_config_node(node, num_retries=10, num_retries_call=10, timeout=60, how_m
     config = {}
 
     try:
-        hv = Hive(
-            node=node,
-            num_retries=num_retries,
-            num_retries_call=num_retries_call,
-            timeout=timeout,
-        )
-        blockchain_version = hv.get_blockchain_version()
-        is_hive = hv.is_hive
+        meta = _node_meta.get(node)
+        if meta is None:
+            hv = _get_hive(node, timeout, num_retries, num_retries_call)
+            meta = {"version": hv.get_blockchain_version(), "is_hive": hv.is_hive}
+            _node_meta[node] = meta
+        blockchain_version = meta["version"]
+        is_hive = meta["is_hive"]
 
         start = timer()
-        config = hv.get_config(use_stored_data=False)
+        config = _rpc(node, "get_config", timeout=timeout)
         access_time = format_float(timer() - start)
 
         return {
@@ -78,7 +279,8 @@ def benchmark_node_blocks(
 
     This function measures how many blocks a node can retrieve within a specified time period.
     It starts at 75% of the current block height and counts how many blocks can be retrieved
-    sequentially within the time limit.
+    sequentially within the time limit. Blocks are requested in batches of BLOCK_BATCH_SIZE
+    via get_block_range, falling back to single block requests if the node lacks block_api.
 
     Args:
         node (str): URL of the node to benchmark
@@ -99,31 +301,47 @@ def benchmark_node_blocks(
     """
     block_count = 0
     start_time = timer()
+    deadline = start_time + how_many_seconds
 
     try:
-        hv = Hive(
-            node=node,
-            num_retries=num_retries,
-            num_retries_call=num_retries_call,
-            timeout=timeout,
-        )
+        hv = _get_hive(node, timeout, num_retries, num_retries_call)
         blockchain = Blockchain(blockchain_instance=hv)
         last_block_id = int(blockchain.get_current_block_num() * 0.75)
 
-        for entry in blockchain.blocks(
-            start=last_block_id,
-        ):
-            block_count += 1
-
-            # Check if we need to break out of the loop
-            if timer() - start_time > how_many_seconds or quit_thread:
-                break
-
+        try:
+            # Fetch whole ranges of blocks per round trip, checking the clock between batches
+            current_block = last_block_id
+            while timer() < deadline and not QUIT.is_set():
+                batch = hv.rpc.get_block_range(
+                    {"starting_block_num": current_block, "count": BLOCK_BATCH_SIZE},
+                    api="block",
+                )
+                if isinstance(batch, dict):
+                    batch = batch.get("blocks", [])
+                if not batch:
+                    break
+                block_count += len(batch)
+                current_block += len(batch)
+        except (ApiNotSupported, NoApiWithName, NoMethodWithName):
+            # Node does not expose block_api, fall back to fetching blocks one at a time
+            for entry in blockchain.blocks(
+                start=last_block_id + block_count,
+            ):
+                block_count += 1
+
+                # Check if we need to break out of the loop, reading the clock every
+                # DEADLINE_CHECK_INTERVAL blocks only
+                if block_count % DEADLINE_CHECK_INTERVAL == 0 and (
+                    timer() > deadline or QUIT.is_set()
+                ):
+                    break
+
+        end_time = timer()
         return {
             "successful": True,
             "count": block_count,
             "access_time": None,
-            "total_duration": format_float(timer() - start_time),
+            "total_duration": format_float(end_time - start_time),
         }
     except Exception:
         # Let benchmark_executor handle the exception
@@ -143,6 +361,7 @@ def benchmark_node_history(
     This function measures how many account history operations a node can retrieve
     within a specified time period. It retrieves history operations in reverse order
     for the specified account and counts how many can be retrieved within the time limit.
+    Several history windows are requested concurrently to keep the connection busy.
 
     Args:
         node (str): URL of the node to benchmark
@@ -164,26 +383,31 @@ def benchmark_node_history(
     """
     history_count = 0
     start_time = timer()
+    deadline = start_time + how_many_seconds
 
     try:
-        hv = Hive(
-            node=node,
-            num_retries=num_retries,
-            num_retries_call=num_retries_call,
-            timeout=timeout,
-        )
+        hv = _get_hive(node, timeout, num_retries, num_retries_call)
         account = Account(account_name, blockchain_instance=hv)
 
-        for _ in account.history_reverse(batch_size=100):
-            history_count += 1
-            if timer() - start_time > how_many_seconds or quit_thread:
-                break
-
+        try:
+            history_count = _count_history_windows(
+                node, account_name, account.virtual_op_count(), deadline, timeout
+            )
+        except (ApiNotSupported, NoApiWithName, NoMethodWithName, RPCError):
+            # Node does not serve condenser history windows, fall back to the account iterator
+            for _ in account.history_reverse(batch_size=100):
+                history_count += 1
+                if history_count % DEADLINE_CHECK_INTERVAL == 0 and (
+                    timer() > deadline or QUIT.is_set()
+                ):
+                    break
+
+        end_time = timer()
         return {
             "successful": True,
             "count": history_count,
             "access_time": None,
-            "total_duration": format_float(timer() - start_time),
+            "total_duration": format_float(end_time - start_time),
         }
     except Exception:
         # Let benchmark_executor handle the exception
@@ -216,13 +440,8 @@ def benchmark_calls(node, authorpermvoter, num_retries=10, num_retries_call=10,
     access_time = timeout
 
     try:
-        # Initialize Hive client
-        hv = Hive(
-            node=node,
-            num_retries=num_retries,
-            num_retries_call=num_retries_call,
-            timeout=timeout,
-        )
+        # Get the shared Hive client for this node
+        hv = _get_hive(node, timeout, num_retries, num_retries_call)
 
         # Parse parameters safely
         try:
@@ -237,35 +456,18 @@ def benchmark_calls(node, authorpermvoter, num_retries=10, num_retries_call=10,
 
         # Try to get a post that's more likely to exist
         try:
+            # Try the specified post first, timing only the get_content call
             start = timer()
-            # Try the specified post first
-            post_identifier = f"@{comment_author}/{comment_permlink}"
-            comment = Comment(post_identifier, blockchain_instance=hv)
+            content = hv.rpc.get_content(comment_author, comment_permlink, api="condenser")
+            access_time = format_float(timer() - start)
 
             # Basic check to see if we got a valid post
-            if not hasattr(comment, "id") or not comment.id:
+            if not content or not content.get("author"):
                 raise ValueError("Post not found, trying recent posts")
-
-            access_time = format_float(timer() - start)
         except Exception:
-            # If the specified post doesn't exist, try to get any recent post from the author
+            # If the specified post doesn't exist, time fetching the author's most recent post
             start = timer()
-            account = Account(comment_author, blockchain_instance=hv)
-
-            # Get the most recent post from the author
-            history = list(account.get_blog(limit=1))
-            if history:
-                # Use the most recent post
-                recent_post = history[0]
-                if isinstance(recent_post, dict) and "comment" in recent_post:
-                    comment = Comment(recent_post["comment"], blockchain_instance=hv)
-                else:
-                    comment = recent_post
-            else:
-                # If no posts are found, use the blockchain's head block as a fallback timing metric
-                blockchain = Blockchain(blockchain_instance=hv)
-                blockchain.get_current_block()
-
+            hv.rpc.get_blog(comment_author, 0, 1, api="condenser")
             access_time = format_float(timer() - start)
 
         return {
@@ -290,7 +492,9 @@ def benchmark_block_diff(node, num_retries=10, num_retries_call=10, timeout=60):
     Args:
         node (str): URL of the node to benchmark
         num_retries (int, optional): Number of connection retries. Defaults to 10.
+            Note: Not used since the query is a single direct request, kept for API consistency.
         num_retries_call (int, optional): Number of API call retries. Defaults to 10.
+            Note: Not used since the query is a single direct request, kept for API consistency.
         timeout (int, optional): Connection timeout in seconds. Defaults to 60.
 
     Returns:
@@ -303,27 +507,15 @@ def benchmark_block_diff(node, num_retries=10, num_retries_call=10, timeout=60):
         Exception: Any exception that occurs during node connection or data retrieval
     """
     try:
-        # Initialize Hive client
-        hv = Hive(
-            node=node,
-            num_retries=num_retries,
-            num_retries_call=num_retries_call,
-            timeout=timeout,
-        )
-
-        # Get dynamic global properties through the Hive object directly
-        # rather than from the Blockchain object
-        dgp = hv.rpc.get_dynamic_global_properties()
+        # Query dynamic global properties with a single direct request so that the
+        # measurement does not include Hive client setup
+        dgp = _rpc(node, "get_dynamic_global_properties", timeout=timeout)
 
-        # Get head block number and time
+        # Get head block number and time (block times are UTC without an offset)
         head_block_num = dgp["head_block_number"]
-        head_block_time = dgp["time"]
-
-        # Convert head block time to datetime
-        if isinstance(head_block_time, str):
-            head_block_time = datetime.strptime(head_block_time, "%Y-%m-%dT%H:%M:%S").replace(
-                tzinfo=timezone.utc
-            )
+        head_block_time = datetime.fromisoformat(str(dgp["time"]).rstrip("Z")).replace(
+            tzinfo=timezone.utc
+        )
 
         # Calculate head delay (difference between current time and head block time)
         current_time = datetime.now(timezone.utc)
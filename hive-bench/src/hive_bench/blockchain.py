@@ -5,8 +5,12 @@ This module provides functions for interacting with the Hive blockchain,
 including updating account metadata with benchmark results.
 """
 
+import functools
+import itertools
+import json
 import logging
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
@@ -26,6 +30,14 @@ from hive_bench import __version__ as APP_VERSION
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup, fall back to json
+    orjson = None
+
+
+# Maximum number of ranked nodes embedded in a post's json_metadata
+TOP_N = 10
 
 # Default tags for Hive benchmark posts
 DEFAULT_TAGS = ["hive", "benchmark", "nodes", "api", "performance"]
@@ -35,25 +47,89 @@ FALLBACK_NODES = [
     "https://api.hive.blog",
 ]
 
+# Connected Hive instances keyed by the custom node list they were created with
+# (an empty tuple for the NodeList default), reused across posts and metadata updates
+_hive_connections: Dict[tuple, Hive] = {}
+
 
+@functools.lru_cache(maxsize=1)
 def get_project_root() -> Path:
-    """Get the absolute path to the project root directory."""
+    """Get the absolute path to the project root directory.
+
+    The path is resolved once per process.
+    """
     current_file = Path(__file__).resolve()
     # Go up two levels from src/bench/blockchain.py to reach project root
     return current_file.parent.parent.parent
 
 
+@functools.lru_cache(maxsize=1)
 def load_env_file():
-    """Load environment variables from .env file in project root."""
+    """Load environment variables from .env file in project root.
+
+    The file is only read once per process.
+    """
     env_path = get_project_root() / ".env"
     if not env_path.exists():
         logger.warning(f".env file not found at {env_path}")
     load_dotenv(dotenv_path=env_path)
 
 
+@dataclass(frozen=True)
+class Config:
+    """Blockchain settings read from the environment.
+
+    Attributes:
+        posting_wif: Posting key used to publish posts.
+        active_wif: Active key used to update account metadata.
+        hive_account: Account that posts and metadata updates are made for.
+        dry_run: Whether transactions are built without being broadcast.
+    """
+
+    posting_wif: Optional[str]
+    active_wif: Optional[str]
+    hive_account: Optional[str]
+    dry_run: bool
+
+
+@functools.lru_cache(maxsize=1)
+def _load_config() -> Config:
+    """Load the blockchain settings from the .env file and environment once per process.
+
+    Call ``_load_config.cache_clear()`` after changing the environment to re-read them.
+
+    Returns:
+        The cached Config instance.
+    """
+    load_env_file()
+    return Config(
+        posting_wif=os.getenv("POSTING_WIF"),
+        active_wif=os.getenv("ACTIVE_WIF"),
+        hive_account=os.getenv("HIVE_ACCOUNT"),
+        dry_run=os.getenv("DRY_RUN", "False").lower() in ("true", "1", "t"),
+    )
+
+
+def _dumps_metadata(data: Dict[str, Any]) -> str:
+    """Serialize metadata to compact JSON, using orjson when it is installed.
+
+    Args:
+        data: The metadata dictionary to serialize.
+
+    Returns:
+        The JSON document as a string.
+    """
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(",", ":"))
+
+
 def get_hive_connection(custom_nodes: Optional[List[str]] = None) -> Hive:
     """Get a connection to the Hive blockchain.
 
+    The first successful connection for a node list is kept and returned on later
+    calls, so the node list lookup and connection probe only happen once per process.
+
     Args:
         custom_nodes: Optional list of custom nodes to use instead of the NodeList.
             If not provided, nodes from NodeList will be used.
@@ -64,13 +140,16 @@ def get_hive_connection(custom_nodes: Optional[List[str]] = None) -> Hive:
     Raises:
         RPCConnectionRequired: If connection to the Hive blockchain fails.
     """
-    # Load environment variables
-    load_env_file()
-
     # Get configuration from environment variables with defaults
-    POSTING_WIF = os.getenv("POSTING_WIF")
-    ACTIVE_WIF = os.getenv("ACTIVE_WIF")
-    DRY_RUN = os.getenv("DRY_RUN", "False").lower() in ("true", "1", "t")
+    config = _load_config()
+    POSTING_WIF = config.posting_wif
+    ACTIVE_WIF = config.active_wif
+    DRY_RUN = config.dry_run
+
+    cache_key = tuple(custom_nodes or ())
+    hive = _hive_connections.get(cache_key)
+    if hive is not None:
+        return hive
 
     try:
         # Use provided nodes or get from NodeList
@@ -88,6 +167,7 @@ def get_hive_connection(custom_nodes: Optional[List[str]] = None) -> Hive:
         # Test connection by getting config
         _ = hive.get_config()
 
+        _hive_connections[cache_key] = hive
         return hive
     except Exception as e:
         logger.error(f"Failed to connect to Hive blockchain: {e}")
@@ -116,13 +196,11 @@ def update_json_metadata(
         MissingKeyError: If the required keys are not available.
         RPCConnectionRequired: If connection to the Hive blockchain fails.
     """
-    # Load environment variables
-    load_env_file()
-
     # Get configuration from environment variables with defaults
-    ACTIVE_WIF = os.getenv("ACTIVE_WIF")
-    HIVE_ACCOUNT = account or os.getenv("HIVE_ACCOUNT")
-    DRY_RUN = os.getenv("DRY_RUN", "False").lower() in ("true", "1", "t")
+    config = _load_config()
+    ACTIVE_WIF = config.active_wif
+    HIVE_ACCOUNT = account or config.hive_account
+    DRY_RUN = config.dry_run
 
     # Validate environment variables
     if not ACTIVE_WIF:
@@ -147,7 +225,8 @@ def update_json_metadata(
         if DRY_RUN:
             logger.warning("DRY_RUN mode enabled, no actual transaction will be broadcast")
 
-        tx = acc.update_account_metadata(data, account=HIVE_ACCOUNT)
+        # Serialize up front so nectar sends the compact document as is
+        tx = acc.update_account_metadata(_dumps_metadata(data), account=HIVE_ACCOUNT)
         logger.info(f"Successfully updated account metadata: {tx}")
 
         return tx
@@ -197,13 +276,11 @@ def post_to_hive(
         MissingKeyError: If the required keys are not available.
         RPCConnectionRequired: If connection to the Hive blockchain fails.
     """
-    # Load environment variables
-    load_env_file()
-
     # Get configuration from environment variables with defaults
-    POSTING_WIF = os.getenv("POSTING_WIF")
-    HIVE_ACCOUNT = os.getenv("HIVE_ACCOUNT")
-    DRY_RUN = os.getenv("DRY_RUN", "False").lower() in ("true", "1", "t")
+    config = _load_config()
+    POSTING_WIF = config.posting_wif
+    HIVE_ACCOUNT = config.hive_account
+    DRY_RUN = config.dry_run
 
     # Validate environment variables
     if not POSTING_WIF:
@@ -226,6 +303,12 @@ def post_to_hive(
     if not tags:
         tags = DEFAULT_TAGS
 
+    # Nothing is broadcast in dry-run mode, so skip connecting to Hive entirely
+    if DRY_RUN:
+        logger.info(f"Creating post on Hive with title: {metadata['title']}")
+        logger.warning("DRY_RUN mode enabled, no actual transaction will be broadcast")
+        return {"status": "dry_run", "title": metadata["title"]}
+
     try:
         # Get Hive connection
         hive = get_hive_connection()
@@ -238,7 +321,7 @@ def post_to_hive(
             "timestamp": metadata.get("timestamp", ""),
             "node_count": metadata.get("node_count", 0),
             "failing_nodes": metadata.get("failing_nodes", 0),
-            "top_nodes": metadata.get("top_nodes", []),
+            "top_nodes": list(itertools.islice(metadata.get("top_nodes", []), TOP_N)),
         }
 
         # Prepare comment options with beneficiaries if provided
@@ -261,10 +344,6 @@ def post_to_hive(
 
         # Post to Hive
         logger.info(f"Creating post on Hive with title: {metadata['title']}")
-        if DRY_RUN:
-            logger.warning("DRY_RUN mode enabled, no actual transaction will be broadcast")
-            return {"status": "dry_run", "title": metadata["title"]}
-
         tx = hive.post(
             title=metadata["title"],
             body=content,
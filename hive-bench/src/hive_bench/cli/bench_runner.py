@@ -2,16 +2,45 @@
 """Runner script for benchmarking Hive nodes."""
 
 import argparse
+import heapq
 import json
 import logging
+import os
 import sys
 from pathlib import Path
 
-from dotenv import load_dotenv
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup, fall back to json
+    orjson = None
 
-from hive_bench.blockchain import update_json_metadata
-from hive_bench.database import store_benchmark_data_in_db
-from hive_bench.main import run_benchmarks
+# Benchmark tests counted towards a node's completed tests
+TEST_TYPES = ("block", "history", "apicall", "config", "block_diff")
+
+# Shared read-only stand-in for a missing test result
+_EMPTY = {}
+
+# Number of nodes listed in the console summary
+TOP_NODES = 5
+
+
+def _write_json(path, data):
+    """Write data as indented JSON, replacing the file atomically.
+
+    The JSON goes to a temporary sibling file first, so an interrupted run never
+    leaves a truncated report behind. Uses orjson when it is installed and falls
+    back to the standard json module.
+
+    Args:
+        path (Path): Destination file
+        data: JSON-serializable object to write
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        tmp_path.write_text(json.dumps(data, indent=2))
+    os.replace(tmp_path, path)
 
 
 def parse_args():
@@ -82,15 +111,17 @@ def parse_args():
         action="store_true",
         help="Update account JSON metadata with benchmark results",
     )
+    parser.add_argument(
+        "--no-summary",
+        action="store_true",
+        help="Do not print the benchmark summary to the console",
+    )
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
     return parser.parse_args()
 
 
 def main():
     """Main entry point for benchmarking script."""
-    # Load environment variables from .env file
-    load_dotenv()
-
     args = parse_args()
 
     # Configure logging
@@ -98,25 +129,33 @@ def main():
     logging.basicConfig(level=log_level, format="%(asctime)s - %(levelname)s - %(message)s")
 
     report = None
-    output_path = None
+    output_path = Path(args.output) if args.output else None
 
     # If a report file is provided, load it instead of running benchmarks
     if args.report_file:
         try:
             report_path = Path(args.report_file)
             if not report_path.exists():
-                logging.error(f"Report file not found: {report_path}")
+                logging.error("Report file not found: %s", report_path)
                 return 1
 
-            logging.info(f"Loading report from {report_path}")
-            with open(report_path, "r") as f:
-                report = json.load(f)
+            # With nothing to write, publish or print there is no need to parse the report
+            same_file = output_path is None or report_path.resolve() == output_path.resolve()
+            if same_file and args.no_summary and not args.update_metadata:
+                logging.info("Report %s is already the output file, nothing to do", report_path)
+                return 0
+
+            logging.info("Loading report from %s", report_path)
+            # Read the whole file in one call and parse it from memory
+            report = json.loads(report_path.read_bytes())
 
             # Apply weighted scoring logic to ensure nodes are in order of real-world performance
             if "report" in report and isinstance(report["report"], list):
-                from hive_bench.utils import calculate_weighted_node_score
+                from hive_bench.utils import calculate_weighted_node_score, compute_max_values
 
                 all_node_data = report["report"]
+                # Normalization maximums are the same for every node, find them once
+                max_values = compute_max_values(all_node_data)
 
                 # Calculate weighted scores for each node
                 node_scores = {}
@@ -125,13 +164,15 @@ def main():
                         # Calculate tests completed for each node
                         tests_completed = sum(
                             1
-                            for test_type in ["block", "history", "apicall", "config", "block_diff"]
-                            if node_data.get(test_type, {}).get("ok", False)
+                            for test_type in TEST_TYPES
+                            if node_data.get(test_type, _EMPTY).get("ok", False)
                         )
                         node_data["tests_completed"] = tests_completed
 
                         # Calculate weighted score
-                        weighted_score = calculate_weighted_node_score(node_data, all_node_data)
+                        weighted_score = calculate_weighted_node_score(
+                            node_data, max_values=max_values
+                        )
                         node_scores[node_data["node"]] = weighted_score
 
                         # Add weighted score to node data for future reference
@@ -151,15 +192,16 @@ def main():
                 sorted_report_data = []
 
                 # First add nodes in the better order
+                node_lookup = {}
+                for node_data in all_node_data:
+                    node_lookup.setdefault(node_data["node"], node_data)
                 for node in better_sorted_nodes:
-                    for node_data in all_node_data:
-                        if node_data["node"] == node:
-                            sorted_report_data.append(node_data)
-                            break
+                    sorted_report_data.append(node_lookup[node])
 
                 # Then add any remaining nodes that weren't in the working nodes list
+                sorted_set = set(better_sorted_nodes)
                 for node_data in all_node_data:
-                    if node_data["node"] not in better_sorted_nodes:
+                    if node_data["node"] not in sorted_set:
                         sorted_report_data.append(node_data)
 
                 # Update the report with the better sorted data
@@ -179,26 +221,28 @@ def main():
                     }
 
                 logging.info(
-                    f"Calculated weighted scores for {len(node_scores)} nodes and reordered them by performance"
+                    "Calculated weighted scores for %d nodes and reordered them by performance",
+                    len(node_scores),
                 )
 
             # If --output is specified, use it as the output path
-            if args.output:
-                output_path = Path(args.output)
-                if report_path != output_path:  # Only save if it's a different file
-                    with open(output_path, "w") as f:
-                        json.dump(report, f, indent=2)
-                    logging.info(f"Sorted report saved to {output_path}")
+            if output_path is not None:
+                # Only save if it's a different file, however the two paths are spelled
+                if report_path.resolve() != output_path.resolve():
+                    _write_json(output_path, report)
+                    logging.info("Sorted report saved to %s", output_path)
                 else:
                     output_path = report_path
             else:
                 output_path = report_path
         except Exception as e:
-            logging.error(f"Failed to load report file: {e}")
+            logging.error("Failed to load report file: %s", e)
             return 1
 
     # Run benchmarks if no report file was provided or if --update-metadata was not specified
     if report is None and (not args.update_metadata or not args.report_file):
+        from hive_bench.main import run_benchmarks
+
         logging.info("Running benchmarks...")
         try:
             report = run_benchmarks(
@@ -211,43 +255,52 @@ def main():
                 timeout=args.timeout,
             )
         except Exception as err:
-            logging.error(f"Benchmark execution failed: {err}")
+            logging.error("Benchmark execution failed: %s", err)
             return 1
 
         # Store results in database if requested
         if not args.no_db:
+            from hive_bench.database import store_benchmark_data_in_db
+
             store_benchmark_data_in_db(report)
             logging.info("Results stored in database.")
 
         # Output results to file if requested
-        if args.output:
-            output_path = Path(args.output)
-            with open(output_path, "w") as f:
-                json.dump(report, f, indent=2)
-            logging.info(f"Results written to {output_path}")
+        if output_path is not None:
+            _write_json(output_path, report)
+            logging.info("Results written to %s", output_path)
     elif report is None:
         logging.error("No report file provided and no benchmarks run.")
         return 1
 
     # Process weighted scores before updating metadata
     if report["nodes"] and "report" in report:
-        from hive_bench.utils import calculate_weighted_node_score
+        from hive_bench.utils import calculate_weighted_node_score, compute_max_values
+
+        # Normalization maximums, computed once on the first node missing a score
+        max_values = None
+
+        report_list = report["report"]
 
         # Make sure all nodes have weighted scores before updating metadata
-        for node_data in report["report"]:
+        for node_data in report_list:
             if isinstance(node_data, dict) and "node" in node_data:
                 # Calculate weighted score if not already present
                 if "weighted_score" not in node_data:
-                    score = calculate_weighted_node_score(node_data, report["report"])
+                    if max_values is None:
+                        max_values = compute_max_values(report_list)
+                    score = calculate_weighted_node_score(node_data, max_values=max_values)
                     node_data["weighted_score"] = round(score, 2)
-                    logging.debug(f"Added weighted score {score:.2f} to {node_data['node']} for metadata")
+                    logging.debug(
+                        "Added weighted score %.2f to %s for metadata", score, node_data["node"]
+                    )
 
                 # Calculate tests completed if not already present
                 if "tests_completed" not in node_data:
                     completed = sum(
                         1
-                        for test_type in ["block", "history", "apicall", "config", "block_diff"]
-                        if isinstance(node_data.get(test_type), dict) and node_data[test_type].get("ok", False)
+                        for test_data in map(node_data.get, TEST_TYPES)
+                        if isinstance(test_data, dict) and test_data.get("ok", False)
                     )
                     node_data["tests_completed"] = completed
 
@@ -268,67 +321,82 @@ def main():
 
     # Update the JSON metadata if requested
     if args.update_metadata:
+        from dotenv import load_dotenv
+
+        from hive_bench.blockchain import update_json_metadata
+
+        # Only the metadata update needs credentials from the .env file
+        load_dotenv()
+
         try:
             account = args.account
-            logging.info(f"Updating JSON metadata{f' for account {account}' if account else ''}...")
+            if account:
+                logging.info("Updating JSON metadata for account %s...", account)
+            else:
+                logging.info("Updating JSON metadata...")
             tx = update_json_metadata(report, account=account)
-            logging.info(f"Updated JSON metadata: {tx}")
+            logging.info("Updated JSON metadata: %s", tx)
         except Exception as e:
-            logging.error(f"Failed to update JSON metadata: {e}")
+            logging.error("Failed to update JSON metadata: %s", e)
             return 1
 
+    # The summary is only for people watching the console, scripted runs can skip it
+    if args.no_summary:
+        return 0
+
+    # Missing or empty sections short-circuit the summary instead of raising
+    nodes_list = report.get("nodes") or []
+    report_list = report.get("report") or []
+    failing_nodes = report.get("failing_nodes") or []
+
     # Print summary to console
     print("\nBenchmark Summary:")
-    print(
-        f"Tested {len(report['nodes'])} working nodes and {len(report['failing_nodes'])} failing nodes"
-    )
+    print(f"Tested {len(nodes_list)} working nodes and {len(failing_nodes)} failing nodes")
 
-    if report["nodes"]:
-        # Create dictionaries for weighted scores and test completion
-        weighted_scores = {}
-        tests_completed = {}
+    if nodes_list:
+        # Bounded min-heap of the best nodes so far as (score, -position, url, tests)
+        top_nodes = []
+        position = 0
 
         # Process the report data to get weighted scores
-        for node_data in report["report"]:
+        for node_data in report_list:
             if isinstance(node_data, dict) and "node" in node_data:
-                node_url = node_data["node"]
-
-                # Use weighted_score if available, otherwise calculate it
-                if "weighted_score" in node_data:
-                    weighted_scores[node_url] = node_data["weighted_score"]
-                    tests_completed[node_url] = node_data.get("tests_completed", 0)
+                # Use weighted_score if available, otherwise default to 0
+                weighted_score = node_data.get("weighted_score")
+                if weighted_score is not None:
+                    tests = node_data.get("tests_completed", 0)
                 else:
-                    # If no weighted score in report, default to 0
-                    weighted_scores[node_url] = 0
+                    weighted_score = 0
                     # Count completed tests
-                    tests_completed[node_url] = sum(
+                    tests = sum(
                         1
-                        for test_type in [
-                            "block",
-                            "history",
-                            "apicall",
-                            "config",
-                            "block_diff",
-                        ]
-                        if node_data.get(test_type, {}).get("ok", False)
+                        for test_type in TEST_TYPES
+                        if node_data.get(test_type, _EMPTY).get("ok", False)
                     )
 
+                # Earlier nodes win ties, as with a stable sort
+                entry = (weighted_score, -position, node_data["node"], tests)
+                position += 1
+                if len(top_nodes) < TOP_NODES:
+                    heapq.heappush(top_nodes, entry)
+                else:
+                    heapq.heappushpop(top_nodes, entry)
+
         # If no weighted scores at all, try to get them from nodes list
-        if not weighted_scores and isinstance(report["nodes"], list):
-            for node_url in report["nodes"]:
-                if isinstance(node_url, str):
-                    weighted_scores[node_url] = 0  # Default score
-                    tests_completed[node_url] = 0
-                    logging.debug(f"Using fallback for node: {node_url}")
-
-        # Print top 5 nodes by weighted score (higher is better)
+        if not position and isinstance(nodes_list, list):
+            fallback_nodes = [node_url for node_url in nodes_list if isinstance(node_url, str)]
+            for node_url in fallback_nodes:
+                logging.debug("Using fallback for node: %s", node_url)
+            top_nodes = [
+                (0, -i, node_url, 0) for i, node_url in enumerate(fallback_nodes[:TOP_NODES])
+            ]
+
+        # Print top nodes by weighted score (higher is better)
         print("\nTop performing nodes by weighted score (higher is better):")
-        # Sort by weighted score (descending - higher is better)
-        sorted_nodes = sorted(weighted_scores.items(), key=lambda x: x[1], reverse=True)[:5]
+        sorted_nodes = sorted(top_nodes, reverse=True)
 
         if sorted_nodes:
-            for i, (node, score) in enumerate(sorted_nodes):
-                tests = tests_completed.get(node, 0)
+            for i, (score, _, node, tests) in enumerate(sorted_nodes):
                 print(f"{i + 1}. {node} (weighted score: {score:.2f}, tests completed: {tests}/5)")
         else:
             print("No node performance data available.")
@@ -1,14 +1,74 @@
 """Database operations for storing benchmark results."""
 
+import functools
 import logging
 import os
 import sqlite3
 from datetime import datetime
 from pathlib import Path
 
-
+# Connection settings for the benchmark history database. WAL lets the post generator
+# read while a run is being stored, and with synchronous=NORMAL commits no longer wait
+# for a sync of the main database file. The journal mode is stored in the file itself.
+_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+"""
+
+# Connection settings for report generation, which only reads. query_only rejects any
+# accidental write; the page cache and memory map match the writer's settings.
+_READ_PRAGMAS = """
+PRAGMA query_only=ON;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+"""
+
+# Size of the per-connection compiled statement cache, above the sqlite3 default of 128
+_CACHED_STATEMENTS = 256
+
+# Insert a node or refresh its last_seen timestamp. Upserts need SQLite 3.24 and RETURNING
+# needs 3.35; on older libraries the node_id is looked up after the upsert.
+_UPSERT_NODE_SQL = """
+INSERT INTO nodes (url, first_seen, last_seen) VALUES (?, ?, ?)
+ON CONFLICT(url) DO UPDATE SET last_seen = excluded.last_seen
+"""
+_UPSERT_NODE_RETURNING_SQL = _UPSERT_NODE_SQL + "RETURNING node_id\n"
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Test types stored per working node
+TEST_TYPES = ("block", "history", "apicall", "config", "block_diff")
+
+# Insert statements for one benchmark report. Every call passes the identical SQL text,
+# so the statement is compiled once and then served from the connection's cache.
+_INSERT_RUN_SQL = """
+INSERT INTO benchmark_runs
+(timestamp, start_time, end_time, hive_nectar_version, script_version,
+ num_retries, num_retries_call, timeout, threading, test_parameters)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_NODE_STATUS_SQL = """
+INSERT INTO node_status
+(run_id, node_id, is_working, error_message, version, is_hive)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+_INSERT_TEST_RESULT_SQL = """
+INSERT INTO test_results
+(run_id, node_id, test_type, is_ok, rank, time, count, access_time, head_delay,
+ diff_head_irreversible)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+@functools.lru_cache(maxsize=1)
 def get_project_root() -> Path:
-    """Get the absolute path to the project root directory."""
+    """Get the absolute path to the project root directory.
+
+    The path is resolved once per process.
+    """
     current_file = Path(__file__).resolve()
     # Go up two levels from src/bench/database.py to reach project root
     return current_file.parent.parent.parent
@@ -30,6 +90,121 @@ def get_db_path(db_path="hive_benchmark_history.db") -> Path:
     return get_project_root() / db_path
 
 
+def _configure_conn(conn):
+    """Apply the connection PRAGMAs to a freshly opened connection.
+
+    Args:
+        conn (sqlite3.Connection): The connection to configure
+    """
+    conn.executescript(_PRAGMAS)
+
+
+def connect_readonly(db_path):
+    """Open the benchmark database for reading report data.
+
+    Rows are returned as ``sqlite3.Row`` so columns can be accessed by name.
+
+    Args:
+        db_path (str): Path to the SQLite database file
+
+    Returns:
+        sqlite3.Connection: Connection that refuses writes
+    """
+    conn = sqlite3.connect(db_path, cached_statements=_CACHED_STATEMENTS)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_READ_PRAGMAS)
+    return conn
+
+
+def initialize_schema(conn):
+    """Create the benchmark tables on an open connection if they don't exist.
+
+    The statements are no-ops for tables that already exist, so this is cheap enough to
+    run before every write.
+
+    Args:
+        conn (sqlite3.Connection): Open connection to the benchmark database
+    """
+    cursor = conn.cursor()
+
+    # Create benchmark runs table
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS benchmark_runs (
+        run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        hive_nectar_version TEXT,
+        script_version TEXT,
+        num_retries INTEGER,
+        num_retries_call INTEGER,
+        timeout INTEGER,
+        threading INTEGER,
+        test_parameters TEXT
+    )
+    """)
+
+    # Create nodes table
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS nodes (
+        node_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT UNIQUE NOT NULL,
+        first_seen TEXT,
+        last_seen TEXT
+    )
+    """)
+
+    # Create node status table
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS node_status (
+        status_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id INTEGER,
+        node_id INTEGER,
+        is_working INTEGER,
+        error_message TEXT,
+        version TEXT,
+        is_hive INTEGER,
+        FOREIGN KEY (run_id) REFERENCES benchmark_runs (run_id),
+        FOREIGN KEY (node_id) REFERENCES nodes (node_id)
+    )
+    """)
+
+    # Create test results table
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS test_results (
+        result_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id INTEGER,
+        node_id INTEGER,
+        test_type TEXT,  -- block, history, apicall, config, block_diff
+        is_ok INTEGER,
+        rank INTEGER,
+        time REAL,
+        count INTEGER,
+        access_time REAL,
+        head_delay REAL,
+        diff_head_irreversible INTEGER,
+        FOREIGN KEY (run_id) REFERENCES benchmark_runs (run_id),
+        FOREIGN KEY (node_id) REFERENCES nodes (node_id)
+    )
+    """)
+
+    # Indexes for reading back one run, a node's history and time-windowed reports. The
+    # run indexes also carry the columns the report queries read, so those joins are
+    # answered from the index alone.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_node_status_run_node"
+        " ON node_status (run_id, node_id, is_working)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_test_results_run_type"
+        " ON test_results (run_id, test_type, node_id, rank)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_test_results_node_type ON test_results (node_id, test_type)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON benchmark_runs (timestamp)")
+
+
 def initialize_database(db_path="hive_benchmark_history.db"):
     """Create the SQLite database and tables if they don't exist.
 
@@ -56,70 +231,10 @@ def initialize_database(db_path="hive_benchmark_history.db"):
         db_path = get_db_path(db_path)
 
         conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Create benchmark runs table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS benchmark_runs (
-            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT NOT NULL,
-            start_time TEXT NOT NULL,
-            end_time TEXT NOT NULL,
-            hive_nectar_version TEXT,
-            script_version TEXT,
-            num_retries INTEGER,
-            num_retries_call INTEGER,
-            timeout INTEGER,
-            threading INTEGER,
-            test_parameters TEXT
-        )
-        """)
-
-        # Create nodes table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS nodes (
-            node_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            url TEXT UNIQUE NOT NULL,
-            first_seen TEXT,
-            last_seen TEXT
-        )
-        """)
-
-        # Create node status table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS node_status (
-            status_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            run_id INTEGER,
-            node_id INTEGER,
-            is_working INTEGER,
-            error_message TEXT,
-            version TEXT,
-            is_hive INTEGER,
-            FOREIGN KEY (run_id) REFERENCES benchmark_runs (run_id),
-            FOREIGN KEY (node_id) REFERENCES nodes (node_id)
-        )
-        """)
-
-        # Create test results table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS test_results (
-            result_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            run_id INTEGER,
-            node_id INTEGER,
-            test_type TEXT,  -- block, history, apicall, config, block_diff
-            is_ok INTEGER,
-            rank INTEGER,
-            time REAL,
-            count INTEGER,
-            access_time REAL,
-            head_delay REAL,
-            diff_head_irreversible INTEGER,
-            FOREIGN KEY (run_id) REFERENCES benchmark_runs (run_id),
-            FOREIGN KEY (node_id) REFERENCES nodes (node_id)
-        )
-        """)
-
+        _configure_conn(conn)
+        initialize_schema(conn)
         conn.commit()
+        conn.execute("PRAGMA optimize")
         conn.close()
         logging.info(f"Database initialized at {db_path}")
     except sqlite3.Error as e:
@@ -130,10 +245,8 @@ def initialize_database(db_path="hive_benchmark_history.db"):
 def get_or_create_node_id(cursor, node_url, timestamp):
     """Get node ID from the database or create it if it doesn't exist.
 
-    This function checks if a node with the given URL already exists in the database.
-    If it does, it updates the last_seen timestamp and returns the existing node_id.
-    If not, it creates a new node record with the given URL and timestamp, and returns
-    the newly created node_id.
+    The node is written with a single upsert: a new URL gets a fresh record with the given
+    timestamp as first and last seen, an existing one only has its last_seen updated.
 
     Args:
         cursor (sqlite3.Cursor): Database cursor for executing SQL queries
@@ -143,22 +256,139 @@ def get_or_create_node_id(cursor, node_url, timestamp):
     Returns:
         int: The node_id of the existing or newly created node record
     """
-    # Check if node already exists
-    cursor.execute("SELECT node_id FROM nodes WHERE url = ?", (node_url,))
-    node_record = cursor.fetchone()
-
-    if node_record:
-        # Update last_seen timestamp for existing node
-        node_id = node_record[0]
-        cursor.execute("UPDATE nodes SET last_seen = ? WHERE node_id = ?", (timestamp, node_id))
-        return node_id
-    else:
-        # Create new node record
-        cursor.execute(
-            "INSERT INTO nodes (url, first_seen, last_seen) VALUES (?, ?, ?)",
-            (node_url, timestamp, timestamp),
+    params = (node_url, timestamp, timestamp)
+    if _HAS_RETURNING:
+        return cursor.execute(_UPSERT_NODE_RETURNING_SQL, params).fetchone()[0]
+
+    # Older SQLite without RETURNING: lastrowid is unreliable after the update path
+    cursor.execute(_UPSERT_NODE_SQL, params)
+    return cursor.execute("SELECT node_id FROM nodes WHERE url = ?", (node_url,)).fetchone()[0]
+
+
+def get_or_create_node_ids(cursor, node_urls, timestamp):
+    """Get node IDs for several URLs at once, creating the nodes that don't exist yet.
+
+    All URLs are upserted with one ``executemany`` call and their ids are read back with a
+    single query, so the number of statements does not grow with the number of nodes.
+
+    Args:
+        cursor (sqlite3.Cursor): Database cursor for executing SQL queries
+        node_urls (list): URLs of the nodes to get or create
+        timestamp (str): Current timestamp in string format
+
+    Returns:
+        dict: Mapping of node URL to node_id
+    """
+    urls = list(dict.fromkeys(node_urls))
+    if not urls:
+        return {}
+
+    cursor.executemany(_UPSERT_NODE_SQL, [(url, timestamp, timestamp) for url in urls])
+    placeholders = ", ".join("?" * len(urls))
+    cursor.execute(f"SELECT url, node_id FROM nodes WHERE url IN ({placeholders})", urls)
+    return dict(cursor)
+
+
+def _insert_report(cursor, report_data):
+    """Insert one benchmark report into the database.
+
+    Rows are collected per table and written with one ``executemany`` call each.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor of the connection holding the open transaction
+        report_data (dict): The benchmark report, as accepted by ``store_benchmark_data_in_db``
+    """
+    # Current timestamp for this data insertion
+    timestamp = datetime.now().isoformat()
+
+    # Extract parameters
+    params = report_data["parameter"]
+
+    # Store benchmark run metadata
+    cursor.execute(
+        _INSERT_RUN_SQL,
+        (
+            timestamp,
+            params["start_time"],
+            params["end_time"],
+            params["hive_nectar_version"],
+            params["script_version"],
+            params.get("num_retries", 3),
+            params.get("num_retries_call", 3),
+            params.get("timeout", 30),
+            1 if params.get("threading", False) else 0,
+            params.get("test_parameters", ""),
+        ),
+    )
+    run_id = cursor.lastrowid
+
+    # Rows for each table, written in bulk once every node is processed
+    status_rows = []
+    result_rows = []
+
+    # Resolve the ids of every node in the report up front
+    failing_nodes = report_data.get("failing_nodes", {})
+    node_urls = [node_data["node"] for node_data in report_data["report"]]
+    node_ids = get_or_create_node_ids(cursor, node_urls + list(failing_nodes), timestamp)
+
+    # Process working nodes
+    for node_data in report_data["report"]:
+        node_url = node_data["node"]
+        node_id = node_ids[node_url]
+
+        # Store node status
+        status_rows.append(
+            (
+                run_id,
+                node_id,
+                1,  # is_working = True for nodes in report
+                None,  # No error message for working nodes
+                node_data.get("version", ""),
+                1 if node_data.get("hive", False) else 0,
+            )
         )
-        return cursor.lastrowid
+
+        # Store test results for each test type
+        for test_name in TEST_TYPES:
+            test_data = node_data.get(test_name, {})
+
+            if not test_data.get("ok", False):
+                continue
+
+            # Only the metric columns of this test are filled in, the others stay NULL
+            count = access_time = head_delay = diff_head_irreversible = None
+            if test_name == "block" or test_name == "history":
+                count = test_data.get("count", 0)
+            elif test_name == "apicall" or test_name == "config":
+                access_time = test_data.get("access_time", 0.0)
+            elif test_name == "block_diff":
+                head_delay = test_data.get("head_delay", 0.0)
+                diff_head_irreversible = test_data.get("diff_head_irreversible", 0)
+
+            result_rows.append(
+                (
+                    run_id,
+                    node_id,
+                    test_name,
+                    1,  # is_ok = True, failed tests are skipped above
+                    test_data.get("rank", -1),
+                    test_data.get("time", 0.0),
+                    count,
+                    access_time,
+                    head_delay,
+                    diff_head_irreversible,
+                )
+            )
+
+    # Process failing nodes
+    for node_url, error_msg in failing_nodes.items():
+        node_id = node_ids[node_url]
+
+        # No version and is_hive = False for failing nodes
+        status_rows.append((run_id, node_id, 0, error_msg, "", 0))
+
+    cursor.executemany(_INSERT_NODE_STATUS_SQL, status_rows)
+    cursor.executemany(_INSERT_TEST_RESULT_SQL, result_rows)
 
 
 def store_benchmark_data_in_db(report_data, db_path="hive_benchmark_history.db"):
@@ -169,7 +399,7 @@ def store_benchmark_data_in_db(report_data, db_path="hive_benchmark_history.db")
     both working nodes and failing nodes, storing appropriate information for each.
 
     The function performs the following operations:
-    1. Initializes the database if it doesn't exist
+    1. Creates the tables if they don't exist
     2. Stores benchmark run metadata (timestamp, versions, parameters)
     3. For each working node, stores node status and test results
     4. For each failing node, stores node status with error message
@@ -194,164 +424,20 @@ def store_benchmark_data_in_db(report_data, db_path="hive_benchmark_history.db")
         # Get absolute path to database
         db_path = get_db_path(db_path)
 
-        # Initialize database if needed
-        if not os.path.exists(db_path):
-            initialize_database(db_path)
-
-        # Current timestamp for this data insertion
-        timestamp = datetime.now().isoformat()
-
-        # Extract parameters
-        params = report_data["parameter"]
-
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Store benchmark run metadata
-        cursor.execute(
-            """
-            INSERT INTO benchmark_runs
-            (timestamp, start_time, end_time, hive_nectar_version, script_version,
-             num_retries, num_retries_call, timeout, threading, test_parameters)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                timestamp,
-                params["start_time"],
-                params["end_time"],
-                params["hive_nectar_version"],
-                params["script_version"],
-                params.get("num_retries", 3),
-                params.get("num_retries_call", 3),
-                params.get("timeout", 30),
-                1 if params.get("threading", False) else 0,
-                params.get("test_parameters", ""),
-            ),
-        )
-        run_id = cursor.lastrowid
-
-        # Process working nodes
-        for node_data in report_data["report"]:
-            node_url = node_data["node"]
-            node_id = get_or_create_node_id(cursor, node_url, timestamp)
-
-            # Store node status
-            cursor.execute(
-                """
-                INSERT INTO node_status
-                (run_id, node_id, is_working, version, is_hive)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    run_id,
-                    node_id,
-                    1,  # is_working = True for nodes in report
-                    node_data.get("version", ""),
-                    1 if node_data.get("hive", False) else 0,
-                ),
-            )
-
-            # Store test results for each test type
-            for test_name in ["block", "history", "apicall", "config", "block_diff"]:
-                test_data = node_data.get(test_name, {})
-
-                if not test_data.get("ok", False):
-                    continue
-
-                if test_name == "block" or test_name == "history":
-                    cursor.execute(
-                        """
-                        INSERT INTO test_results
-                        (run_id, node_id, test_type, is_ok, rank, time, count)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            run_id,
-                            node_id,
-                            test_name,
-                            1,  # is_ok = True for working nodes
-                            test_data.get("rank", -1),
-                            test_data.get("time", 0.0),
-                            test_data.get("count", 0),
-                        ),
-                    )
-                elif test_name == "apicall" or test_name == "config":
-                    cursor.execute(
-                        """
-                        INSERT INTO test_results
-                        (run_id, node_id, test_type, is_ok, rank, time, access_time)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            run_id,
-                            node_id,
-                            test_name,
-                            1,  # is_ok = True for working nodes
-                            test_data.get("rank", -1),
-                            test_data.get("time", 0.0),
-                            test_data.get("access_time", 0.0),
-                        ),
-                    )
-                elif test_name == "block_diff":
-                    # Store head_delay
-                    cursor.execute(
-                        """
-                        INSERT INTO test_results
-                        (run_id, node_id, test_type, is_ok, rank, time, head_delay)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            run_id,
-                            node_id,
-                            test_name,
-                            1,  # is_ok = True for working nodes
-                            test_data.get("rank", -1),
-                            test_data.get("time", 0.0),
-                            test_data.get("head_delay", 0.0),
-                        ),
-                    )
-                    # Store diff_head_irreversible
-                    cursor.execute(
-                        """
-                        INSERT INTO test_results
-                        (run_id, node_id, test_type, is_ok, rank, time, diff_head_irreversible)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            run_id,
-                            node_id,
-                            f"{test_name}_diff",  # Use a different test_type for diff measurement
-                            1,  # is_ok = True for working nodes
-                            -1,  # No rank for this metric
-                            test_data.get("time", 0.0),
-                            test_data.get("diff_head_irreversible", 0),
-                        ),
-                    )
-
-        # Process failing nodes
-        for node_url, error_msg in report_data.get("failing_nodes", {}).items():
-            node_id = get_or_create_node_id(cursor, node_url, timestamp)
-
-            # Store node status
-            cursor.execute(
-                """
-                INSERT INTO node_status
-                (run_id, node_id, is_working, error_message, version, is_hive)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    run_id,
-                    node_id,
-                    0,  # is_working = False for failing nodes
-                    error_msg,
-                    "",  # No version for failing nodes
-                    0,  # is_hive = False for failing nodes
-                ),
-            )
-
-        conn.commit()
-        conn.close()
+        # Create the tables and write the whole run on one connection and in one explicit
+        # transaction, so every row is committed with a single sync and nothing is left
+        # behind if an insert fails
+        conn = sqlite3.connect(db_path, isolation_level=None, cached_statements=_CACHED_STATEMENTS)
+        try:
+            _configure_conn(conn)
+            with conn:
+                conn.execute("BEGIN")
+                initialize_schema(conn)
+                _insert_report(conn.cursor(), report_data)
+            # Refresh query planner statistics where they have gone stale; usually a no-op
+            conn.execute("PRAGMA optimize")
+        finally:
+            conn.close()
         logging.info(f"Benchmark results stored in database at {db_path}")
     except sqlite3.Error as e:
         logging.error(f"Database error: {e}")
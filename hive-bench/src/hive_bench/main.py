@@ -1,8 +1,13 @@
 #!/usr/bin/env python
 """Main entry point for the Hive node benchmarking application."""
 
+import heapq
+import json
 import logging
+import threading
+import time
 from datetime import datetime, timezone
+from operator import itemgetter
 
 from nectar.hive import Hive
 from nectar.instance import set_shared_blockchain_instance
@@ -10,9 +15,85 @@ from nectar.nodelist import NodeList
 
 from hive_bench import __version__
 from hive_bench.benchmarks import Benchmarks
-from hive_bench.database import store_benchmark_data_in_db
+from hive_bench.database import get_project_root, store_benchmark_data_in_db
 from hive_bench.utils import INITIAL_NODES
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup, fall back to json
+    orjson = None
+
+# Metric each test is ranked by, and whether a higher value ranks first
+RANKING_METRICS = {
+    "block": ("count", True),
+    "history": ("count", True),
+    "apicall": ("access_time", False),
+    "config": ("access_time", False),
+    "block_diff": ("head_delay", False),
+}
+
+# Report fields filled from a successful result of each test, as (report key, result key)
+_RESULT_FIELDS = {
+    "block": (("count", "count"), ("time", "total_duration")),
+    "history": (("count", "count"), ("time", "total_duration")),
+    "apicall": (("time", "total_duration"), ("access_time", "access_time")),
+    "config": (("time", "total_duration"), ("access_time", "access_time")),
+    "block_diff": (
+        ("head_delay", "head_delay"),
+        ("diff_head_irreversible", "diff_head_irreversible"),
+        ("time", "total_duration"),
+    ),
+}
+
+
+def _make_default_node(node):
+    """Create the report entry of a node before any test result is applied.
+
+    Args:
+        node (str): URL of the node
+
+    Returns:
+        dict: Node entry with every test marked as not ok and unranked
+    """
+    return {
+        "node": node,
+        "version": "0.0.0",
+        "hive": False,
+        "block": {"ok": False, "count": 0, "time": 0, "rank": -1},
+        "history": {"ok": False, "count": 0, "time": 0, "rank": -1},
+        "apicall": {
+            "ok": False,
+            "time": 0,
+            "access_time": 30.0,
+            "rank": -1,
+        },
+        "config": {"ok": False, "time": 0, "access_time": 0, "rank": -1},
+        "block_diff": {
+            "ok": False,
+            "head_delay": 0.0,
+            "diff_head_irreversible": 0.0,
+            "time": 0,
+            "rank": -1,
+        },
+    }
+
+
+def _write_report(output_file, report):
+    """Write the report as indented JSON.
+
+    Uses orjson when it is installed and falls back to the standard json module.
+
+    Args:
+        output_file (Path): Destination file
+        report (dict): Benchmark report to write
+    """
+    if orjson is not None:
+        data = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(report, indent=2).encode()
+    with open(output_file, "wb") as f:
+        f.write(data)
+
 
 def run_benchmarks(
     seconds=30,
@@ -53,40 +134,40 @@ def run_benchmarks(
     nodes = INITIAL_NODES
     n.update(nodes)
 
-    # Initialize the benchmark class
-    benchmarks = Benchmarks(
-        num_retries=num_retries, num_retries_call=num_retries_call, timeout=timeout
-    )
-
     # Track results and failing nodes
     all_results = {}
     failing_nodes = {}
 
     # Record start time in UTC
-    start_time = datetime.now(timezone.utc)
-    logging.info(f"Starting benchmark run at {start_time.isoformat()}")
+    start_time = datetime.now(timezone.utc).isoformat()
+    # The duration is measured on the monotonic clock, unaffected by wall clock changes
+    start_clock = time.monotonic()
+    logging.info(f"Starting benchmark run at {start_time}")
 
     # Run all benchmark tests
     logging.info("Running all benchmark tests...")
 
-    # Run all benchmarks
-    all_results["config"] = benchmarks.run_config_benchmark(nodes, seconds, threading=threading)
-    all_results["block"] = benchmarks.run_block_benchmark(nodes, seconds, threading=threading)
-    all_results["history"] = benchmarks.run_hist_benchmark(
-        nodes, seconds, threading=threading, account_name=account_name
-    )
-    all_results["apicall"] = benchmarks.run_call_benchmark(
-        nodes, authorpermvoter, threading=threading
-    )
-    all_results["block_diff"] = benchmarks.run_block_diff_benchmark(nodes, threading=threading)
+    # Run all benchmarks, with each node running its tests back to back in one worker
+    with Benchmarks(
+        num_retries=num_retries, num_retries_call=num_retries_call, timeout=timeout
+    ) as benchmarks:
+        all_results.update(
+            benchmarks.run_all_benchmarks(
+                nodes,
+                seconds,
+                authorpermvoter,
+                account_name=account_name,
+                threading=threading,
+            )
+        )
 
     # Record end time in UTC
-    end_time = datetime.now(timezone.utc)
-    logging.info(f"Finished benchmark run at {end_time.isoformat()}")
-    logging.info(f"Total duration: {(end_time - start_time).total_seconds()} seconds")
+    end_time = datetime.now(timezone.utc).isoformat()
+    duration = time.monotonic() - start_clock
+    logging.info(f"Finished benchmark run at {end_time}")
+    logging.info(f"Total duration: {duration} seconds")
 
-    # Add timestamp and parameters to results
-    all_results["timestamp"] = datetime.now().isoformat()
+    # Add parameters to results
     all_results["parameters"] = {
         "num_retries": num_retries,
         "num_retries_call": num_retries_call,
@@ -100,114 +181,75 @@ def run_benchmarks(
     # Import nectar version for report
     from nectar import __version__ as hive_nectar_version
 
-    # Process results to create report structure
-    node_data = {}
-    all_nodes = set()
-
-    # Extract node information and identify failing/working nodes
+    # Collect the well-formed results of every test
+    valid_results = []
     for test_name, test_results in all_results.items():
-        if test_name in ["timestamp", "parameters"]:
+        if test_name == "parameters":
             continue
 
         if not isinstance(test_results, list):
             logging.warning(
-                f"Unexpected data format for {test_name}: expected list, got {type(test_results)}"
+                "Unexpected data format for %s: expected list, got %s",
+                test_name,
+                type(test_results),
             )
             continue
 
         for result in test_results:
             if not isinstance(result, dict):
                 logging.warning(
-                    f"Unexpected result format in {test_name}: expected dict, got {type(result)}"
+                    "Unexpected result format in %s: expected dict, got %s",
+                    test_name,
+                    type(result),
                 )
                 continue
 
             if "node" not in result:
-                logging.warning(f"Missing node information in result for {test_name}")
+                logging.warning("Missing node information in result for %s", test_name)
                 continue
 
-            node = result["node"]
-            all_nodes.add(node)
-
-            # Initialize node data structure if needed
-            if node not in node_data:
-                node_data[node] = {
-                    "node": node,
-                    "version": "0.0.0",
-                    "hive": False,
-                    "block": {"ok": False, "count": 0, "time": 0, "rank": -1},
-                    "history": {"ok": False, "count": 0, "time": 0, "rank": -1},
-                    "apicall": {
-                        "ok": False,
-                        "time": 0,
-                        "access_time": 30.0,
-                        "rank": -1,
-                    },
-                    "config": {"ok": False, "time": 0, "access_time": 0, "rank": -1},
-                    "block_diff": {
-                        "ok": False,
-                        "head_delay": 0.0,
-                        "diff_head_irreversible": 0.0,
-                        "time": 0,
-                        "rank": -1,
-                    },
-                }
-
-            # Add version and hive flag if available (from config test)
-            if test_name == "config" and result["successful"]:
-                node_data[node]["version"] = result.get("version", "0.0.0")
-                node_data[node]["hive"] = result.get("is_hive", False)
-
-            # Update test data
-            if result["successful"]:
-                if test_name == "block":
-                    node_data[node]["block"]["ok"] = True
-                    node_data[node]["block"]["count"] = result["count"]
-                    node_data[node]["block"]["time"] = result["total_duration"]
-                elif test_name == "history":
-                    node_data[node]["history"]["ok"] = True
-                    node_data[node]["history"]["count"] = result["count"]
-                    node_data[node]["history"]["time"] = result["total_duration"]
-                elif test_name == "apicall":
-                    node_data[node]["apicall"]["ok"] = True
-                    node_data[node]["apicall"]["time"] = result["total_duration"]
-                    node_data[node]["apicall"]["access_time"] = result["access_time"]
-                elif test_name == "config":
-                    node_data[node]["config"]["ok"] = True
-                    node_data[node]["config"]["time"] = result["total_duration"]
-                    node_data[node]["config"]["access_time"] = result["access_time"]
-                elif test_name == "block_diff":
-                    node_data[node]["block_diff"]["ok"] = True
-                    node_data[node]["block_diff"]["head_delay"] = result.get("head_delay", 0.0)
-                    node_data[node]["block_diff"]["diff_head_irreversible"] = result.get(
-                        "diff_head_irreversible", 0.0
-                    )
-                    node_data[node]["block_diff"]["time"] = result["total_duration"]
-            else:
-                # Store error information for failing nodes
-                error_msg = result.get("error", "")
-                if error_msg and node not in failing_nodes:
-                    failing_nodes[node] = error_msg
-
-    # Determine working nodes (those not in failing_nodes)
-    working_nodes = [node for node in all_nodes if node not in failing_nodes]
-
-    # Import make_sort_key function for rankings
-    from hive_bench.utils import make_sort_key
+            valid_results.append((test_name, result))
+
+    # Report entry of every node, created in the order the nodes first appear
+    node_data = {}
+
+    # Fill in the test data and identify failing nodes
+    for test_name, result in valid_results:
+        node = result["node"]
+        entry = node_data.get(node)
+        if entry is None:
+            entry = node_data[node] = _make_default_node(node)
+
+        if not result["successful"]:
+            # Store error information for failing nodes
+            error_msg = result.get("error", "")
+            if error_msg and node not in failing_nodes:
+                failing_nodes[node] = error_msg
+            continue
+
+        if test_name == "config":
+            # Add version and hive flag from the config test
+            entry["version"] = result.get("version", "0.0.0")
+            entry["hive"] = result.get("is_hive", False)
+
+        fields = _RESULT_FIELDS.get(test_name)
+        if fields is None:
+            continue
+        test_data = entry[test_name]
+        test_data["ok"] = True
+        for key, result_key in fields:
+            test_data[key] = result.get(result_key, test_data[key])
+
+    # Determine working nodes (those not in failing_nodes), as a set for membership checks
+    working_nodes = {node for node in node_data if node not in failing_nodes}
 
     # Calculate rankings for each test
-    for ranking_test in ["block", "history", "apicall", "config", "block_diff"]:
-        # Set reverse order for count-based tests
-        reverse = ranking_test in ["block", "history"]
-
-        # Sort and assign ranks
-        rank = 1
-        for node, data in sorted(
-            node_data.items(), key=make_sort_key(ranking_test), reverse=reverse
-        ):
-            if data[ranking_test]["ok"]:
-                node_data[node][ranking_test]["rank"] = rank
-                rank += 1
+    for ranking_test, (metric, reverse) in RANKING_METRICS.items():
+        # Only nodes that passed the test are ranked, the others keep rank -1
+        ranked = [data[ranking_test] for data in node_data.values() if data[ranking_test]["ok"]]
+        ranked.sort(key=itemgetter(metric), reverse=reverse)
+        for rank, test_data in enumerate(ranked, start=1):
+            test_data["rank"] = rank
 
     # Sort nodes by their config rank to ensure consistent ordering in the report
     # Create a dictionary to map ranks to nodes for precise ordering
@@ -245,8 +287,8 @@ def run_benchmarks(
             "timeout": timeout,
             "threading": threading,
             "hive_nectar_version": hive_nectar_version,
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
+            "start_time": start_time,
+            "end_time": end_time,
             "script_version": __version__,
             "benchmarks": {
                 "block": {"data": ["count"]},
@@ -280,46 +322,35 @@ def main():
     report = run_benchmarks()
 
     # Calculate weighted scores for each node based on real-world importance
-    from hive_bench.utils import calculate_weighted_node_score
+    from hive_bench.utils import calculate_weighted_scores
 
     # First, collect all node data for normalization
     all_node_data = report["report"]
 
     # Calculate weighted scores and add to node data
     node_scores = {}
-    for node_data in all_node_data:
-        weighted_score = calculate_weighted_node_score(node_data, all_node_data)
+    for node_data, weighted_score in zip(all_node_data, calculate_weighted_scores(all_node_data)):
         node_scores[node_data["node"]] = weighted_score
         # Add weighted score to node data for future reference
         node_data["weighted_score"] = round(weighted_score, 2)
 
     # Create a better sorted list of nodes based on weighted scores
+    working_nodes = set(report["nodes"])
     better_sorted_nodes = [
         node
         for node, _ in sorted(node_scores.items(), key=lambda x: x[1], reverse=True)
-        if node in report["nodes"]
+        if node in working_nodes
     ]
 
     # Update the report with the better sorted node list
     report["nodes"] = better_sorted_nodes
 
-    # Re-sort the report data based on the new ordering
-    sorted_report_data = []
-
-    # First add nodes in the better order
-    for node in better_sorted_nodes:
-        for node_data in all_node_data:
-            if node_data["node"] == node:
-                sorted_report_data.append(node_data)
-                break
-
-    # Then add any remaining nodes that weren't in the working nodes list
-    for node_data in all_node_data:
-        if node_data["node"] not in better_sorted_nodes:
-            sorted_report_data.append(node_data)
-
-    # Update the report with the better sorted data
-    report["report"] = sorted_report_data
+    # Re-sort the report data: working nodes in the better order, then any remaining nodes
+    by_node = {node_data["node"]: node_data for node_data in all_node_data}
+    sorted_nodes = set(better_sorted_nodes)
+    report["report"] = [by_node[node] for node in better_sorted_nodes] + [
+        node_data for node_data in all_node_data if node_data["node"] not in sorted_nodes
+    ]
 
     # Add the weighted scoring methodology to the parameters
     report["parameter"]["weighted_scoring"] = {
@@ -333,23 +364,18 @@ def main():
         "description": "Nodes are ordered by a weighted scoring system prioritizing real-world performance factors",
     }
 
-    # Store benchmark data in the database
-    store_benchmark_data_in_db(report)
-
-    # Save the report to a JSON file
-    import json
-    import os
-    from pathlib import Path
-
-    # Get the absolute path to the project root directory
-    current_file = Path(__file__).resolve()
-    project_root = current_file.parent.parent.parent
-
-    # Define the output file path
-    output_file = os.path.join(project_root, "hive_benchmark_results.json")
-
-    with open(output_file, "w") as f:
-        json.dump(report, f, indent=2)
+    # Save the report to a JSON file in the project root. Neither step changes the
+    # report, so the file is written in the background while the database is updated.
+    output_file = get_project_root() / "hive_benchmark_results.json"
+    writer = threading.Thread(
+        target=_write_report, args=(output_file, report), name="report-writer"
+    )
+    writer.start()
+    try:
+        # Store benchmark data in the database
+        store_benchmark_data_in_db(report)
+    finally:
+        writer.join()
 
     logging.info(f"Results saved to {output_file}")
 
@@ -361,52 +387,8 @@ def main():
     print("Results have been stored in the database and saved to benchmark_results.json.")
     print("\nTop 3 nodes by performance using weighted real-world scoring:")
 
-    # Calculate weighted scores for each node based on real-world importance
-    from hive_bench.utils import calculate_weighted_node_score
-
-    # First, collect all node data for normalization
-    all_node_data = report["report"]
-
-    # Calculate weighted scores
-    node_scores = {}
-    for node_data in all_node_data:
-        weighted_score = calculate_weighted_node_score(node_data, all_node_data)
-        node_scores[node_data["node"]] = weighted_score
-
-    # Create a better sorted list of nodes based on weighted scores
-    better_sorted_nodes = [
-        node
-        for node, _ in sorted(node_scores.items(), key=lambda x: x[1], reverse=True)
-        if node in report["nodes"]
-    ]
-
-    # Update the report with the better sorted node list
-    report["nodes"] = better_sorted_nodes
-
-    # Re-sort the report data based on the new ordering
-    sorted_report_data = []
-
-    # First add nodes in the better order
-    for node in better_sorted_nodes:
-        for node_data in all_node_data:
-            if node_data["node"] == node:
-                sorted_report_data.append(node_data)
-                break
-
-    # Then add any remaining nodes that weren't in the working nodes list
-    for node_data in all_node_data:
-        if node_data["node"] not in better_sorted_nodes:
-            sorted_report_data.append(node_data)
-
-    # Update the report with the better sorted data
-    report["report"] = sorted_report_data
-
     # Print top 3 nodes with new scoring system
-    for i, (node, score) in enumerate(
-        sorted(node_scores.items(), key=lambda x: x[1], reverse=True)[:3]
-        if len(node_scores) >= 3
-        else sorted(node_scores.items(), key=lambda x: x[1], reverse=True)
-    ):
+    for i, (node, score) in enumerate(heapq.nlargest(3, node_scores.items(), key=lambda x: x[1])):
         print(f"{i + 1}. {node} (weighted score: {score:.2f})")
 
 
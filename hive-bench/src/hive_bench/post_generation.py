@@ -2,14 +2,115 @@
 
 import json
 import logging
+import math
 import os
-import sqlite3
-import statistics
 from datetime import datetime, timedelta
 
+from hive_bench.database import connect_readonly
+
 # Reuse the format_float from utils
 from hive_bench.utils import format_float
 
+# Test types reported on, in the order their sections appear
+TEST_TYPES = ("block", "history", "apicall", "config", "block_diff")
+
+# Shared read-only stand-in for a missing test result
+_EMPTY = {}
+
+# Report fields filled from a successful stored test result, per test type
+_RESULT_FIELDS = {
+    "block": ("count", "time", "rank"),
+    "history": ("count", "time", "rank"),
+    "apicall": ("time", "access_time", "rank"),
+    "config": ("time", "access_time", "rank"),
+    "block_diff": ("head_delay", "diff_head_irreversible", "time", "rank"),
+}
+
+# Indicator shown in the trends table for each trend returned by _trend_from_data
+_TREND_EMOJI = {
+    "improving": "&nearr;  improving",
+    "worsening": "&searr; worsening",
+    "failing": "&cross; failing",
+    "stable": "&check; stable",
+}
+
+# Uptime of every node within the report window. The LEFT JOIN keeps nodes without any run
+# in the window (likely consistently failing nodes) with zero runs.
+_UPTIME_SQL = """
+SELECT n.url as url,
+    SUM(ws.is_working) as up_count,
+    COUNT(ws.node_id) as total_count
+FROM nodes n
+LEFT JOIN (
+    SELECT ns.node_id, ns.is_working
+    FROM node_status ns
+    JOIN benchmark_runs br ON ns.run_id = br.run_id
+    WHERE br.timestamp > ?
+) ws ON ws.node_id = n.node_id
+GROUP BY n.url
+"""
+
+# Rank history of every node and test within the report window, aggregated in SQL. The
+# window picks each series' first and last rank by timestamp, the sums give the average
+# rank and the spread. Nodes that failed at least once within the window get a row with
+# zero runs for each test they have no ranks for, and every row flags whether its node
+# failed. Bound to TEST_TYPES followed by the window threshold twice. Nodes come in the
+# order they first appear when walking the tests in TEST_TYPES order and each test's
+# results by timestamp, then nodes with only failures by URL.
+# Each node's rows come in TEST_TYPES order. The report tables keep this order for ties.
+_RANK_HISTORY_SQL = f"""
+WITH test_types (test_type, ordinal) AS (
+    VALUES {", ".join(f"(?, {ordinal})" for ordinal in range(len(TEST_TYPES)))}
+),
+history AS (
+    SELECT n.url as url, tr.test_type as test_type, tt.ordinal as ordinal,
+        tr.rank as rank, br.timestamp as timestamp,
+        FIRST_VALUE(tr.rank) OVER series as first_rank,
+        LAST_VALUE(tr.rank) OVER series as last_rank,
+        ROW_NUMBER() OVER (ORDER BY tt.ordinal, br.timestamp, tr.node_id) as seq
+    FROM test_results tr
+    JOIN test_types tt ON tr.test_type = tt.test_type
+    JOIN nodes n ON tr.node_id = n.node_id
+    JOIN benchmark_runs br ON tr.run_id = br.run_id
+    WHERE br.timestamp > ?
+    WINDOW series AS (
+        PARTITION BY tr.node_id, tr.test_type
+        ORDER BY br.timestamp, tr.result_id
+        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+    )
+),
+ranked AS (
+    SELECT url, test_type, COUNT(*) as runs, SUM(rank) as rank_sum,
+        SUM(rank * rank) as rank_sq_sum, MIN(first_rank) as first_rank,
+        MIN(last_rank) as last_rank, MIN(timestamp) as timestamp,
+        MIN(ordinal) as ordinal, MIN(seq) as seq,
+        MIN(MIN(seq)) OVER (PARTITION BY url) as node_seq
+    FROM history
+    GROUP BY url, test_type
+),
+failing AS (
+    SELECT DISTINCT n.url as url
+    FROM nodes n
+    JOIN node_status ns ON n.node_id = ns.node_id
+    JOIN benchmark_runs br ON ns.run_id = br.run_id
+    WHERE br.timestamp > ? AND ns.is_working = 0
+),
+combined AS (
+    SELECT r.*, r.url IN (SELECT url FROM failing) as failing
+    FROM ranked r
+    UNION ALL
+    SELECT f.url, tt.test_type, 0, NULL, NULL, NULL, NULL, NULL, tt.ordinal, NULL,
+        (SELECT MIN(r.node_seq) FROM ranked r WHERE r.url = f.url), 1
+    FROM failing f
+    CROSS JOIN test_types tt
+    WHERE NOT EXISTS (
+        SELECT 1 FROM ranked r WHERE r.url = f.url AND r.test_type = tt.test_type
+    )
+)
+SELECT * FROM combined
+ORDER BY node_seq IS NULL, node_seq, url, ordinal
+"""
+
 
 def get_historical_data(db_path, days=7):
     """Get historical data from SQLite database for report generation.
@@ -28,417 +129,422 @@ def get_historical_data(db_path, days=7):
              "uptime": {node_url: {"success": count, "total": count}}
             }
     """
+    conn = connect_readonly(db_path)
+    try:
+        return _read_historical_data(conn, days)
+    finally:
+        conn.close()
+
+
+def _read_historical_data(conn, days):
+    """Read the historical data of the report window over an open connection.
+
+    Args:
+        conn (sqlite3.Connection): Read-only connection to the benchmark database.
+        days (int): Number of days of history to retrieve.
+
+    Returns:
+        dict: Historical data as returned by get_historical_data.
+    """
     # Initialize return dict
     historical_data = {"trends": {}, "consistency": {}, "uptime": {}}
 
-    # Connect to database
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
     # Calculate timestamp threshold (days ago from now)
-    threshold = (
-        datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-        if days <= 0
-        else (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
-    )
+    now = datetime.now()
+    threshold = (now if days <= 0 else now - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
 
     # For a single day of data, include all data in the database to have more data points
     if days <= 1:
         # Count how many benchmark runs we have
-        cursor.execute("SELECT COUNT(*) FROM benchmark_runs")
-        count = cursor.fetchone()[0]
+        count = conn.execute("SELECT COUNT(*) FROM benchmark_runs").fetchone()[0]
 
         if count <= 3:  # If we have very limited data, use all of it
             threshold = "0000-01-01T00:00:00"  # A date far in the past
 
     # Collect node uptime statistics
     node_uptime = {}
-    cursor.execute(
-        """
-        SELECT n.url as url,
-            COUNT(CASE WHEN ns.is_working = 1 THEN 1 END) as up_count,
-            COUNT(*) as total_count
-        FROM nodes n
-        JOIN node_status ns ON n.node_id = ns.node_id
-        JOIN benchmark_runs br ON ns.run_id = br.run_id
-        WHERE br.timestamp > ?
-        GROUP BY n.url
-        """,
-        (threshold,),
-    )
-
-    for row in cursor.fetchall():
+    for row in conn.execute(_UPTIME_SQL, (threshold,)):
+        total_count = row["total_count"]
         node_uptime[row["url"]] = {
-            "uptime_percent": format_float((row["up_count"] / row["total_count"]) * 100)
-            if row["total_count"] > 0
+            "uptime_percent": format_float((row["up_count"] / total_count) * 100)
+            if total_count > 0
             else 0,
-            "total_runs": row["total_count"],
+            "total_runs": total_count,  # Zero runs means it was never tested successfully
         }
 
-    # Get a list of all nodes (including those that never worked)
-    cursor.execute("""SELECT url as url FROM nodes""")
-    all_nodes = [row["url"] for row in cursor.fetchall()]
-
-    # Add nodes that don't have any records in the uptime data
-    # These are likely consistently failing nodes
-    for node_url in all_nodes:
-        if node_url not in node_uptime:
-            node_uptime[node_url] = {
-                "uptime_percent": 0,
-                "total_runs": 0,  # Zero runs means it was never tested successfully
+    # Collect the aggregated rank history of every node and test, failing nodes included
+    node_trends = {}
+    node_consistency = {}
+    # Position of each node's first series with a rank spread
+    spread_order = {}
+    params = (*TEST_TYPES, threshold, threshold)
+    for row in conn.execute(_RANK_HISTORY_SQL, params):
+        tests = node_trends.setdefault(row["url"], {})
+        runs = row["runs"]
+        if not runs:
+            # Mark failing nodes as 'failing' instead of 'stable'
+            tests[row["test_type"]] = {
+                "first_rank": 0,
+                "last_rank": 0,
+                "avg_rank": 0,
+                "trend": "failing",
+                "change": 0,
             }
+            node_consistency.setdefault(row["url"], {})[row["test_type"]] = 0.0
+            continue
+
+        first_rank = row["first_rank"]
+        if runs < 2:
+            # A single run has no trend, keep its lone data point
+            tests[row["test_type"]] = [{"rank": first_rank, "timestamp": row["timestamp"]}]
+            if row["failing"]:
+                node_consistency.setdefault(row["url"], {})[row["test_type"]] = 0.0
+            continue
+
+        last_rank = row["last_rank"]
+        rank_sum = row["rank_sum"]
+
+        # Determine trend direction
+        if last_rank < first_rank:
+            trend = "improving"  # Lower rank is better
+        elif last_rank > first_rank:
+            trend = "degrading"
+        else:
+            trend = "stable"
+
+        # Add trend data
+        tests[row["test_type"]] = {
+            "first_rank": first_rank,
+            "last_rank": last_rank,
+            "avg_rank": format_float(rank_sum / runs),
+            "trend": trend,
+            "change": first_rank - last_rank,  # Positive means improvement
+        }
 
-    # Collect node performance trends
-    node_trends = {}
-    for test_type in ["block", "history", "apicall", "config", "block_diff"]:
-        cursor.execute(
-            """
-            SELECT n.url as url, tr.test_type as test_type, tr.rank,
-                br.timestamp
-            FROM test_results tr
-            JOIN nodes n ON tr.node_id = n.node_id
-            JOIN benchmark_runs br ON tr.run_id = br.run_id
-            WHERE tr.test_type = ? AND br.timestamp > ?
-            ORDER BY br.timestamp
-            """,
-            (test_type, threshold),
+        # Consistency is the sample standard deviation of the ranks (lower is steadier)
+        variance = (runs * row["rank_sq_sum"] - rank_sum * rank_sum) / (runs * (runs - 1))
+        node_consistency.setdefault(row["url"], {})[row["test_type"]] = format_float(
+            math.sqrt(variance)
         )
+        spread_order.setdefault(row["url"], row["seq"])
+
+    def consistency_order(url):
+        # Nodes with a rank spread come first, by their first such series, then failing nodes
+        # by URL. The consistency table keeps this order for ties.
+        if url in spread_order:
+            return (0, spread_order[url], url)
+        return (1, 0, url)
+
+    node_consistency = {
+        url: node_consistency[url] for url in sorted(node_consistency, key=consistency_order)
+    }
+
+    historical_data["trends"] = node_trends
+    historical_data["consistency"] = node_consistency
+    historical_data["uptime"] = node_uptime
+    return historical_data
 
-        results = cursor.fetchall()
 
-        for row in results:
-            if row["url"] not in node_trends:
-                node_trends[row["url"]] = {}
+def get_latest_benchmark_data(db_path="benchmark_history.db"):
+    """Get the latest benchmark data from the SQLite database. STRUCTURALLY IDENTICAL TO ENGINE-BENCH.
 
-            if test_type not in node_trends[row["url"]]:
-                node_trends[row["url"]][test_type] = []
+    Args:
+        db_path (str): Path to the SQLite database file.
 
-            node_trends[row["url"]][test_type].append(
-                {"rank": row["rank"], "timestamp": row["timestamp"]}
-            )
+    Returns:
+        dict: A dictionary containing benchmark data with the same structure as
+            that produced by run_benchmarks() and saved in benchmark_results.json
+    """
+    import sqlite3
 
-    # Add failing nodes to the trends data
-    cursor.execute(
-        """
-        SELECT DISTINCT n.url as url
-        FROM nodes n
-        JOIN node_status ns ON n.node_id = ns.node_id
-        JOIN benchmark_runs br ON ns.run_id = br.run_id
-        WHERE br.timestamp > ? AND ns.is_working = 0
-        """,
-        (threshold,),
-    )
+    # Initialize the database if it doesn't exist
+    if not os.path.exists(db_path):
+        logging.error(f"Database {db_path} does not exist.")
+        return None
 
-    failing_nodes = [row["url"] for row in cursor.fetchall()]
+    try:
+        conn = connect_readonly(db_path)
+        return _read_latest_benchmark_data(conn)
+    except sqlite3.Error as e:
+        logging.error(f"Database error: {str(e)}")
+        return None
+    except Exception as e:
+        logging.error(f"Unexpected error retrieving benchmark data: {str(e)}")
+        return None
+    finally:
+        if "conn" in locals() and conn:
+            conn.close()
 
-    # Calculate trend indicators
-    for node, tests in node_trends.items():
-        for test_type, results in tests.items():
-            if len(results) < 2:
-                continue
 
-            # Skip if already processed
-            if not isinstance(results, list):
-                continue
+def _read_latest_benchmark_data(conn):
+    """Read the latest benchmark run over an open connection.
 
-            # Sort by timestamp
-            sorted_results = sorted(results, key=lambda x: x["timestamp"])
+    Args:
+        conn (sqlite3.Connection): Read-only connection to the benchmark database.
 
-            # Get first and last rank
-            first_rank = sorted_results[0]["rank"]
-            last_rank = sorted_results[-1]["rank"]
+    Returns:
+        dict: Benchmark data as returned by get_latest_benchmark_data, or None when the
+            database holds no runs.
+    """
+    from nectar import __version__ as hive_nectar_version
 
-            # Calculate average rank
-            ranks = [r["rank"] for r in sorted_results]
-            avg_rank = format_float(sum(ranks) / len(ranks))
+    from hive_bench import __version__
 
-            # Determine trend direction
-            if last_rank < first_rank:
-                trend = "improving"  # Lower rank is better
-            elif last_rank > first_rank:
-                trend = "degrading"
-            else:
-                trend = "stable"
-
-            # Add trend data
-            node_trends[node][test_type] = {
-                "first_rank": first_rank,
-                "last_rank": last_rank,
-                "avg_rank": avg_rank,
-                "trend": trend,
-                "change": first_rank - last_rank,  # Positive means improvement
-            }
+    cursor = conn.cursor()
 
-    # Handle failing nodes separately
-    for node_url in failing_nodes:
-        if node_url not in node_trends:
-            node_trends[node_url] = {}
-
-        # Mark failing nodes as 'failing' instead of 'stable'
-        for test_type in ["block", "history", "apicall", "config", "block_diff"]:
-            if test_type not in node_trends[node_url]:
-                node_trends[node_url][test_type] = {
-                    "first_rank": 0,
-                    "last_rank": 0,
-                    "avg_rank": 0,
-                    "trend": "failing",  # Changed from 'stable' to 'failing'
-                    "change": 0,
-                }
-
-    # Get consistency metrics (standard deviation of ranks)
-    node_consistency = {}
-    for test_type in ["block", "history", "apicall", "config", "block_diff"]:
-        cursor.execute(
-            """
-            SELECT n.url as url, tr.test_type as test_type, tr.rank
-            FROM test_results tr
-            JOIN nodes n ON tr.node_id = n.node_id
-            JOIN benchmark_runs br ON tr.run_id = br.run_id
-            WHERE tr.test_type = ? AND br.timestamp > ?
-            ORDER BY br.timestamp
-            """,
-            (test_type, threshold),
-        )
+    # Get the latest benchmark run
+    cursor.execute(
+        """SELECT run_id, timestamp, test_parameters FROM benchmark_runs
+           ORDER BY timestamp DESC LIMIT 1"""
+    )
+    latest_run = cursor.fetchone()
 
-        results = cursor.fetchall()
+    if not latest_run:
+        logging.error("No benchmark runs found in the database.")
+        return None
 
-        # Group by node
-        node_ranks = {}
-        for row in results:
-            if row["url"] not in node_ranks:
-                node_ranks[row["url"]] = []
-            node_ranks[row["url"]].append(row["rank"])
+    run_id = latest_run["run_id"]
+    timestamp = latest_run["timestamp"]
+    test_parameters = (
+        json.loads(latest_run["test_parameters"]) if latest_run["test_parameters"] else {}
+    )
 
-        # Calculate consistency (lower std dev means more consistent)
-        for node, ranks in node_ranks.items():
-            if len(ranks) < 2:
-                continue
+    # Get all nodes for this run
+    cursor.execute(
+        """SELECT n.node_id, n.url, ns.is_working, ns.error_message, ns.version, ns.is_hive
+           FROM node_status ns
+           JOIN nodes n ON ns.node_id = n.node_id
+           WHERE ns.run_id = ?""",
+        (run_id,),
+    )
 
-            if node not in node_consistency:
-                node_consistency[node] = {}
+    # Prepare the result data structures
+    working_nodes = []
+    failing_nodes = {}
+    node_data = {}
+    # Node versions reported in this run, applied with the config results
+    versions = {}
+
+    for status in cursor:
+        node_url = status["url"]
+        versions[status["node_id"]] = status["version"]
+
+        if status["is_working"]:
+            working_nodes.append(node_url)
+
+            # Create node data structure
+            node_data[node_url] = {
+                "node": node_url,
+                "version": "0.0.0",
+                "hive": status["is_hive"] == 1,
+                "block": {"ok": False, "count": 0, "time": 0, "rank": -1},
+                "history": {"ok": False, "count": 0, "time": 0, "rank": -1},
+                "apicall": {
+                    "ok": False,
+                    "time": 0,
+                    "access_time": 30.0,
+                    "rank": -1,
+                },
+                "config": {"ok": False, "time": 0, "access_time": 0, "rank": -1},
+                "block_diff": {
+                    "ok": False,
+                    "head_delay": 0.0,
+                    "diff_head_irreversible": 0.0,
+                    "time": 0,
+                    "rank": -1,
+                },
+            }
+        else:
+            failing_nodes[node_url] = status["error_message"]
 
-            try:
-                std_dev = statistics.stdev(ranks)
-                node_consistency[node][test_type] = format_float(std_dev)
-            except statistics.StatisticsError:
-                # Handle case where all values are identical
-                node_consistency[node][test_type] = 0.0
+    # Get test results for all working nodes
+    cursor.execute(
+        """SELECT tr.result_id, tr.node_id, tr.test_type, tr.is_ok, tr.rank,
+                  tr.time, tr.count, tr.access_time, tr.head_delay, tr.diff_head_irreversible,
+                  n.url
+           FROM test_results tr
+           JOIN nodes n ON tr.node_id = n.node_id
+           WHERE tr.run_id = ?""",
+        (run_id,),
+    )
 
-    # Add failing nodes to consistency data with value 0
-    for node_url in failing_nodes:
-        if node_url not in node_consistency:
-            node_consistency[node_url] = {}
+    # Process test results as they are read
+    for result in cursor:
+        node_url = result["url"]
+        test_type = result["test_type"]
+
+        if node_url not in node_data:
+            continue  # Skip if node is not among working nodes
+
+        if test_type == "config" and result["node_id"] in versions:
+            # Get version from the node statuses already read
+            node_data[node_url]["version"] = versions[result["node_id"]]
+
+        # Update test data in node_data
+        fields = _RESULT_FIELDS.get(test_type)
+        if result["is_ok"] and fields is not None:
+            test_data = node_data[node_url][test_type]
+            test_data["ok"] = True
+            for field in fields:
+                test_data[field] = result[field]
+
+    # Get start and end time
+    start_time = test_parameters.get("start_time", timestamp)
+    end_time = test_parameters.get("end_time", timestamp)
+
+    # Build the final report structure - exactly matching engine-bench's structure
+    report_data = {
+        "timestamp": timestamp,
+        "parameter": {
+            "num_retries": test_parameters.get("num_retries", 3),
+            "num_retries_call": test_parameters.get("num_retries_call", 3),
+            "timeout": test_parameters.get("timeout", 30),
+            "threading": test_parameters.get("threading", True),
+            "start_time": start_time,
+            "end_time": end_time,
+            "timestamp": timestamp,
+            "hive_nectar_version": hive_nectar_version,
+            "script_version": __version__,
+            "benchmarks": {
+                "block": {"data": ["count"]},
+                "history": {"data": ["count"]},
+                "apicall": {"data": ["access_time"]},
+                "config": {"data": ["access_time"]},
+                "block_diff": {"data": ["diff_head_irreversible", "head_delay"]},
+            },
+        },
+        "nodes": working_nodes,
+        "failing_nodes": failing_nodes,
+        "report": list(node_data.values()),
+    }
 
-        for test_type in ["block", "history", "apicall", "config", "block_diff"]:
-            if test_type not in node_consistency[node_url]:
-                node_consistency[node_url][test_type] = 0.0
+    # Add logging to debug data structure
+    logging.info(f"get_latest_benchmark_data: Returning data with timestamp {timestamp}")
+    logging.info(
+        f"get_latest_benchmark_data: nodes count: {len(working_nodes)}, failing nodes: {len(failing_nodes)}"
+    )
 
-    conn.close()
+    return report_data
 
-    historical_data["trends"] = node_trends
-    historical_data["consistency"] = node_consistency
-    historical_data["uptime"] = node_uptime
-    return historical_data
 
+def get_report_data(db_path="benchmark_history.db", days=7):
+    """Get the latest benchmark data and the historical data over one connection.
 
-def get_latest_benchmark_data(db_path="benchmark_history.db"):
-    """Get the latest benchmark data from the SQLite database. STRUCTURALLY IDENTICAL TO ENGINE-BENCH.
+    Both reads run in a single read transaction, so they see the same state of the
+    database even while a new run is being stored.
 
     Args:
         db_path (str): Path to the SQLite database file.
+        days (int, optional): Number of days of history to retrieve. Defaults to 7.
 
     Returns:
-        dict: A dictionary containing benchmark data with the same structure as
-            that produced by run_benchmarks() and saved in benchmark_results.json
+        tuple: A tuple containing (benchmark_data, historical_data). Either one is None
+            when it could not be read.
     """
-    import sqlite3
-
-    from nectar import __version__ as hive_nectar_version
-
-    from hive_bench import __version__
-
-    # Initialize the database if it doesn't exist
     if not os.path.exists(db_path):
         logging.error(f"Database {db_path} does not exist.")
-        return None
+        return None, None
 
+    conn = connect_readonly(db_path)
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        cursor = conn.cursor()
-
-        # Get the latest benchmark run
-        cursor.execute(
-            """SELECT run_id, timestamp, test_parameters FROM benchmark_runs
-               ORDER BY timestamp DESC LIMIT 1"""
-        )
-        latest_run = cursor.fetchone()
+        conn.execute("BEGIN")
+        try:
+            benchmark_data = _read_latest_benchmark_data(conn)
+        except Exception as e:
+            logging.error(f"Unexpected error retrieving benchmark data: {str(e)}")
+            benchmark_data = None
 
-        if not latest_run:
-            logging.error("No benchmark runs found in the database.")
-            return None
+        logging.info(f"Retrieving historical data for the past {days} days")
+        try:
+            historical_data = _read_historical_data(conn, days)
+        except Exception as e:
+            logging.error(f"Database error while retrieving historical data: {e}")
+            historical_data = None
+    finally:
+        conn.close()
 
-        run_id = latest_run["run_id"]
-        timestamp = latest_run["timestamp"]
-        test_parameters = (
-            json.loads(latest_run["test_parameters"]) if latest_run["test_parameters"] else {}
-        )
+    return benchmark_data, historical_data
 
-        # Get all nodes for this run
-        cursor.execute(
-            """SELECT n.node_id, n.url, ns.is_working, ns.error_message, ns.is_hive
-               FROM node_status ns
-               JOIN nodes n ON ns.node_id = n.node_id
-               WHERE ns.run_id = ?""",
-            (run_id,),
-        )
-        node_statuses = cursor.fetchall()
-
-        # Prepare the result data structures
-        working_nodes = []
-        failing_nodes = {}
-        node_data = {}
-
-        for status in node_statuses:
-            node_url = status["url"]
-
-            if status["is_working"]:
-                working_nodes.append(node_url)
-
-                # Create node data structure
-                node_data[node_url] = {
-                    "node": node_url,
-                    "version": "0.0.0",
-                    "hive": status["is_hive"] == 1,
-                    "block": {"ok": False, "count": 0, "time": 0, "rank": -1},
-                    "history": {"ok": False, "count": 0, "time": 0, "rank": -1},
-                    "apicall": {
-                        "ok": False,
-                        "time": 0,
-                        "access_time": 30.0,
-                        "rank": -1,
-                    },
-                    "config": {"ok": False, "time": 0, "access_time": 0, "rank": -1},
-                    "block_diff": {
-                        "ok": False,
-                        "head_delay": 0.0,
-                        "diff_head_irreversible": 0.0,
-                        "time": 0,
-                        "rank": -1,
-                    },
-                }
-            else:
-                failing_nodes[node_url] = status["error_message"]
-
-        # Get test results for all working nodes
-        cursor.execute(
-            """SELECT tr.result_id, tr.node_id, tr.test_type, tr.is_ok, tr.rank,
-                      tr.time, tr.count, tr.access_time, tr.head_delay, tr.diff_head_irreversible,
-                      n.url
-               FROM test_results tr
-               JOIN nodes n ON tr.node_id = n.node_id
-               WHERE tr.run_id = ?""",
-            (run_id,),
-        )
-        test_results = cursor.fetchall()
-
-        # Process test results
-        for result in test_results:
-            node_url = result["url"]
-            test_type = result["test_type"]
-
-            if node_url not in node_data:
-                continue  # Skip if node is not among working nodes
-
-            if test_type == "config":
-                # Get version from the database
-                cursor.execute(
-                    """SELECT version FROM node_status
-                       WHERE node_id = ? AND run_id = ? LIMIT 1""",
-                    (result["node_id"], run_id),
-                )
-                config_data = cursor.fetchone()
-                if config_data:
-                    node_data[node_url]["version"] = config_data["version"]
-
-            # Update test data in node_data
-            if result["is_ok"]:
-                if test_type == "block":
-                    node_data[node_url]["block"]["ok"] = True
-                    node_data[node_url]["block"]["count"] = result["count"]
-                    node_data[node_url]["block"]["time"] = result["time"]
-                    node_data[node_url]["block"]["rank"] = result["rank"]
-                elif test_type == "history":
-                    node_data[node_url]["history"]["ok"] = True
-                    node_data[node_url]["history"]["count"] = result["count"]
-                    node_data[node_url]["history"]["time"] = result["time"]
-                    node_data[node_url]["history"]["rank"] = result["rank"]
-                elif test_type == "apicall":
-                    node_data[node_url]["apicall"]["ok"] = True
-                    node_data[node_url]["apicall"]["time"] = result["time"]
-                    node_data[node_url]["apicall"]["access_time"] = result["access_time"]
-                    node_data[node_url]["apicall"]["rank"] = result["rank"]
-                elif test_type == "config":
-                    node_data[node_url]["config"]["ok"] = True
-                    node_data[node_url]["config"]["time"] = result["time"]
-                    node_data[node_url]["config"]["access_time"] = result["access_time"]
-                    node_data[node_url]["config"]["rank"] = result["rank"]
-                elif test_type == "block_diff":
-                    node_data[node_url]["block_diff"]["ok"] = True
-                    node_data[node_url]["block_diff"]["head_delay"] = result["head_delay"]
-                    node_data[node_url]["block_diff"]["diff_head_irreversible"] = result[
-                        "diff_head_irreversible"
-                    ]
-                    node_data[node_url]["block_diff"]["time"] = result["time"]
-                    node_data[node_url]["block_diff"]["rank"] = result["rank"]
-
-        # Get start and end time
-        start_time = test_parameters.get("start_time", timestamp)
-        end_time = test_parameters.get("end_time", timestamp)
-
-        # Build the final report structure - exactly matching engine-bench's structure
-        report_data = {
-            "timestamp": timestamp,
-            "parameter": {
-                "num_retries": test_parameters.get("num_retries", 3),
-                "num_retries_call": test_parameters.get("num_retries_call", 3),
-                "timeout": test_parameters.get("timeout", 30),
-                "threading": test_parameters.get("threading", True),
-                "start_time": start_time,
-                "end_time": end_time,
-                "timestamp": timestamp,
-                "hive_nectar_version": hive_nectar_version,
-                "script_version": __version__,
-                "benchmarks": {
-                    "block": {"data": ["count"]},
-                    "history": {"data": ["count"]},
-                    "apicall": {"data": ["access_time"]},
-                    "config": {"data": ["access_time"]},
-                    "block_diff": {"data": ["diff_head_irreversible", "head_delay"]},
-                },
-            },
-            "nodes": working_nodes,
-            "failing_nodes": failing_nodes,
-            "report": list(node_data.values()),
-        }
 
-        # Add logging to debug data structure
-        logging.info(f"get_latest_benchmark_data: Returning data with timestamp {timestamp}")
-        logging.info(
-            f"get_latest_benchmark_data: nodes count: {len(working_nodes)}, failing nodes: {len(failing_nodes)}"
-        )
+def _trend_from_data(node_url, test_type, node_trends):
+    """Get the trend of one test from a node's historical trend data.
 
-        return report_data
-    except sqlite3.Error as e:
-        logging.error(f"Database error: {str(e)}")
-        return None
+    Args:
+        node_url (str): URL of the node, used in log messages
+        test_type (str): Test type to get the trend for
+        node_trends (dict): The node's entry in the historical "trends" data
+
+    Returns:
+        str: "improving", "worsening", "stable" or "failing", or "n/a" without enough data
+    """
+    try:
+        test_trend = node_trends.get(test_type)
+
+        # First, check if we have direct trend data calculated by get_historical_data
+        if isinstance(test_trend, dict) and "trend" in test_trend:
+            return test_trend["trend"]
+
+        # If we don't have calculated trends, check if we have raw data to calculate it
+        if isinstance(test_trend, list):
+            if len(test_trend) < 2:
+                return "n/a"
+
+            # Safely extract ranks, handling both dictionaries and other data types
+            ranks = []
+            timestamps = []
+            for entry in test_trend:
+                if isinstance(entry, dict):
+                    rank = entry.get("rank")
+                    timestamp = entry.get("timestamp")
+                    if rank is not None:
+                        ranks.append(rank)
+                        if timestamp:
+                            timestamps.append(timestamp)
+                elif isinstance(entry, (int, float)):
+                    ranks.append(entry)
+
+            # Need at least 2 valid ranks to calculate a trend
+            if len(ranks) < 2:
+                return "n/a"
+
+            # Sort by timestamp if available
+            if timestamps and len(timestamps) == len(ranks):
+                # Create pairs and sort by timestamp
+                pairs = sorted(zip(timestamps, ranks), key=lambda x: x[0])
+                ranks = [r for _, r in pairs]
+
+            # Simple trend detection - compare last rank with first rank
+            if ranks[-1] < ranks[0]:  # Lower rank is better
+                return "improving"
+            elif ranks[-1] > ranks[0]:
+                return "worsening"
+            else:
+                return "stable"
+
+        # Otherwise, we don't have trend data for this node/test_type
+        return "n/a"
     except Exception as e:
-        logging.error(f"Unexpected error retrieving benchmark data: {str(e)}")
-        return None
-    finally:
-        if "conn" in locals() and conn:
-            conn.close()
+        logging.warning(f"Error calculating trend for {node_url}, {test_type}: {e}")
+        return "n/a"
+
+
+def _emit_table(markdown, title, intro, columns, rows):
+    """Append a titled markdown table section to the report lines.
+
+    Args:
+        markdown (list): Report lines to append to
+        title (str): Section heading
+        intro (str): Paragraph shown above the table
+        columns (tuple): Column headers
+        rows (iterable): Table rows, each a sequence of cell values
+    """
+    markdown.append(f"## {title}\n")
+    markdown.append(f"{intro}\n")
+    # The table goes in as one joined block rather than one list entry per row
+    table = [f"| {' | '.join(columns)} |", f"| {' | '.join(['---'] * len(columns))} |"]
+    table.extend(f"| {' | '.join(map(str, row))} |" for row in rows)
+    markdown.append("\n".join(table))
+    markdown.append("\n")
 
 
 def generate_markdown(benchmark_data, output_file=None, historical_data=None, days=7):
@@ -460,8 +566,9 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
             - metadata (dict): Metadata about the generated content
     """
     # Extract timestamp and parameters from data (like engine-bench) or use current time
-    timestamp = benchmark_data.get("timestamp", datetime.now().isoformat())
-    formatted_date = datetime.fromisoformat(timestamp).strftime("%d/%m/%Y")
+    now = datetime.now()
+    timestamp = benchmark_data.get("timestamp")
+    formatted_date = (datetime.fromisoformat(timestamp) if timestamp else now).strftime("%d/%m/%Y")
     params = benchmark_data.get("parameter", {})
 
     # Create markdown content list
@@ -469,7 +576,7 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
 
     # Header (standardized)
     markdown.append(f"# Full Hive API Node Update - ({formatted_date})\n")
-    current_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    current_time = now.strftime("%Y-%m-%dT%H:%M:%S")
     markdown.append(f"{current_time} (UTC)")
     markdown.append(
         "**Benchmarks are performed from a Digital Ocean Droplet in Frankfurt, Germany. Results may vary based on geographic location.**\n"
@@ -482,43 +589,46 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
     )
 
     # Failing nodes section (standardized)
-    markdown.append("## List of failing nodes\n")
-    markdown.append(
-        "This table includes a list of all nodes which were not able to answer to a `get_config` API call within the specified timeout (default: 60 seconds).\n"
-    )
-    markdown.append("|node | error |")
-    markdown.append("| --- | --- |")
-
     failing_nodes = benchmark_data.get("failing_nodes", {})
-    for node, error in failing_nodes.items():
-        markdown.append(f"| <{node}> | {error} |")
-
-    markdown.append("\n")
-
-    # Working nodes section (standardized)
-    markdown.append("## List of working nodes (At least once)\n")
-    markdown.append(
-        "This table includes all nodes which were able to answer a `get_config` call within the timeout (default: 60 seconds). The achieved mean duration values are shown. The returned version is also shown.\n"
+    _emit_table(
+        markdown,
+        "List of failing nodes",
+        "This table includes a list of all nodes which were not able to answer to a `get_config` API call within the specified timeout (default: 60 seconds).",
+        ("node", "error"),
+        ((f"<{node}>", error) for node, error in failing_nodes.items()),
     )
-    markdown.append("|node |  mean time [s] | version  |")
-    markdown.append("| --- | --- | ---  |")
 
     # Process report data
     report = benchmark_data.get("report", [])
 
+    # Split out the nodes that passed each test in one pass over the report
+    passed = {test_type: [] for test_type in TEST_TYPES}
+    for node_data in report:
+        for test_type in TEST_TYPES:
+            if node_data.get(test_type, _EMPTY).get("ok", False):
+                passed[test_type].append(node_data)
+
     # Sort nodes by config time (ascending)
     config_sorted_nodes = sorted(
-        [node for node in report if node.get("config", {}).get("ok", False)],
+        passed["config"],
         key=lambda x: x["config"]["access_time"],
     )
 
-    for node_data in config_sorted_nodes:
-        node = node_data["node"]
-        version = node_data.get("version", "unknown")
-        config_time = format_float(node_data["config"]["access_time"])
-        markdown.append(f"| <{node}> | {config_time} | {version} |")
-
-    markdown.append("\n")
+    # Working nodes section (standardized)
+    _emit_table(
+        markdown,
+        "List of working nodes (At least once)",
+        "This table includes all nodes which were able to answer a `get_config` call within the timeout (default: 60 seconds). The achieved mean duration values are shown. The returned version is also shown.",
+        ("node", "mean time [s]", "version"),
+        (
+            (
+                f"<{node_data['node']}>",
+                format_float(node_data["config"]["access_time"]),
+                node_data.get("version", "unknown"),
+            )
+            for node_data in config_sorted_nodes
+        ),
+    )
 
     # Prepare concise metadata for json_metadata (after config_sorted_nodes is defined)
     from hive_bench import __version__
@@ -529,7 +639,7 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
         "node_count": len(benchmark_data.get("nodes", [])),
         "failing_nodes": len(benchmark_data.get("failing_nodes", {})),
         "tags": ["hive", "benchmark", "nodes", "performance", "api"],
-        "timestamp": params.get("timestamp", timestamp),
+        "timestamp": params.get("timestamp", timestamp or now.isoformat()),
         "top_nodes": [
             {"url": node_data["node"], "rank": node_data["config"]["rank"]}
             for node_data in config_sorted_nodes[:3]
@@ -545,12 +655,6 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
 
     # Node Uptime Statistics (if historical data available)
     if historical_data and historical_data.get("uptime"):
-        markdown.append("## Node Uptime Statistics (7-day period)\n")
-        markdown.append("This table shows how reliable nodes have been over the past week.\n")
-
-        markdown.append("| node | uptime % | total checks |")
-        markdown.append("| --- | --- | --- |")
-
         # Sort by uptime percentage (descending)
         sorted_uptime = sorted(
             historical_data["uptime"].items(),
@@ -558,269 +662,140 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
             reverse=True,
         )
 
-        for node_url, uptime_data in sorted_uptime:
-            markdown.append(
-                f"| <{node_url}> | {uptime_data['uptime_percent']}% | {uptime_data['total_runs']} |"
-            )
-
-        markdown.append("\n")
-
-    # Streaming blocks section
-    markdown.append("## Streaming blocks\n")
-    markdown.append(
-        "This table shows how many blocks were streamed by the node within the default benchmark duration (30 seconds). The RPCs are ordered according to the number of blocks streamed.\n"
-    )
-
-    markdown.append("| node | blocks streamed | blocks per second  |")
-    markdown.append("| --- | --- | --- |")
-
-    # Sort nodes by number of blocks streamed (descending)
-    block_sorted_nodes = sorted(
-        [node for node in report if node.get("block", {}).get("ok", False)],
-        key=lambda x: x["block"]["count"],
-        reverse=True,
-    )
+        _emit_table(
+            markdown,
+            "Node Uptime Statistics (7-day period)",
+            "This table shows how reliable nodes have been over the past week.",
+            ("node", "uptime %", "total checks"),
+            (
+                (f"<{node_url}>", f"{uptime_data['uptime_percent']}%", uptime_data["total_runs"])
+                for node_url, uptime_data in sorted_uptime
+            ),
+        )
 
-    for node_data in block_sorted_nodes:
-        node = node_data["node"]
+    # Streaming blocks section, sorted by number of blocks streamed (descending)
+    block_rows = []
+    for node_data in sorted(passed["block"], key=lambda x: x["block"]["count"], reverse=True):
         blocks = node_data["block"]["count"]
         time = node_data["block"]["time"]
         blocks_per_second = format_float(blocks / time) if time > 0 else 0
-        markdown.append(f"| <{node}> | {blocks} | {blocks_per_second} |")
-
-    markdown.append("\n")
-
-    # Streaming account history section
-    markdown.append("## Streaming account history\n")
-    markdown.append(
-        "This table shows how many account history operations were streamed by the node within the default benchmark duration (60 seconds). The RPCs are ordered according to the number of operations streamed.\n"
+        block_rows.append((f"<{node_data['node']}>", blocks, blocks_per_second))
+    _emit_table(
+        markdown,
+        "Streaming blocks",
+        "This table shows how many blocks were streamed by the node within the default benchmark duration (30 seconds). The RPCs are ordered according to the number of blocks streamed.",
+        ("node", "blocks streamed", "blocks per second"),
+        block_rows,
     )
 
-    markdown.append("| node | operations streamed | operations per second |")
-    markdown.append("| --- | --- | --- |")
-
-    # Sort nodes by number of account history operations streamed (descending)
-    history_sorted_nodes = sorted(
-        [node for node in report if node.get("history", {}).get("ok", False)],
-        key=lambda x: x["history"]["count"],
-        reverse=True,
-    )
-
-    for node_data in history_sorted_nodes:
-        node = node_data["node"]
+    # Streaming account history section, sorted by operations streamed (descending)
+    history_rows = []
+    for node_data in sorted(passed["history"], key=lambda x: x["history"]["count"], reverse=True):
         operations = node_data["history"]["count"]
         time = node_data["history"]["time"]
         operations_per_second = format_float(operations / time) if time > 0 else 0
-        markdown.append(f"| <{node}> | {operations} | {operations_per_second} |")
-
-    markdown.append("\n")
-
-    # API call time section
-    markdown.append("## API call time\n")
-    markdown.append(
-        "This table shows how long it took to call an API (single request, default timeout: 60 seconds). The RPCs are ordered according to the access time.\n"
+        history_rows.append((f"<{node_data['node']}>", operations, operations_per_second))
+    _emit_table(
+        markdown,
+        "Streaming account history",
+        "This table shows how many account history operations were streamed by the node within the default benchmark duration (60 seconds). The RPCs are ordered according to the number of operations streamed.",
+        ("node", "operations streamed", "operations per second"),
+        history_rows,
     )
 
-    markdown.append("| node |  response time [s] |")
-    markdown.append("| --- | --- |")
-
-    # Sort nodes by API call time (ascending)
-    apicall_sorted_nodes = sorted(
-        [node for node in report if node.get("apicall", {}).get("ok", False)],
-        key=lambda x: x["apicall"]["access_time"],
-    )
-
-    for node_data in apicall_sorted_nodes:
-        node = node_data["node"]
-        access_time = format_float(node_data["apicall"]["access_time"])
-        markdown.append(f"| <{node}> | {access_time} |")
-
-    markdown.append("\n")
-
-    # Block difference section
-    markdown.append("## Block difference\n")
-    markdown.append(
-        "This table shows the head blocks reported by each node. By comparing with the highest one, we can tell if a node has issues with block processing.\n"
-    )
-
-    markdown.append("| node | blocks behind | head blocks behind irreversible |")
-    markdown.append("| --- | --- | --- |")
-
-    # Sort nodes by block difference (ascending)
-    diff_sorted_nodes = sorted(
-        [node for node in report if node.get("block_diff", {}).get("ok", False)],
-        key=lambda x: x["block_diff"]["head_delay"],
+    # API call time section, sorted by API call time (ascending)
+    _emit_table(
+        markdown,
+        "API call time",
+        "This table shows how long it took to call an API (single request, default timeout: 60 seconds). The RPCs are ordered according to the access time.",
+        ("node", "response time [s]"),
+        (
+            (f"<{node_data['node']}>", format_float(node_data["apicall"]["access_time"]))
+            for node_data in sorted(passed["apicall"], key=lambda x: x["apicall"]["access_time"])
+        ),
     )
 
-    for node_data in diff_sorted_nodes:
-        node = node_data["node"]
+    # Block difference section, sorted by block difference (ascending)
+    diff_rows = []
+    for node_data in sorted(passed["block_diff"], key=lambda x: x["block_diff"]["head_delay"]):
         # Add null checks before converting to integers
         head_delay = node_data["block_diff"].get("head_delay", 0)
         diff_head_irreversible = node_data["block_diff"].get("diff_head_irreversible", 0)
         blocks_behind = int(head_delay) if head_delay is not None else 0
         diff_head_irr = int(diff_head_irreversible) if diff_head_irreversible is not None else 0
-        markdown.append(f"| <{node}> | {blocks_behind} | {diff_head_irr} |")
-
-    markdown.append("\n")
+        diff_rows.append((f"<{node_data['node']}>", blocks_behind, diff_head_irr))
+    _emit_table(
+        markdown,
+        "Block difference",
+        "This table shows the head blocks reported by each node. By comparing with the highest one, we can tell if a node has issues with block processing.",
+        ("node", "blocks behind", "head blocks behind irreversible"),
+        diff_rows,
+    )
 
     # Node Trends Section (if historical data available)
     if historical_data and historical_data.get("trends"):
         period_text = "today" if days <= 1 else f"{days}-day period"
-        markdown.append(f"## Node Performance Trends ({period_text})\n")
-        markdown.append("This table shows how node performance has changed over the past week.\n")
-
-        markdown.append(
-            "| node | block trend | history trend | API call trend | config trend | block diff trend |"
+        trends = historical_data["trends"]
+        _emit_table(
+            markdown,
+            f"Node Performance Trends ({period_text})",
+            "This table shows how node performance has changed over the past week.",
+            (
+                "node",
+                "block trend",
+                "history trend",
+                "API call trend",
+                "config trend",
+                "block diff trend",
+            ),
+            # The trend indicator of each test type, for all nodes in historical data
+            (
+                (
+                    f"<{node_url}>",
+                    *(
+                        _TREND_EMOJI.get(
+                            _trend_from_data(node_url, test_type, trends[node_url]), "n/a"
+                        )
+                        for test_type in TEST_TYPES
+                    ),
+                )
+                for node_url in sorted(trends)
+            ),
         )
-        markdown.append("| --- | --- | --- | --- | --- | --- |")
-
-        # Process all nodes in historical data
-        sorted_nodes = sorted(historical_data["trends"].keys())
-        for node_url in sorted_nodes:
-            # Helper function to calculate trend from rank history
-            def calculate_trend_from_data(node_url, test_type, historical_data):
-                try:
-                    # First, check if we have direct trend data calculated by get_historical_data
-                    if (
-                        historical_data
-                        and "trends" in historical_data
-                        and node_url in historical_data["trends"]
-                        and test_type in historical_data["trends"][node_url]
-                        and isinstance(historical_data["trends"][node_url][test_type], dict)
-                        and "trend" in historical_data["trends"][node_url][test_type]
-                    ):
-                        return historical_data["trends"][node_url][test_type]["trend"]
-
-                    # If we don't have calculated trends, check if we have raw data to calculate it
-                    elif (
-                        historical_data
-                        and "trends" in historical_data
-                        and node_url in historical_data["trends"]
-                        and test_type in historical_data["trends"][node_url]
-                        and isinstance(historical_data["trends"][node_url][test_type], list)
-                    ):
-                        ranks_data = historical_data["trends"][node_url][test_type]
-                        if not ranks_data or len(ranks_data) < 2:
-                            return "n/a"
-
-                        # Safely extract ranks, handling both dictionaries and other data types
-                        ranks = []
-                        timestamps = []
-                        for entry in ranks_data:
-                            if isinstance(entry, dict):
-                                rank = entry.get("rank")
-                                timestamp = entry.get("timestamp")
-                                if rank is not None:
-                                    ranks.append(rank)
-                                    if timestamp:
-                                        timestamps.append(timestamp)
-                            elif isinstance(entry, (int, float)):
-                                ranks.append(entry)
-                            else:
-                                # Skip any entries that are neither dicts nor numbers
-                                continue
-
-                        # Need at least 2 valid ranks to calculate a trend
-                        if len(ranks) < 2:
-                            return "n/a"
-
-                        # Sort by timestamp if available
-                        if timestamps and len(timestamps) == len(ranks):
-                            # Create pairs and sort by timestamp
-                            pairs = sorted(zip(timestamps, ranks), key=lambda x: x[0])
-                            ranks = [r for _, r in pairs]
-
-                        # Simple trend detection - compare last rank with first rank
-                        if ranks[-1] < ranks[0]:  # Lower rank is better
-                            return "improving"
-                        elif ranks[-1] > ranks[0]:
-                            return "worsening"
-                        else:
-                            return "stable"
-
-                    # Otherwise, we don't have trend data for this node/test_type
-                    return "n/a"
-                except Exception as e:
-                    logging.warning(f"Error calculating trend for {node_url}, {test_type}: {e}")
-                    return "n/a"
-
-            # Get trend indicators for each test type
-            block_trend = calculate_trend_from_data(node_url, "block", historical_data)
-            history_trend = calculate_trend_from_data(node_url, "history", historical_data)
-            api_trend = calculate_trend_from_data(node_url, "apicall", historical_data)
-            config_trend = calculate_trend_from_data(node_url, "config", historical_data)
-            block_diff_trend = calculate_trend_from_data(node_url, "block_diff", historical_data)
-
-            # Create emoji indicators
-            def get_trend_emoji(trend):
-                if trend == "improving":
-                    return "&nearr;  improving"
-                elif trend == "worsening":
-                    return "&searr; worsening"
-                elif trend == "failing":
-                    return "&cross; failing"
-                elif trend == "stable":
-                    return "&check; stable"
-                else:
-                    return "n/a"
-
-            block_emoji = get_trend_emoji(block_trend)
-            history_emoji = get_trend_emoji(history_trend)
-            api_emoji = get_trend_emoji(api_trend)
-            config_emoji = get_trend_emoji(config_trend)
-            block_diff_emoji = get_trend_emoji(block_diff_trend)
-
-            markdown.append(
-                f"| <{node_url}> | {block_emoji} | {history_emoji} | {api_emoji} | {config_emoji} | {block_diff_emoji} |"
-            )
-
-        markdown.append("\n")
 
     # Node Consistency Section (if historical data available)
     if historical_data and historical_data.get("consistency"):
         period_text = "today" if days <= 1 else f"{days}-day period"
-        markdown.append(f"## Node Consistency ({period_text})\n")
-        markdown.append(
-            "This table shows how consistent node performance has been. Lower values indicate more consistent performance.\n"
-        )
-
-        markdown.append("| node | block | history | API call | config | block diff |")
-        markdown.append("| --- | --- | --- | --- | --- | --- |")
 
         # Sort nodes by average consistency across all tests
         def avg_consistency(node_data):
-            values = [value for value in node_data.values() if isinstance(value, (int, float))]
-
-            # If all values are 0, this is likely a failing node - place it at the end
-            if all(v == 0 for v in values) and values:
-                return float("inf")
-
-            # Filter out zeros when calculating average, as 0 indicates a failure rather than perfect consistency
-            non_zero_values = [v for v in values if v != 0]
-
-            # If we have no valid values after filtering zeros, return infinity
-            if not non_zero_values:
-                return float("inf")
-
-            # Return the average of non-zero values
-            return sum(non_zero_values) / len(non_zero_values)
+            # Filter out zeros when calculating average, as 0 indicates a failure rather than
+            # perfect consistency. Nodes with no other values (likely failing) go to the end.
+            total = 0
+            count = 0
+            for value in node_data.values():
+                if value and isinstance(value, (int, float)):
+                    total += value
+                    count += 1
+            return total / count if count else float("inf")
 
         sorted_nodes = sorted(
             historical_data["consistency"].items(), key=lambda x: avg_consistency(x[1])
         )
 
-        for node_url, consistency in sorted_nodes:
-            block_cons = consistency.get("block", "n/a")
-            history_cons = consistency.get("history", "n/a")
-            api_cons = consistency.get("apicall", "n/a")
-            config_cons = consistency.get("config", "n/a")
-            block_diff_cons = consistency.get("block_diff", "n/a")
-
-            markdown.append(
-                f"| <{node_url}> | {block_cons} | {history_cons} | {api_cons} | {config_cons} | {block_diff_cons} |"
-            )
-
-        markdown.append("\n")
+        _emit_table(
+            markdown,
+            f"Node Consistency ({period_text})",
+            "This table shows how consistent node performance has been. Lower values indicate more consistent performance.",
+            ("node", "block", "history", "API call", "config", "block diff"),
+            (
+                (
+                    f"<{node_url}>",
+                    *(consistency.get(test_type, "n/a") for test_type in TEST_TYPES),
+                )
+                for node_url, consistency in sorted_nodes
+            ),
+        )
 
     # Overall Ranking Section
     markdown.append("## Overall Node Ranking\n")
@@ -836,63 +811,32 @@ def generate_markdown(benchmark_data, output_file=None, historical_data=None, da
     # Calculate overall score for each node
     node_scores = {}
     for node_data in report:
-        node = node_data["node"]
-        score = 0
-        ranks = []
-
-        # Collect ranks from each test
-        block_rank = node_data.get("block", {}).get("rank", -1)
-        if block_rank > 0:
-            score += max(10 - block_rank, 0)  # Higher score for better rank (lower number)
-            ranks.append(block_rank)
-
-        history_rank = node_data.get("history", {}).get("rank", -1)
-        if history_rank > 0:
-            score += max(10 - history_rank, 0)
-            ranks.append(history_rank)
-
-        api_rank = node_data.get("apicall", {}).get("rank", -1)
-        if api_rank > 0:
-            score += max(10 - api_rank, 0)
-            ranks.append(api_rank)
-
-        config_rank = node_data.get("config", {}).get("rank", -1)
-        if config_rank > 0:
-            score += max(10 - config_rank, 0)
-            ranks.append(config_rank)
-
-        block_diff_rank = node_data.get("block_diff", {}).get("rank", -1)
-        if block_diff_rank > 0:
-            score += max(10 - block_diff_rank, 0)
-            ranks.append(block_diff_rank)
+        # Collect ranks from each test, ranks below 1 mean the node was not ranked in it
+        ranks = [node_data.get(test_type, _EMPTY).get("rank", -1) for test_type in TEST_TYPES]
+        ranked = [rank for rank in ranks if rank > 0]
+
+        # Higher score for better rank (lower number)
+        score = sum(max(10 - rank, 0) for rank in ranked)
 
         # Calculate additional score based on average rank
-        if ranks:
-            avg_rank = sum(ranks) / len(ranks)
-            score += max(10 - avg_rank, 0)  # Bonus for consistent performance
+        if ranked:
+            score += max(10 - sum(ranked) / len(ranked), 0)  # Bonus for consistent performance
 
-        node_scores[node] = {
+        node_scores[node_data["node"]] = {
             "score": score,
-            "block_rank": block_rank if block_rank > 0 else "n/a",
-            "history_rank": history_rank if history_rank > 0 else "n/a",
-            "api_rank": api_rank if api_rank > 0 else "n/a",
-            "config_rank": config_rank if config_rank > 0 else "n/a",
-            "block_diff_rank": block_diff_rank if block_diff_rank > 0 else "n/a",
+            "ranks": [rank if rank > 0 else "n/a" for rank in ranks],
         }
 
     # Sort nodes by score (descending)
     sorted_scores = sorted(node_scores.items(), key=lambda x: x[1]["score"], reverse=True)
 
     for node, score_data in sorted_scores:
-        markdown.append(
-            f"| <{node}> | {format_float(score_data['score'])} | {score_data['block_rank']} | "
-            f"{score_data['history_rank']} | {score_data['api_rank']} | "
-            f"{score_data['config_rank']} | {score_data['block_diff_rank']} |"
-        )
+        ranks = " | ".join(map(str, score_data["ranks"]))
+        markdown.append(f"| <{node}> | {format_float(score_data['score'])} | {ranks} |")
 
     # Create metadata for the post
     metadata = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "node_count": len(report),
         "failing_nodes": len(benchmark_data.get("failing_nodes", {})),
         "top_nodes": [{"url": node, "rank": i + 1} for i, (node, _) in enumerate(sorted_scores[:5])]
@@ -947,22 +891,14 @@ def generate_post(output_file="benchmark_post.md", db_path="benchmark_history.db
         tuple: A tuple containing (content, metadata) of the generated post.
     """
     try:
-        # Get the latest benchmark data
+        # Get the latest benchmark data and the historical data for trends
         logging.info("Retrieving latest benchmark data from database")
-        benchmark_data = get_latest_benchmark_data(db_path)
+        benchmark_data, historical_data = get_report_data(db_path, days=days)
 
         if not benchmark_data:
             logging.error("Failed to retrieve benchmark data from database.")
             return None, None
 
-        # Get historical data for trends
-        logging.info(f"Retrieving historical data for the past {days} days")
-        try:
-            historical_data = get_historical_data(db_path, days=days)
-        except Exception as e:
-            logging.error(f"Database error while retrieving historical data: {e}")
-            historical_data = None
-
         # Generate the formatted markdown post
         try:
             content, metadata = generate_markdown(
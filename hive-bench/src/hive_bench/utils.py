@@ -1,6 +1,13 @@
 """Utility functions for benchmarking operations."""
 
 import logging
+import threading
+from timeit import default_timer as timer
+
+import requests
+from nectarapi.exceptions import NumRetriesReached
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -19,8 +26,73 @@ INITIAL_NODES = [
     "https://hive-api.dlux.io",
 ]
 
-# Global flag to signal thread termination
-quit_thread = False
+# Default maximum number of nodes benchmarked at once. Worker threads are only started
+# as nodes are submitted, so a high limit costs nothing for short node lists.
+MAX_CONCURRENCY = 128
+
+# Tests ranked by a count, where higher is better
+_COUNT_TESTS = frozenset(("block", "history"))
+
+# Metric each test is ranked by
+_SORT_FIELDS = {
+    "block": "count",
+    "history": "count",
+    "apicall": "access_time",
+    "config": "access_time",
+    "block_diff": "head_delay",
+}
+
+# Weights for each test in the weighted node score (should sum to 1.0)
+_WEIGHTS = {
+    "block": 0.30,  # Block retrieval is critical for most operations
+    "history": 0.25,  # History retrieval is important for many apps
+    "apicall": 0.25,  # API call performance matters for user experience
+    "config": 0.05,  # Config is least important for everyday usage
+    "block_diff": 0.15,  # Block difference shows node synchronization status
+}
+
+# Tests whose failure marks a node as missing a critical service
+_CRITICAL_TESTS = frozenset(("block", "history", "apicall"))
+
+# Shared read-only stand-in for a missing test result
+_EMPTY = {}
+
+# Connections kept open per node
+POOL_SIZE = 32
+
+# Shared HTTP session used by nectar and the direct JSON-RPC requests, so every
+# request to a node reuses one kept-alive TCP/TLS connection. Only failed connection
+# attempts are retried here; nectar handles call-level retries itself.
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json", "Accept-Encoding": "gzip"})
+_adapter = HTTPAdapter(
+    pool_connections=MAX_CONCURRENCY,
+    pool_maxsize=POOL_SIZE,
+    max_retries=Retry(total=3, connect=3, read=0, backoff_factor=0.2),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# Event set to signal thread termination. Workers poll QUIT.is_set() or block on
+# QUIT.wait(timeout) so they stop as soon as it is set.
+QUIT = threading.Event()
+
+
+def __getattr__(name):
+    """Keep the old ``quit_thread`` flag readable as a module attribute.
+
+    Args:
+        name (str): Name of the attribute being looked up
+
+    Returns:
+        bool: Whether QUIT is set, when ``name`` is ``quit_thread``
+
+    Raises:
+        AttributeError: For any other unknown attribute
+    """
+    if name == "quit_thread":
+        return QUIT.is_set()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def format_float(value):
@@ -32,8 +104,14 @@ def format_float(value):
     Returns:
         float: The formatted float value with 2 decimal places
     """
+    # Fast path for the common case of plain floats and ints
+    value_type = type(value)
+    if value_type is float:
+        return round(value, 2)
+    if value_type is int:
+        return round(float(value), 2)
     try:
-        return float("{:.2f}".format(value))
+        return round(float(value), 2)
     except (ValueError, TypeError):
         return 0.0
 
@@ -59,10 +137,6 @@ def benchmark_executor(func, node, *args, **kwargs):
             - total_duration (float): Total time taken to execute the benchmark in seconds
             - Additional keys returned by the benchmark function
     """
-    from timeit import default_timer as timer
-
-    from nectarapi.exceptions import NumRetriesReached
-
     start_total = timer()
     successful = True
     error_msg = None
@@ -75,8 +149,10 @@ def benchmark_executor(func, node, *args, **kwargs):
         if isinstance(func_result, dict):
             result = func_result
         else:
+            # functools.partial objects have no __name__, report the wrapped function
+            func_name = getattr(func, "func", func).__name__
             logging.warning(
-                f"Benchmark function {func.__name__} returned {type(func_result)}, expected dict"
+                f"Benchmark function {func_name} returned {type(func_result)}, expected dict"
             )
             result = {}
 
@@ -116,109 +192,126 @@ def make_sort_key(current_test):
         callable: A function that can be used as a key for sorting
     """
 
+    # Resolve the test's metric and failure value once, not on every key call
+    field = _SORT_FIELDS.get(current_test)
+    failed = -1 if current_test in _COUNT_TESTS else float("inf")
+
     def sort_key(item):
         test_data = item[1][current_test]
         if not test_data["ok"]:
-            return -1 if current_test in ["block", "history"] else float("inf")
-
-        if current_test in ["block", "history"]:
-            return test_data["count"]
-        elif current_test in ["apicall", "config"]:
-            return test_data["access_time"]
-        elif current_test == "block_diff":
-            return test_data["head_delay"]
-        return 0
+            return failed
+        return test_data[field] if field else 0
 
     return sort_key
 
 
-def calculate_weighted_node_score(node_data, all_nodes_data=None):
-    """Calculate a weighted score for a node based on real-world performance importance.
+def compute_max_values(all_nodes_data):
+    """Find the highest successful count for each count-based test.
+
+    Args:
+        all_nodes_data (list): List of all node data dictionaries
+
+    Returns:
+        dict: Maximum count per test, used to normalize node scores
+    """
+    block_max = history_max = 0
+
+    for node in all_nodes_data:
+        # Find max block count
+        if node["block"].get("ok", False):
+            block_max = max(block_max, node["block"].get("count", 0))
+        # Find max history count
+        if node["history"].get("ok", False):
+            history_max = max(history_max, node["history"].get("count", 0))
+
+    return {
+        "block": {"count": block_max},
+        "history": {"count": history_max},
+    }
+
+
+def _count_score(test_data, max_count):
+    """Score a count test, where a higher count is better.
+
+    Args:
+        test_data (dict): Result of the test
+        max_count (int): Highest count reached by any node
+
+    Returns:
+        float: Count relative to the best node, scaled to 0-100
+    """
+    if max_count > 0:
+        return test_data.get("count", 0) / max_count * 100
+    return 0
+
+
+def _access_time_score(test_data, max_count):
+    """Score an API call or config test, where a lower access time is better.
+
+    Args:
+        test_data (dict): Result of the test
+        max_count (int): Unused, accepted for a uniform scorer signature
+
+    Returns:
+        float: Access time inverted and scaled from 0-2s to 100-0
+    """
+    return 100 * (1 - min(test_data.get("access_time", 30) / 2, 1))
+
+
+def _head_delay_score(test_data, max_count):
+    """Score the block difference test, where a lower head delay is better.
+
+    Args:
+        test_data (dict): Result of the test
+        max_count (int): Unused, accepted for a uniform scorer signature
+
+    Returns:
+        float: Head delay inverted and scaled from 0-3s to 100-0
+    """
+    return 100 * (1 - min(test_data.get("head_delay", 10) / 3, 1))
 
-    This function applies weights to different benchmark results to provide a more
-    realistic assessment of node performance for actual usage scenarios.
+
+# Normalized score function of each weighted test
+_TEST_SCORERS = {
+    "block": _count_score,
+    "history": _count_score,
+    "apicall": _access_time_score,
+    "config": _access_time_score,
+    "block_diff": _head_delay_score,
+}
+
+
+def _score_node(node_data, max_values=None):
+    """Calculate the weighted score of a single node against precomputed maximums.
 
     Args:
         node_data (dict): The node data dictionary containing benchmark results
-        all_nodes_data (list, optional): List of all node data for normalized scoring
+        max_values (dict, optional): Maximum counts from ``compute_max_values``. When omitted,
+            counts are not normalized against other nodes.
 
     Returns:
         float: A weighted score where higher is better
     """
-    # Define weights for each test (should sum to 1.0)
-    weights = {
-        "block": 0.30,  # Block retrieval is critical for most operations
-        "history": 0.25,  # History retrieval is important for many apps
-        "apicall": 0.25,  # API call performance matters for user experience
-        "config": 0.05,  # Config is least important for everyday usage
-        "block_diff": 0.15,  # Block difference shows node synchronization status
-    }
-
     # Base score starts at 0
     score = 0
 
     # Track if any critical services failed
     critical_service_failed = False
 
-    # Find maximum values for normalization if all_nodes_data is provided
-    max_values = {
-        "block": {"count": 0},
-        "history": {"count": 0},
-    }
-
-    if all_nodes_data:
-        for node in all_nodes_data:
-            # Find max block count
-            if node["block"].get("ok", False):
-                max_values["block"]["count"] = max(
-                    max_values["block"]["count"], node["block"].get("count", 0)
-                )
-            # Find max history count
-            if node["history"].get("ok", False):
-                max_values["history"]["count"] = max(
-                    max_values["history"]["count"], node["history"].get("count", 0)
-                )
-
     # Calculate normalized score for each test
-    for test, weight in weights.items():
-        test_data = node_data.get(test, {})
+    for test, weight in _WEIGHTS.items():
+        test_data = node_data.get(test, _EMPTY)
 
         # Skip tests that failed or don't have valid data
         if not test_data.get("ok", False):
             # Mark critical service failures
-            if test in ["block", "history", "apicall"]:
+            if test in _CRITICAL_TESTS:
                 critical_service_failed = True
             continue
 
-        # Calculate normalized score based on test type
-        if test == "block":
-            # For block, higher count is better
-            max_count = max_values["block"]["count"] if all_nodes_data else 1
-            if max_count > 0:
-                ratio = test_data.get("count", 0) / max_count
-                test_score = ratio * 100  # Scale to 0-100
-            else:
-                test_score = 0
-        elif test == "history":
-            # For history, higher count is better
-            max_count = max_values["history"]["count"] if all_nodes_data else 1
-            if max_count > 0:
-                ratio = test_data.get("count", 0) / max_count
-                test_score = ratio * 100  # Scale to 0-100
-            else:
-                test_score = 0
-        elif test == "apicall" or test == "config":
-            # For API call and config, lower access time is better
-            # Invert the access time so smaller times get higher scores
-            access_time = test_data.get("access_time", 30)
-            test_score = 100 * (1 - min(access_time / 2, 1))  # Scale 0-2s to 100-0
-        elif test == "block_diff":
-            # For block difference, lower head delay is better
-            head_delay = test_data.get("head_delay", 10)
-            test_score = 100 * (1 - min(head_delay / 3, 1))  # Scale 0-3s to 100-0
-
-        # Apply weight to test score
-        score += test_score * weight
+        # Apply weight to the normalized score of the test
+        max_count = max_values[test]["count"] if max_values and test in max_values else 1
+        score += _TEST_SCORERS[test](test_data, max_count) * weight
 
     # Apply version bonus (newer versions generally better)
     version = node_data.get("version", "0.0.0")
@@ -238,3 +331,41 @@ def calculate_weighted_node_score(node_data, all_nodes_data=None):
         score *= 0.5
 
     return score
+
+
+def calculate_weighted_node_score(node_data, all_nodes_data=None, max_values=None):
+    """Calculate a weighted score for a node based on real-world performance importance.
+
+    This function applies weights to different benchmark results to provide a more
+    realistic assessment of node performance for actual usage scenarios. When scoring
+    several nodes, compute ``max_values`` once with ``compute_max_values`` and pass it
+    to every call instead of ``all_nodes_data``.
+
+    Args:
+        node_data (dict): The node data dictionary containing benchmark results
+        all_nodes_data (list, optional): List of all node data for normalized scoring
+        max_values (dict, optional): Precomputed maximums from ``compute_max_values``.
+            Takes precedence over ``all_nodes_data``.
+
+    Returns:
+        float: A weighted score where higher is better
+    """
+    if max_values is None and all_nodes_data:
+        max_values = compute_max_values(all_nodes_data)
+    return _score_node(node_data, max_values)
+
+
+def calculate_weighted_scores(all_nodes_data):
+    """Calculate weighted scores for every node in a single pass.
+
+    The normalization maximums are computed once for the whole list instead of once
+    per node, so scoring N nodes is O(N) rather than O(N^2).
+
+    Args:
+        all_nodes_data (list): List of all node data dictionaries
+
+    Returns:
+        list: Weighted scores in the same order as ``all_nodes_data``
+    """
+    max_values = compute_max_values(all_nodes_data)
+    return [_score_node(node_data, max_values) for node_data in all_nodes_data]
@@ -9,6 +9,10 @@ from pathlib import Path
 
 import tomllib
 
+# Assignment lines rewritten in each package's __init__.py
+VERSION_RE = re.compile(r"^__version__\s*=")
+APP_RE = re.compile(r"^__app_name__\s*=", re.MULTILINE)
+
 PROJECTS = [
     {
         "name": "engine-bench",
@@ -42,32 +46,20 @@ def update_project(proj):
     content = init_file.read_text(encoding="utf-8")
     lines = content.splitlines(keepends=True)
 
-    # Patterns
-    version_re = re.compile(r"^__version__\s*=")
-    app_re = re.compile(r"^__app_name__\s*=")
-
-    # Flags
-    saw_app = False
+    # An existing __app_name__ is rewritten in place; otherwise it goes before __version__
+    saw_app = APP_RE.search(content) is not None
     new_lines = []
     for line in lines:
-        if app_re.match(line):
+        if APP_RE.match(line):
             new_lines.append(f'__app_name__ = "{name}"\n')
-            saw_app = True
-        elif version_re.match(line):
+        elif VERSION_RE.match(line):
+            if not saw_app:
+                new_lines.append(f'__app_name__ = "{name}"\n')
+                saw_app = True
             new_lines.append(f'__version__ = "{version}"\n')
         else:
             new_lines.append(line)
 
-    # Insert __app_name__ if not seen (before version)
-    if not saw_app:
-        out_lines = []
-        for line in new_lines:
-            if version_re.match(line):
-                out_lines.append(f'__app_name__ = "{name}"\n')
-                saw_app = True
-            out_lines.append(line)
-        new_lines = out_lines
-
     # Write back
     init_file.write_text("".join(new_lines), encoding="utf-8")
     print(f"Updated {proj['pkg']}/__init__.py: name={name}, version={version}")